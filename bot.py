@@ -5,16 +5,21 @@ import logging
 import os
 import platform
 import signal
-import socket
 import sys
-import threading
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
-from cogs.ticket import TicketActions, load_open_tickets, AssignedTicketActions
-from utils.scheduler import align_and_start_standup, set_bot
+from utils.config_utils import reload_config_if_changed
+from utils.events import event_pipeline
+from utils.health import HealthServer, add_ready_check, expect_ready, install_task_tracking, set_ready
+from utils.interactions import (INTERACTIONS_PEERS, INTERACTIONS_PUBLIC_KEY, InteractionEndpoint,
+                                cache_guilds_over_rest, refresh_guilds_periodically)
+from utils.license import license_watchdog
+from utils.member_cache import is_lean, member_cache_flags
+from utils.scheduler import arm, set_bot
+from utils.utils import handles_dm_events
 
 load_dotenv()
 BOT_TIER = "t1"  # TIER
@@ -23,14 +28,35 @@ INTENTS = discord.Intents.default()
 INTENTS.guilds = True
 INTENTS.members = True
 INTENTS.guild_messages = True
-INTENTS.message_content = True
-
-bot = commands.Bot(command_prefix="!", intents=INTENTS)
+INTENTS.message_content = False  # only slash commands and components are used, no message text is read
+
+# Sharding: SHARD_COUNT is the total across all processes, SHARD_IDS the ones this process runs (e.g. "0,1")
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARD_IDS = [int(i) for i in os.getenv("SHARD_IDS", "").split(",") if i.strip()]
+# INTERACTIONS_ONLY=1 runs a worker that answers HTTP interactions without a gateway connection (no scheduling)
+INTERACTIONS_ONLY = os.getenv("INTERACTIONS_ONLY", "").lower() in ("1", "true", "yes")
+
+bot_options = dict(
+    command_prefix="!",
+    intents=INTENTS,
+    # MEMORY_MODE=lean caches only the members the bot works with instead of every member of every guild,
+    # and doesn't download every member on startup just to drop them
+    member_cache_flags=member_cache_flags(INTENTS),
+    chunk_guilds_at_startup=not is_lean(),
+)
+if SHARD_COUNT:
+    bot = commands.AutoShardedBot(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS or None, **bot_options)
+else:
+    bot = commands.Bot(**bot_options)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # to track if shutdown is in progress
 shutdown_in_progress = False
+# set when the bot has been closed (shutdown or license watchdog), ends main() on interaction-only workers
+stopped = asyncio.Event()
+# long-running tasks main() starts (license watchdog, worker guild refresh), cancelled on shutdown
+background_tasks = []
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
@@ -46,55 +72,50 @@ except ImportError:
     __pyarmor__ = getattr(module, "__pyarmor__", None)
 
 
-# Optional for satisfying Render
-def start_dummy_server():
-    port = int(os.environ.get("PORT", 10000))
-    with socket.socket() as s:
-        s.bind(("0.0.0.0", port))
-        s.listen()
-        while True:
-            conn, _ = s.accept()
-            conn.close()
+# Health and readiness endpoints for the hosting platform (Render, Docker, k8s probes)
+health_server = HealthServer(bot, port=int(os.environ.get("PORT", 10000)), gateway=not INTERACTIONS_ONLY)
+expect_ready("cogs_loaded", "views_restored")
+if INTERACTIONS_ONLY:
+    add_ready_check("logged_in", lambda: bot.user is not None)
+else:
+    add_ready_check("gateway", bot.is_ready)
 
+# With INTERACTIONS_PUBLIC_KEY set, interactions are also accepted on POST /interactions of the health port
+interaction_endpoint = None
+if INTERACTIONS_PUBLIC_KEY:
+    interaction_endpoint = InteractionEndpoint(bot, INTERACTIONS_PUBLIC_KEY, peers=INTERACTIONS_PEERS)
+    health_server.add_route("POST", "/interactions", interaction_endpoint.handle)
+elif INTERACTIONS_ONLY:
+    raise SystemExit("❌ INTERACTIONS_ONLY needs INTERACTIONS_PUBLIC_KEY, the application's public key.")
 
-threading.Thread(target=start_dummy_server, daemon=True).start()
 
+async def refresh_config(interaction):
+    # Commands read the config another process (e.g. the scheduling one) may have saved since
+    reload_config_if_changed()
+    return True
 
-@bot.event
-async def on_ready():
-    await bot.tree.sync()
-    print(f"✅ Logged in as {bot.user.name}")
-    set_bot(bot)
 
-    # Start ticket restoration in background with rate limiting
-    asyncio.create_task(restore_ticket_views())
+bot.tree.interaction_check = refresh_config
 
-    await align_and_start_standup()
 
+@bot.event
+async def on_ready():
+    if handles_dm_events(bot):
+        await bot.tree.sync()  # commands are global, one process syncing them is enough
+    print(f"✅ Logged in as {bot.user.name}" + (f" (shards {bot.shard_ids})" if SHARD_COUNT else ""))
+    set_bot(bot)
+    if interaction_endpoint:
+        interaction_endpoint.accepting = True
 
-async def restore_ticket_views():
-    """Register persistent views for all open tickets without editing messages."""
-    tickets = load_open_tickets()
-    print(f"Registering persistent views for {len(tickets)} tickets...")
-
-    for ticket in tickets:
-        try:
-            ticket_id = ticket["id"]
-            assigned = bool(ticket.get("assigned_to") or ticket.get("assigned_role"))
-
-            # Pick the correct view class based on ticket state
-            if assigned:
-                view = AssignedTicketActions(ticket_id)
-            else:
-                view = TicketActions(ticket_id)
-
-            bot.add_view(view)
-            print(f"✅ Registered view for ticket {ticket_id}")
+    # Ticket buttons don't need restoring, the Ticket cog's dynamic items route them by custom_id
+    arm()
 
-        except Exception as e:
-            print(f"❌ Failed to register view for ticket {ticket['id']}: {e}")
 
-    print("View registration complete.")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
 
 
 async def shutdown_handler(signal_received=None, frame=None):
@@ -109,11 +130,18 @@ async def shutdown_handler(signal_received=None, frame=None):
     logger.info(f'Starting graceful shutdown...')
 
     try:
+        await health_server.stop()
+        if interaction_endpoint:
+            await interaction_endpoint.close()
+        await event_pipeline.stop()
+        await stop_background_tasks()
+
         # Close the bot connection properly
         if not bot.is_closed():
             logger.info('Closing bot connection...')
             await bot.close()
             logger.info('Bot connection closed successfully')
+        stopped.set()
 
         # Cancel all running tasks
         tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
@@ -156,6 +184,12 @@ shutdown_in_progress = False
 async def main():
     global shutdown_in_progress
 
+    install_task_tracking(asyncio.get_running_loop())
+    try:
+        await health_server.start()
+    except OSError as e:
+        print(f"❌ Failed to start the health server: {e}")
+
     # Signal handling (graceful shutdown)
     if sys.platform != 'win32':
         loop = asyncio.get_event_loop()
@@ -171,32 +205,6 @@ async def main():
             print("❌ Missing LICENSE environment variable.")
             return
 
-        # Validate license amd tier
-        import aiohttp
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        "https://license-api-production-b888.up.railway.app/validate",
-                        json={"license_key": license_key}
-                ) as resp:
-                    result = await resp.json()
-
-                    if not result.get("valid"):
-                        print(f"❌ License invalid: {result.get('error')}")
-                        return
-
-                    # Compare server tier with hardcoded BOT_TIER
-                    license_tier = result.get("tier")
-                    if license_tier != BOT_TIER:
-                        print(f"❌ License tier mismatch. Expected {BOT_TIER}, got {license_tier}")
-                        return
-
-                    print(f"✅ License valid for {BOT_TIER}. Expires: {result.get('expires')}")
-
-        except Exception as e:
-            print(f"❌ Failed to validate license: {e}")
-            return
-
         # Load cogs
         cogs = ["cogs.standupconfig", "cogs.preview", "cogs.help", "cogs.notifying", "cogs.summary", "cogs.ticket"]
         for cog in cogs:
@@ -205,6 +213,23 @@ async def main():
                 print(f"{cog.split('.')[-1].capitalize()} cog loaded")
             except Exception as e:
                 print(f"❌ Failed to load {cog}: {e}")
+        set_ready("cogs_loaded")
+
+        # The license is validated in the background once connected, the watchdog closes the bot if it isn't
+        background_tasks.append(asyncio.create_task(
+            license_watchdog(bot, license_key, BOT_TIER, wait_ready=not INTERACTIONS_ONLY, stopped=stopped)))
+        event_pipeline.start()  # a no-op without EVENT_WEBHOOK_URLS
+
+        if INTERACTIONS_ONLY:
+            # Log in over REST only: interactions arrive on the endpoint, the gateway process does the scheduling
+            await bot.login(TOKEN)
+            set_bot(bot)
+            await cache_guilds_over_rest(bot)
+            background_tasks.append(asyncio.create_task(refresh_guilds_periodically(bot)))
+            interaction_endpoint.accepting = True
+            print(f"✅ Logged in as {bot.user.name}, answering interactions over HTTP")
+            await stopped.wait()  # until the shutdown handler or the license watchdog closes the bot
+            return
 
         # Start bot
         logger.info('Starting bot...')
@@ -225,6 +250,7 @@ async def main():
         logger.error(f'Unexpected error: {e}')
 
     finally:
+        await stop_background_tasks()
         if not bot.is_closed():
             logger.info('Ensuring bot connection is closed...')
             try:
@@ -234,6 +260,7 @@ async def main():
 
         # aiohttp connector cleanup
         try:
+            import aiohttp
             import gc
             for obj in gc.get_objects():
                 if isinstance(obj, aiohttp.connector.BaseConnector):
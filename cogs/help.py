@@ -27,7 +27,8 @@ class Help(commands.Cog):
                     "`/preview` – Shows a preview of the standup card\n"
                     "`/toggle` – Enables or disables the standup\n"
                     "`/config` – Displays current standup configuration\n"
-                    "`/summary` – View recorded standup responses (by date or last N entries)"
+                    "`/summary` – View recorded standup responses (by date or last N entries)\n"
+                    "`/summaryexport` – Download standup responses for a date range as CSV, Markdown or NDJSON"
                 ),
                 inline=False
             )
@@ -36,8 +37,9 @@ class Help(commands.Cog):
                 name="🕒 Schedule Setup",
                 value=(
                     "`/time` – Set the daily standup time\n"
-                    "`/timezone` – Set your timezone (e.g., UTC+2, UTC-5:30)\n"
-                    "`/days` – Choose which days the standup runs"
+                    "`/timezone` – Set your timezone (e.g., UTC+2, UTC-5:30, Europe/Berlin)\n"
+                    "`/days` – Choose which days the standup runs\n"
+                    "`/skip` – Skip holidays: single dates, ranges or yearly dates (`remove` to undo)"
                 ),
                 inline=False
             )
@@ -46,7 +48,8 @@ class Help(commands.Cog):
                 name="📢 Role & Channel Setup",
                 value=(
                     "`/role` – Set the role that receives standup notifications\n"
-                    "`/channel` – Set the channel where standup is posted"
+                    "`/channel` – Set the channel where standup is posted\n"
+                    "`/delivery` – Send standups as DMs, or as one message in the channel or a daily thread"
                 ),
                 inline=False
             )
@@ -74,6 +77,8 @@ class Help(commands.Cog):
                 name="🎟️ Ticket Management",
                 value=(
                     "`/assign` – Assign a ticket to members or roles\n"
+                    "`/ticketbulk` – Reject, close or solve all tickets matching a filter\n"
+                    "`/ticketarchive` – Set after how many idle hours ticket threads are archived\n"
                     "`/ticketchannel` – Set the channel where ticket threads will be created"
                 ),
                 inline=False
@@ -84,6 +89,8 @@ class Help(commands.Cog):
             name="🙋 General Commands",
             value=(
                 "`/ticket` – Submit a ticket to the moderators\n"
+                "`/mytimezone` – Get the standup at the standup time in your own timezone\n"
+                "`/schedule` – List the next standups, with skipped days left out\n"
                 "`/help` – Show this help message"
             ),
             inline=False
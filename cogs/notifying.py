@@ -1,3 +1,4 @@
+import copy
 from datetime import datetime
 
 import discord
@@ -5,9 +6,17 @@ from discord import app_commands, Interaction, Embed
 from discord.ext.commands import Cog
 
 from utils.config_utils import load_config
+from utils.embed_cache import get_embed_template
 from utils.utils import get_timezone_from_string, get_time_until_next_standup, user_has_role
 
 cfg = load_config()
+ROLE_FIELD = 3
+NEXT_STANDUP_FIELD = 4
+DELIVERY_NOTES = {
+    "dm": "Standups will be sent via DM.",
+    "channel": "Standups will be posted in the standup channel.",
+    "thread": "Standups will be posted in a daily thread.",
+}
 
 
 def format_timedelta(td):
@@ -20,7 +29,7 @@ def format_timedelta(td):
         return f"{minutes}m {seconds}s"
 
 
-def build_schedule_embed(guild=None, updated: bool = False):
+def _build_schedule_template(guild, updated: bool):
     missing_values = []
 
     if cfg["standup_time"]:
@@ -41,34 +50,49 @@ def build_schedule_embed(guild=None, updated: bool = False):
         days = None
         missing_values.append("standup days")
 
-    if cfg["standup_role_id"]:
-        role = guild.get_role(cfg["standup_role_id"])
-        role_display = role.mention
-    else:
-        role_display = None
-        missing_values.append("standup role")
-
-    remaining = get_time_until_next_standup(cfg)
-    formatted_remaining = format_timedelta(remaining) if remaining else "Unknown"
-
     embed = Embed(
         title="📢 Standup Schedule Updated" if updated else "⏰ Upcoming Standup Reminder",
-        color=discord.Color.red() if updated else discord.Color.green(),
-        timestamp=(datetime.now(tz=get_timezone_from_string(timezone)) if timezone else None)
+        color=discord.Color.red() if updated else discord.Color.green()
     )
 
     embed.add_field(name="🕒 Time", value=f"{time[2]}", inline=True)
     embed.add_field(name="🌍 Timezone", value=f"{timezone}", inline=True)
     embed.add_field(name="📆 Days", value=f"{days}", inline=True)
-    embed.add_field(name="👥 Role", value=f"{role_display}", inline=False)
-    embed.add_field(
-        name="🔄 Next Standup",
-        value=f"In {formatted_remaining}",
-        inline=False
-    )
-    embed.set_footer(
-        text="Please make sure you're available at the scheduled time. Standups will be sent via DM."
-        if updated else "Please be ready — you'll receive a DM shortly to complete your standup check-in.")
+    # Placeholders, the role, the countdown and the footer are filled in on every call
+    embed.add_field(name="👥 Role", value="None", inline=False)
+    embed.add_field(name="🔄 Next Standup", value="In Unknown", inline=False)
+
+    return embed, missing_values
+
+
+def build_schedule_embed(guild=None, updated: bool = False):
+    template, missing_values = get_embed_template(
+        ("schedule", guild.id if guild else None, updated), lambda: _build_schedule_template(guild, updated))
+    missing_values = list(missing_values)
+
+    # The cached payload is shared, only a copy of it may be changed
+    embed = Embed.from_dict(copy.deepcopy(template))
+
+    # The role can be deleted without the config changing, so it's looked up each time
+    role = guild.get_role(cfg["standup_role_id"]) if guild and cfg["standup_role_id"] else None
+    if role is None:
+        missing_values.append("standup role")
+    embed.set_field_at(ROLE_FIELD, name="👥 Role", value=role.mention if role else "None", inline=False)
+
+    remaining = get_time_until_next_standup(cfg)
+    formatted_remaining = format_timedelta(remaining) if remaining else "Unknown"
+    embed.set_field_at(NEXT_STANDUP_FIELD, name="🔄 Next Standup", value=f"In {formatted_remaining}", inline=False)
+
+    delivery_mode = cfg.get("delivery_mode", "dm")
+    if updated:
+        embed.set_footer(text="Please make sure you're available at the scheduled time. "
+                              + DELIVERY_NOTES.get(delivery_mode, DELIVERY_NOTES["dm"]))
+    elif delivery_mode == "dm":
+        embed.set_footer(text="Please be ready — you'll receive a DM shortly to complete your standup check-in.")
+    else:
+        embed.set_footer(text="Please be ready — the standup will be posted shortly for your check-in.")
+    if cfg["timezone"]:
+        embed.timestamp = datetime.now(tz=get_timezone_from_string(cfg["timezone"]))
 
     return embed, missing_values
 
@@ -4,13 +4,15 @@ from discord.ext import commands
 from discord.ui import Modal, TextInput, View, Button
 
 from cogs.standupconfig import validate_and_handle_toggle
+from utils.scheduler import StandupAnswerModal, MAX_EMBED_QUESTIONS
 from utils.utils import user_has_role
 from utils.config_utils import *
+from utils.embed_cache import get_cached_embed
 
 cfg = load_config()
 
 
-def build_preview_embed():
+def _build_preview_embed():
     embed = discord.Embed(
         title=(f"📃 {cfg['standup_title']}" if cfg['standup_title'] else "**-no title set-**"),
         description=(cfg['standup_desc'] if cfg['standup_desc'] else "**-no description set-** *not required"),
@@ -27,12 +29,17 @@ def build_preview_embed():
     if len(cfg["standup_questions"]) <= 0:
         embed.add_field(name=f"**No questions added!**", value="", inline=False)
     else:
-        for i, q in enumerate(cfg['standup_questions'][:3], 1):
+        for i, q in enumerate(cfg['standup_questions'][:MAX_EMBED_QUESTIONS], 1):
             embed.add_field(name=f"Q{i}", value=q, inline=False)
 
     return embed
 
 
+def build_preview_embed():
+    # /preview appends warnings to the footer, so hand out a copy of the cached template
+    return get_cached_embed("preview", _build_preview_embed).copy()
+
+
 class EditContentModal(Modal, title="Edit Standup Content"):
     def __init__(self):
         super().__init__()
@@ -62,14 +69,12 @@ class EditContentModal(Modal, title="Edit Standup Content"):
         self.add_item(self.questions_input)
 
     async def on_submit(self, interaction: discord.Interaction):
-        was_valid_before, _ = validate_standup_config(cfg)
-
-        cfg["standup_title"] = self.title_input.value or None
-        cfg["standup_desc"] = self.desc_input.value or None
-        cfg["standup_questions"] = [q.strip() for q in self.questions_input.value.strip().split("\n") if
-                                    q.strip()] or []
-
-        save_config_changes(cfg)
+        with update_config():
+            was_valid_before, _ = validate_standup_config(cfg)
+            cfg["standup_title"] = self.title_input.value or None
+            cfg["standup_desc"] = self.desc_input.value or None
+            cfg["standup_questions"] = [q.strip() for q in self.questions_input.value.strip().split("\n") if
+                                        q.strip()] or []
 
         response_sent = await validate_and_handle_toggle(interaction, cfg, was_valid_before)
 
@@ -85,7 +90,7 @@ class PreviewAnswerStandupView(View):
     @discord.ui.button(label="📝 Answer Standup", style=discord.ButtonStyle.primary)
     async def answer_standup(self, interaction: discord.Interaction, button: Button):  # USE THIS TO OPEN THE MODAL FOR
         await interaction.response.send_modal(
-            PreviewAnswerModal(questions=cfg["standup_questions"]))  # ANSWERING THE QUESTIONS
+            StandupAnswerModal(questions=cfg["standup_questions"], preview=True))  # ANSWERING THE QUESTIONS
 
     @discord.ui.button(label="✏️ Edit Content", style=discord.ButtonStyle.gray)
     async def edit_content(self, interaction: discord.Interaction, button: Button):
@@ -94,16 +99,6 @@ class PreviewAnswerStandupView(View):
         )
 
 
-class PreviewAnswerModal(Modal, title="Standup Answers"):
-    def __init__(self, questions):
-        super().__init__()
-        for i, q in enumerate(cfg["standup_questions"][:3], 0):
-            self.add_item(TextInput(label=q, custom_id=f"q{i}", style=discord.TextStyle.paragraph, required=False))
-
-    async def on_submit(self, interaction: discord.Interaction):
-        await interaction.response.send_message("✅ Thanks for your standup! | preview", ephemeral=True)
-
-
 class Preview(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -1,4 +1,3 @@
-import re
 from datetime import datetime, timedelta
 
 import discord
@@ -6,7 +5,10 @@ from discord import app_commands, Interaction, Embed, Color
 from discord.ext import commands
 
 from utils.config_utils import *
-from utils.scheduler import align_and_start_standup, schedule_standup
+from utils.role_members import role_tracker
+from utils.member_timezones import set_member_timezone
+from utils.schedule import UTC_OFFSET_RE, get_bucket_schedule, get_schedule, load_zone, parse_skip
+from utils.scheduler import StandupChannelAnswerButton, StandupFallbackAnswerButton, arm, disarm, rearm
 from utils.utils import user_has_role
 
 cfg = load_config()
@@ -21,10 +23,9 @@ async def validate_and_handle_toggle(interaction: Interaction, cfg: dict, was_va
     if not is_valid and was_valid_before:
         # Disable standups if they were enabled
         if cfg.get('toggled'):
-            cfg['toggled'] = False
-            save_config_changes(cfg)
-            if schedule_standup.is_running():
-                schedule_standup.cancel()
+            with update_config():
+                cfg['toggled'] = False
+            disarm()
 
         missing_list = "\n - " + "\n - ".join(missing)
         await interaction.response.send_message(
@@ -39,10 +40,62 @@ async def validate_and_handle_toggle(interaction: Interaction, cfg: dict, was_va
         return
 
 
+DELIVERY_MODES = {
+    "dm": "a DM to every member",
+    "channel": "one message in the standup channel",
+    "thread": "one message in a daily thread",
+}
+
+
+def timezone_input_error(utc_offset: str):
+    """Why `utc_offset` isn't a usable timezone, or None if it is."""
+    match = UTC_OFFSET_RE.match(utc_offset)
+    if not match:
+        # Not a fixed offset, so it has to be an IANA zone name
+        try:
+            load_zone(utc_offset)
+        except ValueError:
+            return "❌ Please use the format like `UTC+3`, `UTC-5:30`, `UTC+0` or a region like `Europe/Berlin`."
+        return None
+
+    sign, hours_str, minutes_str = match.groups()
+    hours = int(hours_str)
+    minutes = int(minutes_str) if minutes_str else 0
+    total_offset = hours + minutes / 60
+    if sign == "-":
+        total_offset = -total_offset
+
+    if total_offset < -12 or total_offset > 14:
+        return "❌ Offset out of valid range. UTC offset must be between -12:00 and +14:00."
+    return None
+
+
 class StandupConfig(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    def sync_standup_role(self):
+        role_id = cfg.get("standup_role_id")
+        if not role_id:
+            return
+        guild = next((g for g in self.bot.guilds if g.get_role(role_id)), None)
+        if guild:
+            role_tracker.start_sync(guild, role_id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if cfg.get("standup_role_id"):
+            role_tracker.load_snapshot(cfg["standup_role_id"])
+        self.sync_standup_role()
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        role_tracker.on_member_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        role_tracker.on_member_remove(payload.user.id)
+
     @app_commands.command(name="time",
                           description="Sets the time (24H format) when"
                                       " the standup check-in occurs. (e.g., /time 09:30 for 9:30 AM)")
@@ -55,22 +108,23 @@ class StandupConfig(commands.Cog):
 
         try:
             parsed_time = datetime.strptime(time_str, "%H:%M").time()
-            was_valid_before, _ = validate_standup_config(cfg)
-            cfg["standup_time"] = [parsed_time.hour, parsed_time.minute, parsed_time.strftime("%H:%M")]
-            save_config_changes(cfg)
+            with update_config():
+                was_valid_before, _ = validate_standup_config(cfg)
+                cfg["standup_time"] = [parsed_time.hour, parsed_time.minute, parsed_time.strftime("%H:%M")]
 
             await validate_and_handle_toggle(interaction, cfg, was_valid_before)
 
             await interaction.response.send_message(f"✅ Standup time set to **{cfg['standup_time'][2]}**.",
                                                     ephemeral=True)
-            await align_and_start_standup()
+            rearm()
         except ValueError:
             await interaction.response.send_message("❌ Please use the 24-hour format: 'HH:MM' (e.g. '09:30').",
                                                     ephemeral=True)
 
     @app_commands.command(name="timezone",
-                          description="Sets the UTC timezone for scheduling. "
-                                      "(e.g., /timezone UTC+2 or /timezone UTC-5:30)")
+                          description="Sets the timezone for scheduling. "
+                                      "(e.g., /timezone UTC+2, /timezone UTC-5:30 or /timezone Europe/Berlin)")
+    @app_commands.describe(utc_offset="A UTC offset like UTC+2, or a region like Europe/Berlin to follow DST")
     async def timezone(self, interaction: Interaction, utc_offset: str):
         if not await user_has_role(interaction, "StandupMod"):
             await interaction.response.send_message(
@@ -78,37 +132,49 @@ class StandupConfig(commands.Cog):
             )
             return
 
-        match = re.match(r"^UTC([+-])(\d{1,2})(?::([03]0))?$", utc_offset)
-        if not match:
-            await interaction.response.send_message("❌ Please use the format like `UTC+3`, `UTC-5:30`, or `UTC+0`.")
+        error = timezone_input_error(utc_offset)
+        if error:
+            await interaction.response.send_message(error)
             return
 
-        sign, hours_str, minutes_str = match.groups()
-        hours = int(hours_str)
-        minutes = int(minutes_str) if minutes_str else 0
-        total_offset = hours + minutes / 60
-        if sign == "-":
-            total_offset = -total_offset
+        with update_config():
+            was_valid_before, _ = validate_standup_config(cfg)
+            cfg["timezone"] = utc_offset
+
+        await validate_and_handle_toggle(interaction, cfg, was_valid_before)
 
-        if total_offset < -12 or total_offset > 14:
+        await interaction.response.send_message(f"✅ Timezone set to **{utc_offset}**.")
+        rearm()
+
+    @app_commands.command(name="mytimezone",
+                          description="Get the standup at the standup time in your own timezone "
+                                      "(e.g., /mytimezone America/New_York). Leave empty to reset.")
+    @app_commands.describe(timezone="A UTC offset like UTC-5, or a region like America/New_York to follow DST")
+    async def mytimezone(self, interaction: Interaction, timezone: str = None):
+        if timezone is None:
+            set_member_timezone(interaction.user.id, None)
             await interaction.response.send_message(
-                "❌ Offset out of valid range. UTC offset must be between -12:00 and +14:00.")
+                f"✅ You'll get the standup in the team timezone (**{cfg['timezone']}**) again.", ephemeral=True)
             return
 
-        total_minutes = hours * 60 + minutes
-        if sign == "-":
-            total_minutes = -total_minutes
-
-        offset = timedelta(minutes=total_minutes)
-        was_valid_before, _ = validate_standup_config(cfg)
-
-        cfg["timezone"] = utc_offset
-        save_config_changes(cfg)
+        # Only members who get the standup add a delivery bucket
+        if not any(role.id == cfg["standup_role_id"] for role in getattr(interaction.user, "roles", [])):
+            await interaction.response.send_message(
+                "❌ You need the standup role to set your own standup timezone.", ephemeral=True)
+            return
 
-        await validate_and_handle_toggle(interaction, cfg, was_valid_before)
+        error = timezone_input_error(timezone)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
+            return
 
-        await interaction.response.send_message(f"✅ Timezone set to **{utc_offset}**.")
-        await align_and_start_standup()
+        set_member_timezone(interaction.user.id, timezone)
+        message = f"✅ Your timezone is set to **{timezone}**."
+        schedule = get_bucket_schedule(cfg, timezone)
+        next_dt = schedule.next_after(schedule.now()) if schedule else None
+        if next_dt:
+            message += f" Your next standup: <t:{int(next_dt.timestamp())}:F>."
+        await interaction.response.send_message(message, ephemeral=True)
 
     @app_commands.command(name="days",
                           description="Sets the days  when the standup check-in will be sent out.")
@@ -133,15 +199,73 @@ class StandupConfig(commands.Cog):
                 f"Please use full weekday names like: `monday`, `tuesday`, etc.",
                 ephemeral=True)
             return
-        was_valid_before, _ = validate_standup_config(cfg)
-        cfg["standup_days"] = lowercase_days
-        save_config_changes(cfg)
+        with update_config():
+            was_valid_before, _ = validate_standup_config(cfg)
+            cfg["standup_days"] = lowercase_days
 
         await validate_and_handle_toggle(interaction, cfg, was_valid_before)
 
         await interaction.response.send_message(f"✅ Standup days set to: {', '.join(lowercase_days).title()}.",
                                                 ephemeral=True)
 
+    @app_commands.command(name="skip",
+                          description="Skip standups on holidays: 2026-12-24, ranges like "
+                                      "2026-12-24..2027-01-02, or 12-25 for every year.")
+    @app_commands.describe(dates="Space-separated dates, ranges (start..end) or MM-DD for every year",
+                           remove="Remove these entries from the skip calendar instead")
+    async def skip(self, interaction: Interaction, dates: str, remove: bool = False):
+        if not await user_has_role(interaction, "StandupMod"):
+            await interaction.response.send_message(
+                "❌ You need the **StandupMod** role to use this command.", ephemeral=True
+            )
+            return
+
+        entries = dates.split()
+        for entry in entries:
+            try:
+                parse_skip(entry)
+            except ValueError as e:
+                await interaction.response.send_message(f"❌ {e} Use `YYYY-MM-DD`, `YYYY-MM-DD..YYYY-MM-DD` "
+                                                        f"or `MM-DD` for a yearly holiday.", ephemeral=True)
+                return
+
+        with update_config():
+            skip_dates = cfg.setdefault("skip_dates", [])
+            if remove:
+                cfg["skip_dates"] = [entry for entry in skip_dates if entry not in entries]
+            else:
+                skip_dates.extend(entry for entry in dict.fromkeys(entries) if entry not in skip_dates)
+
+        listed = ", ".join(f"`{entry}`" for entry in cfg["skip_dates"]) or "none"
+        action = "removed from" if remove else "added to"
+        await interaction.response.send_message(f"✅ {len(entries)} entr{'y' if len(entries) == 1 else 'ies'} "
+                                                f"{action} the skip calendar.\n📆 Skipped: {listed}", ephemeral=True)
+
+    @app_commands.command(name="schedule", description="Lists the next standups, with skipped days left out.")
+    @app_commands.describe(count="How many upcoming standups to list (1-25)")
+    async def schedule(self, interaction: Interaction, count: app_commands.Range[int, 1, 25] = 5):
+        schedule = get_schedule(cfg)
+        occurrences = schedule.next_n(schedule.now(), count) if schedule else []
+        if not occurrences:
+            await interaction.response.send_message("📭 No upcoming standups. Check `/time`, `/days` and `/skip`.",
+                                                    ephemeral=True)
+            return
+
+        embed = Embed(title="🗓️ Upcoming Standups", color=Color.green())
+        embed.description = "\n".join(f"`{i}.` <t:{int(dt.timestamp())}:F> (<t:{int(dt.timestamp())}:R>)"
+                                       for i, dt in enumerate(occurrences, start=1))
+
+        # Standup weekdays in that stretch that the skip calendar takes out
+        start = schedule.now().date()
+        skipped = [start + timedelta(days=i) for i in range((occurrences[-1].date() - start).days)
+                   if schedule.is_skipped(start + timedelta(days=i))]
+        if skipped:
+            embed.add_field(name="⏭️ Skipped", value=", ".join(day.strftime("%a %d %b") for day in skipped[:25]),
+                            inline=False)
+        if not cfg.get("toggled"):
+            embed.set_footer(text="Standups are currently disabled, see /toggle.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(
         name="config",
         description="Displays all current settings and configurations for your standup."
@@ -184,6 +308,12 @@ class StandupConfig(commands.Cog):
             inline=True
         )
 
+        embed.add_field(
+            name="⏭️ Skipped Dates",
+            value=", ".join(cfg.get("skip_dates", [])) or "None",
+            inline=True
+        )
+
         channel = interaction.guild.get_channel(cfg.get("standup_channel_id"))
         embed.add_field(
             name="📢 Announcement Channel",
@@ -223,10 +353,9 @@ class StandupConfig(commands.Cog):
                 "❌ You need the **StandupMod** role to use this command.", ephemeral=True
             )
             return
-        was_valid_before, _ = validate_standup_config(cfg)
-
-        cfg["standup_channel_id"] = channel.id
-        save_config_changes(cfg)
+        with update_config():
+            was_valid_before, _ = validate_standup_config(cfg)
+            cfg["standup_channel_id"] = channel.id
 
         await validate_and_handle_toggle(interaction, cfg, was_valid_before)
 
@@ -234,6 +363,41 @@ class StandupConfig(commands.Cog):
             f"📢 Standup reminders and schedule changes will now be posted in {channel.mention}",
             ephemeral=True)
 
+    @app_commands.command(name="delivery",
+                          description="Choose how standups are delivered: a DM per member, "
+                                      "or one message in the standup channel or a daily thread.")
+    @app_commands.choices(mode=[app_commands.Choice(name=label, value=value) for value, label in DELIVERY_MODES.items()])
+    async def delivery(self, interaction: Interaction, mode: str):
+        if not await user_has_role(interaction, "StandupMod"):
+            await interaction.response.send_message(
+                "❌ You need the **StandupMod** role to use this command.", ephemeral=True
+            )
+            return
+
+        if mode != "dm":
+            # The standup goes out unattended, so check now that the bot can post it there
+            channel = interaction.guild.get_channel(cfg["standup_channel_id"]) if cfg["standup_channel_id"] else None
+            if channel is None:
+                await interaction.response.send_message(
+                    "❌ Set the standup channel with `/channel` first.", ephemeral=True)
+                return
+            bot_perms = channel.permissions_for(interaction.guild.me)
+            needed = {"View": bot_perms.view_channel, "Send": bot_perms.send_messages}
+            if mode == "thread":
+                needed["Thread creation"] = bot_perms.create_public_threads
+                needed["Send in threads"] = bot_perms.send_messages_in_threads
+            missing = [name for name, allowed in needed.items() if not allowed]
+            if missing:
+                await interaction.response.send_message(
+                    f"❌ I don't have the correct permissions in {channel.mention} (need {', '.join(missing)}).",
+                    ephemeral=True)
+                return
+
+        with update_config():
+            cfg["delivery_mode"] = mode
+        await interaction.response.send_message(f"📬 Standups will be delivered as: **{DELIVERY_MODES[mode]}**",
+                                                ephemeral=True)
+
     @channel.error
     async def channel_error(self, interaction: Interaction, error: app_commands.AppCommandError):
         await interaction.response.send_message(
@@ -256,10 +420,10 @@ class StandupConfig(commands.Cog):
             )
             return
         print(role_str.name)
-        was_valid_before, _ = validate_standup_config(cfg)
-
-        cfg["standup_role_id"] = role_str.id
-        save_config_changes(cfg)
+        with update_config():
+            was_valid_before, _ = validate_standup_config(cfg)
+            cfg["standup_role_id"] = role_str.id
+        role_tracker.start_sync(interaction.guild, role_str.id)
 
         await validate_and_handle_toggle(interaction, cfg, was_valid_before)
 
@@ -272,22 +436,20 @@ class StandupConfig(commands.Cog):
                 "❌ You need the **StandupMod** role to use this command.", ephemeral=True
             )
             return
-        is_valid, missing = validate_standup_config(cfg)
+        with update_config():
+            is_valid, missing = validate_standup_config(cfg)
+            if is_valid:
+                cfg['toggled'] = not cfg['toggled']
 
         if is_valid:
-            cfg['toggled'] = not cfg['toggled']
-            save_config_changes(cfg)
-
             state = "enabled ✅" if cfg['toggled'] else "disabled ❌"
             await interaction.response.send_message(f"Standup {state}", ephemeral=True)
 
             if cfg['toggled']:
-                await align_and_start_standup()
+                arm()
 
             else:
-                if schedule_standup.is_running():
-                    schedule_standup.cancel()
-                    print("🛑 Standup schedule cancelled.")
+                disarm()
 
                 # Send embed to announcement channel to notify standups are off
                 channel = self.bot.get_channel(cfg["standup_channel_id"])
@@ -312,4 +474,5 @@ class StandupConfig(commands.Cog):
 
 
 async def setup(bot):
+    bot.add_dynamic_items(StandupChannelAnswerButton, StandupFallbackAnswerButton)
     await bot.add_cog(StandupConfig(bot))
@@ -1,4 +1,9 @@
+import csv
+import gzip
+import io
 import json
+import shutil
+import tempfile
 from datetime import datetime
 
 import discord
@@ -8,6 +13,74 @@ from discord.ui import View, Button
 
 from utils.utils import user_has_role
 
+ANSWERS_FILE = "storage/standup_answers.json"
+EXPORT_FORMATS = {"csv": "csv", "markdown": "md", "ndjson": "ndjson"}
+SPOOL_MAX_SIZE = 512 * 1024  # keep small exports in memory, roll bigger ones to disk
+COMPRESS_THRESHOLD = 1024 * 1024  # gzip exports above 1 MB
+
+
+def iter_answer_rows(data: dict, dates: list):
+    """Yield (date, user_id, question, answer) for every stored answer, one at a time."""
+    for date in dates:
+        for user_id, user_data in data.get(date, {}).items():
+            answers = user_data.get("answers", {})
+            questions = user_data.get("questions_snapshot", {})
+            for key in answers:
+                yield date, user_id, questions.get(key, "Unknown Question"), answers.get(key) or ""
+
+
+def write_export(out, rows, fmt: str, user_name):
+    """Write the rows into the text stream `out` in the chosen format."""
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["date", "user_id", "user", "question", "answer"])
+        for date, user_id, question, answer in rows:
+            writer.writerow([date, user_id, user_name(user_id), question, answer])
+
+    elif fmt == "ndjson":
+        for date, user_id, question, answer in rows:
+            out.write(json.dumps({
+                "date": date,
+                "user_id": user_id,
+                "user": user_name(user_id),
+                "question": question,
+                "answer": answer,
+            }, ensure_ascii=False))
+            out.write("\n")
+
+    else:
+        current_date, current_user = None, None
+        for date, user_id, question, answer in rows:
+            if date != current_date:
+                out.write(f"# Standup for {date}\n\n")
+                current_date, current_user = date, None
+            if user_id != current_user:
+                out.write(f"## {user_name(user_id)}\n\n")
+                current_user = user_id
+            out.write(f"**{question}**\n\n{answer or '*No answer*'}\n\n")
+
+
+def build_export_file(data: dict, dates: list, fmt: str, user_name):
+    """Produce the export incrementally into a spooled temp file, gzipping it when it grows too big."""
+    extension = EXPORT_FORMATS[fmt]
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    out = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    write_export(out, iter_answer_rows(data, dates), fmt, user_name)
+    out.flush()
+    out.detach()  # hand the raw spool back without closing it
+
+    filename = f"standups_{dates[0]}_{dates[-1]}.{extension}"
+    if spool.tell() > COMPRESS_THRESHOLD:
+        compressed = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        spool.seek(0)
+        with gzip.GzipFile(fileobj=compressed, mode="wb") as gz:
+            shutil.copyfileobj(spool, gz)
+        spool.close()
+        spool, filename = compressed, filename + ".gz"
+
+    spool.seek(0)
+    return spool, filename
+
 
 class StandupPaginator(View):
     def __init__(self, bot: commands.Bot, data: dict, dates: list):
@@ -112,7 +185,7 @@ class Summary(commands.Cog):
             return
 
         try:
-            with open("storage/standup_answers.json", "r", encoding="utf-8") as f:
+            with open(ANSWERS_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             await interaction.response.send_message("No standup answers found.", ephemeral=True)
@@ -150,6 +223,61 @@ class Summary(commands.Cog):
         view = StandupPaginator(self.bot, filtered_data, selected_dates)
         await interaction.response.send_message(embed=await view.get_embed(), view=view, ephemeral=True)
 
+    @app_commands.command(name="summaryexport", description="Export standup answers for a date range as a file")
+    @app_commands.describe(
+        start="First date to include (yyyy-mm-dd), defaults to the oldest entry",
+        end="Last date to include (yyyy-mm-dd), defaults to the newest entry",
+        fmt="File format of the export"
+    )
+    @app_commands.choices(fmt=[app_commands.Choice(name=name, value=name) for name in EXPORT_FORMATS])
+    async def summary_export(self, interaction: discord.Interaction, start: str = None, end: str = None,
+                             fmt: str = "csv"):
+        if not await user_has_role(interaction, "StandupMod"):
+            await interaction.response.send_message(
+                "❌ You need the **StandupMod** role to use this command.", ephemeral=True
+            )
+            return
+
+        try:
+            start = datetime.strptime(start, "%Y-%m-%d").strftime("%Y-%m-%d") if start else None
+            end = datetime.strptime(end, "%Y-%m-%d").strftime("%Y-%m-%d") if end else None
+        except ValueError:
+            await interaction.response.send_message("⚠ Please provide dates in the yyyy-mm-dd format.",
+                                                    ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            with open(ANSWERS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            await interaction.followup.send("No standup answers found.", ephemeral=True)
+            return
+
+        selected_dates = [date for date in sorted(data.keys())
+                          if (not start or date >= start) and (not end or date <= end)]
+        if not selected_dates:
+            await interaction.followup.send("No matching standup entries found.", ephemeral=True)
+            return
+
+        def user_name(user_id):
+            # Only use cached users, fetching every author would defeat the point of a bulk export
+            user = self.bot.get_user(int(user_id))
+            return f"@{user.name}" if user else f"User {user_id}"
+
+        fp, filename = build_export_file(data, selected_dates, fmt, user_name)
+        try:
+            await interaction.followup.send(
+                f"📦 Exported {len(selected_dates)} day(s) of standups.",
+                file=discord.File(fp, filename=filename),
+                ephemeral=True
+            )
+        except discord.HTTPException as e:
+            await interaction.followup.send(f"⚠️ Failed to upload the export: {e}", ephemeral=True)
+        finally:
+            fp.close()
+
 
 async def setup(bot):
     await bot.add_cog(Summary(bot))
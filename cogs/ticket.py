@@ -1,40 +1,55 @@
-import json
-import os
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timedelta
 
 import discord
 from discord import app_commands, Interaction, Embed, ui
 from discord.ext.commands import Cog
 
-from utils.config_utils import load_config, save_config_changes
+from utils.config_utils import load_config, update_config
+from utils.events import publish
+from utils.health import set_ready
+from utils.member_cache import cache_members, get_role_members, is_lean
+from utils.ticket_sla import SLAScheduler, DEFAULT_SLA_HOURS_PER_PRIORITY
+from utils.ticket_store import (load_open_tickets, get_ticket, get_ticket_by_message, save_ticket, remove_tickets,
+                                count_open_tickets, allocate_ticket_id, ticket_transaction, TicketConflict)
+from utils.ticket_threads import TicketThreadManager, DEFAULT_ARCHIVE_AFTER_HOURS
 from utils.utils import user_has_role, get_timezone_from_string
 
 cfg = load_config()
-OPEN_TICKETS_FILE = 'open_tickets.json'
 tz = get_timezone_from_string(cfg["timezone"])
+SLA_COLORS = {1: discord.Color.red(), 2: discord.Color.dark_red()}
+
+# action -> (status, embed title, colour, message posted in the ticket thread before archiving)
+BULK_ACTIONS = {
+    "reject": ("Rejected", "❌ Rejected Ticket", discord.Color.red(),
+               "❌ Ticket rejected. This thread will now be archived."),
+    "close": ("Closed", "🔒 Closed Ticket", discord.Color.dark_gray(),
+              "🔒 Ticket closed without resolution. This thread will now be archived."),
+    "solve": ("Solved", "✅ Solved Ticket", discord.Color.green(),
+              "✅ Ticket marked as **solved**. This thread will now be archived."),
+}
+thread_manager = TicketThreadManager(cfg.get("ticket_thread_archive_hours", DEFAULT_ARCHIVE_AFTER_HOURS))
+
+BULK_CONCURRENCY = 4  # Discord edits running at once
+BULK_REQUEST_INTERVAL = 0.25  # seconds each worker waits between tickets, keeps us clear of the rate limits
+# ticket fields sent with webhook events, the Discord message ids only mean something inside the bot
+EVENT_TICKET_FIELDS = ("id", "title", "description", "created_at", "created_by", "status", "priority", "category",
+                       "assigned_to", "assigned_role", "thread_id", "updates")
 
 
 # ------------------- Utilities -------------------
-def load_open_tickets():
-    if not os.path.exists(OPEN_TICKETS_FILE):
-        return []
-    with open(OPEN_TICKETS_FILE, 'r') as f:
-        return json.load(f).get("tickets", [])
-
-
-def save_open_tickets(tickets):
-    with open(OPEN_TICKETS_FILE, 'w') as f:
-        json.dump({"tickets": tickets}, f, indent=2)
-
-
 def generate_ticket_id():
-    now = datetime.now(tz=tz)
-    return f"{now.year}-{now.strftime('%m%d%H%M%S')}"
+    return allocate_ticket_id(tz=tz)
 
 
 def validate_ticket_creation():
-    tickets = load_open_tickets()
-    return len(tickets) < 60
+    return count_open_tickets() < 60
+
+
+def publish_ticket_event(action, ticket, by=None):
+    """Queue a ticket.<action> event for the webhook sinks, see utils/events.py."""
+    publish(f"ticket.{action}", ticket={key: ticket.get(key) for key in EVENT_TICKET_FIELDS}, by=by)
 
 
 def build_ticket_embed(ticket, assign=False, color=discord.Color.orange()):
@@ -100,38 +115,37 @@ class CommentModal(ui.Modal, title="💬 Edit Comments"):
         comment_text = self.comment_input.value.strip()
         comment_lines = [line.strip() for line in comment_text.splitlines() if line.strip()]
 
-        # Replace updates entirely with the new comments
-        self.ticket["updates"] = comment_lines
-
-        # Save updated ticket
-        tickets = load_open_tickets()
-        for i, t in enumerate(tickets):
-            if t["id"] == self.ticket["id"]:
-                tickets[i] = self.ticket
-                break
-        save_open_tickets(tickets)
+        # Replace updates entirely with the new comments, written as a diff onto the latest stored ticket
+        try:
+            async with ticket_transaction(self.ticket["id"]) as tx:
+                if not tx.ticket:
+                    await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+                    return
+                tx.ticket["updates"] = comment_lines
+                tx.commit()
+                self.ticket = tx.ticket
+            publish_ticket_event("commented", self.ticket, by=interaction.user.id)
+        except TicketConflict:
+            await interaction.response.send_message(
+                "⚠️ The comments were changed by someone else at the same time, please try again.", ephemeral=True
+            )
+            return
 
         await self.message_callback(interaction, self.ticket, f"💬 {interaction.user.mention} updated comments.")
 
 
-# ------------------- Ticket Actions View -------------------
-class TicketActions(ui.View):
-    def __init__(self, ticket_id):
-        super().__init__(timeout=None)
-        self.ticket_id = ticket_id
+# ------------------- Ticket Actions -------------------
+async def copy_assign_command(interaction: Interaction, ticket_id):
+    command_example = f"/assign ticket_id:{ticket_id} assignees:   "
+    await interaction.response.send_message(
+        f"📋 Copy and paste this command below, using autocomplete to tag people/roles:\n```{command_example}```",
+        ephemeral=True
+    )
 
-    @ui.button(label="Assign (Copy Command)", style=discord.ButtonStyle.primary, custom_id="assign_ticket")
-    async def assign(self, interaction: Interaction, button: ui.Button):
-        command_example = f"/assign ticket_id:{self.ticket_id} assignees:   "
-        await interaction.response.send_message(
-            f"📋 Copy and paste this command below, using autocomplete to tag people/roles:\n```{command_example}```",
-            ephemeral=True
-        )
 
-    @ui.button(label="Reject Ticket", style=discord.ButtonStyle.danger, custom_id="reject_ticket")
-    async def reject(self, interaction: Interaction, button: ui.Button):
-        tickets = load_open_tickets()
-        ticket = next((t for t in tickets if t["id"] == self.ticket_id), None)
+async def reject_ticket(interaction: Interaction, ticket_id):
+    async with ticket_transaction(ticket_id) as tx:
+        ticket = tx.ticket
 
         if not ticket:
             await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
@@ -152,74 +166,60 @@ class TicketActions(ui.View):
                 return
 
         ticket["status"] = "Rejected"
+        warning = ""  # the interaction hasn't been answered yet, so this goes into the one response below
         try:
             msg = await mod_channel.fetch_message(ticket["mod_message_id"])
             new_embed = build_ticket_embed(ticket, assign=f"❌ Rejected Ticket", color=discord.Color.red())
             await msg.edit(embed=new_embed, view=None)
         except Exception as e:
-            await interaction.followup.send(f"⚠️ Failed to update the original ticket message: {e}", ephemeral=True)
-
-        tickets.remove(ticket)
-        save_open_tickets(tickets)
-
-        await interaction.response.send_message(
-            f"❌ Rejected ticket `{self.ticket_id}`",
-            ephemeral=True
-        )
+            warning = f"\n⚠️ Failed to update the original ticket message: {e}"
 
-    @ui.button(label="Comment", style=discord.ButtonStyle.secondary, custom_id="comment_ticket")
-    async def comment(self, interaction: Interaction, button: ui.Button):
-        tickets = load_open_tickets()
-        ticket = next((t for t in tickets if t["id"] == self.ticket_id), None)
+        tx.remove()
+        publish_ticket_event("rejected", ticket, by=interaction.user.id)
+        if ticket.get("thread_id"):
+            thread_manager.untrack(ticket["thread_id"])
 
-        if not ticket:
-            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
-            return
+    await interaction.response.send_message(
+        f"❌ Rejected ticket `{ticket_id}`{warning}",
+        ephemeral=True
+    )
 
-        async def after_comment_submit(interaction: Interaction, updated_ticket, new_comment: str):
-            try:
-                # Update mod message
-                mod_channel = interaction.guild.get_channel(updated_ticket["mod_channel_id"])
-                mod_message = await mod_channel.fetch_message(updated_ticket["mod_message_id"])
-                embed = build_ticket_embed(updated_ticket, assign=False)
-                await mod_message.edit(embed=embed)
-
-                # Post to thread if exists
-                thread_id = updated_ticket.get("thread_id")
-                if thread_id:
-                    try:
-                        thread = await interaction.guild.fetch_channel(thread_id)
-                        await thread.send(f"💬 **New Comment from {interaction.user.mention}:**\n{new_comment}")
-                    except:
-                        pass
-                await interaction.response.send_message("✅ Comment added to the ticket.", ephemeral=True)
-            except Exception as e:
-                await interaction.response.send_message(
-                    f"⚠️ Failed to update the ticket: {e}", ephemeral=True
-                )
 
-        await interaction.response.send_modal(CommentModal(ticket, after_comment_submit))
+async def comment_ticket(interaction: Interaction, ticket_id):
+    ticket = get_ticket(ticket_id)
 
+    if not ticket:
+        await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+        return
 
-# ------------------- Assigned Ticket View -------------------
+    async def after_comment_submit(interaction: Interaction, updated_ticket, new_comment: str):
+        try:
+            # Update mod message
+            mod_channel = interaction.guild.get_channel(updated_ticket["mod_channel_id"])
+            mod_message = await mod_channel.fetch_message(updated_ticket["mod_message_id"])
+            embed = build_ticket_embed(updated_ticket, assign=False)
+            await mod_message.edit(embed=embed)
+
+            # Post to thread if exists
+            thread_id = updated_ticket.get("thread_id")
+            if thread_id:
+                try:
+                    thread = await thread_manager.get(interaction.guild, thread_id)
+                    await thread.send(f"💬 **New Comment from {interaction.user.mention}:**\n{new_comment}")
+                except:
+                    pass
+            await interaction.response.send_message("✅ Comment added to the ticket.", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(
+                f"⚠️ Failed to update the ticket: {e}", ephemeral=True
+            )
 
-class AssignedTicketActions(ui.View):
-    def __init__(self, ticket_id):
-        super().__init__(timeout=None)
-        self.ticket_id = ticket_id
+    await interaction.response.send_modal(CommentModal(ticket, after_comment_submit))
 
-    @ui.button(label="Assign (Copy Command)", style=discord.ButtonStyle.primary, custom_id="assign_ticket")
-    async def assign(self, interaction: Interaction, button: ui.Button):
-        command_example = f"/assign ticket_id:{self.ticket_id} assignees:   "
-        await interaction.response.send_message(
-            f"📋 Copy and paste this command below, using autocomplete to tag people/roles:\n```{command_example}```",
-            ephemeral=True
-        )
 
-    @ui.button(label="✅ Mark as Solved", style=discord.ButtonStyle.success, custom_id="solve_ticket")
-    async def solve(self, interaction: Interaction, button: ui.Button):
-        tickets = load_open_tickets()
-        ticket = next((t for t in tickets if t["id"] == self.ticket_id), None)
+async def solve_ticket(interaction: Interaction, ticket_id):
+    async with ticket_transaction(ticket_id) as tx:
+        ticket = tx.ticket
 
         if not ticket:
             await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
@@ -234,22 +234,24 @@ class AssignedTicketActions(ui.View):
             await mod_message.edit(embed=embed, view=None)
 
             if thread_id := ticket.get("thread_id"):
-                thread = await interaction.guild.fetch_channel(thread_id)
+                thread = await thread_manager.get(interaction.guild, thread_id)
                 await thread.send("✅ Ticket marked as **solved**. This thread will now be archived.")
                 await thread.edit(archived=True, locked=True)
+                thread_manager.untrack(thread_id)
 
-            tickets.remove(ticket)
-            save_open_tickets(tickets)
+            tx.remove()
+            publish_ticket_event("solved", ticket, by=interaction.user.id)
 
             await interaction.response.send_message("✅ Ticket marked as solved and closed.", ephemeral=True)
 
         except Exception as e:
+            tx.discard()
             await interaction.response.send_message(f"⚠️ Error updating ticket: {e}", ephemeral=True)
 
-    @ui.button(label="❌ Close (Unsolved)", style=discord.ButtonStyle.danger, custom_id="close_unsolved_ticket")
-    async def close_unsolved(self, interaction: Interaction, button: ui.Button):
-        tickets = load_open_tickets()
-        ticket = next((t for t in tickets if t["id"] == self.ticket_id), None)
+
+async def close_unsolved_ticket(interaction: Interaction, ticket_id):
+    async with ticket_transaction(ticket_id) as tx:
+        ticket = tx.ticket
 
         if not ticket:
             await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
@@ -264,19 +266,92 @@ class AssignedTicketActions(ui.View):
             await mod_message.edit(embed=embed, view=None)
 
             if thread_id := ticket.get("thread_id"):
-                thread = await interaction.guild.fetch_channel(thread_id)
+                thread = await thread_manager.get(interaction.guild, thread_id)
                 await thread.send("🔒 Ticket closed without resolution. This thread will now be archived.")
                 await thread.edit(archived=True, locked=True)
+                thread_manager.untrack(thread_id)
 
-            tickets.remove(ticket)
-            save_open_tickets(tickets)
+            tx.remove()
+            publish_ticket_event("closed", ticket, by=interaction.user.id)
 
             await interaction.response.send_message("🔒 Ticket closed (unsolved).", ephemeral=True)
 
         except Exception as e:
+            tx.discard()
             await interaction.response.send_message(f"⚠️ Error closing ticket: {e}", ephemeral=True)
 
 
+TICKET_ACTIONS = {
+    # action -> (label, style, handler)
+    "assign": ("Assign (Copy Command)", discord.ButtonStyle.primary, copy_assign_command),
+    "reject": ("Reject Ticket", discord.ButtonStyle.danger, reject_ticket),
+    "comment": ("Comment", discord.ButtonStyle.secondary, comment_ticket),
+    "solve": ("✅ Mark as Solved", discord.ButtonStyle.success, solve_ticket),
+    "close": ("❌ Close (Unsolved)", discord.ButtonStyle.danger, close_unsolved_ticket),
+}
+OPEN_TICKET_ACTIONS = ["assign", "reject", "comment"]
+ASSIGNED_TICKET_ACTIONS = ["assign", "solve", "close"]
+LEGACY_ACTIONS = {"assign": "assign", "reject": "reject", "comment": "comment", "solve": "solve",
+                  "close_unsolved": "close"}
+
+
+class TicketButton(ui.DynamicItem[ui.Button], template=r"ticket:(?P<action>[a-z]+):(?P<ticket_id>[0-9-]+)"):
+    """
+    Ticket moderation button whose custom_id carries the ticket id (`ticket:<action>:<id>`).
+    Clicks are routed by parsing the id at click time, so no per-ticket View has to be kept in memory
+    or re-registered on startup.
+    """
+
+    def __init__(self, action, ticket_id):
+        label, style, _ = TICKET_ACTIONS[action]
+        super().__init__(ui.Button(label=label, style=style, custom_id=f"ticket:{action}:{ticket_id}"))
+        self.action = action
+        self.ticket_id = ticket_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item: ui.Button, match):
+        return cls(match["action"], match["ticket_id"])
+
+    async def callback(self, interaction: Interaction):
+        handler = TICKET_ACTIONS.get(self.action, (None, None, None))[2]
+        if handler:
+            await handler(interaction, self.ticket_id)
+
+
+class LegacyTicketButton(ui.DynamicItem[ui.Button],
+                         template=r"(?P<action>assign|reject|comment|solve|close_unsolved)_ticket"):
+    """Buttons on messages sent before ids were embedded in custom_ids, resolved through the mod message id."""
+
+    def __init__(self, action, ticket_id=None):
+        label, style, _ = TICKET_ACTIONS[LEGACY_ACTIONS[action]]
+        super().__init__(ui.Button(label=label, style=style, custom_id=f"{action}_ticket"))
+        self.action = LEGACY_ACTIONS[action]
+        self.ticket_id = ticket_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item: ui.Button, match):
+        ticket = get_ticket_by_message(interaction.message.id) if interaction.message else None
+        return cls(match["action"], ticket["id"] if ticket else None)
+
+    async def callback(self, interaction: Interaction):
+        if self.ticket_id is None:
+            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+            return
+        await TICKET_ACTIONS[self.action][2](interaction, self.ticket_id)
+
+
+def build_ticket_view(ticket_id, assigned=False):
+    """
+    Buttons for a ticket's mod message. The view is stopped before it's sent so discord.py doesn't
+    keep it around, TicketButton handles the clicks from its custom_id.
+    """
+    view = ui.View(timeout=None)
+    for action in (ASSIGNED_TICKET_ACTIONS if assigned else OPEN_TICKET_ACTIONS):
+        view.add_item(TicketButton(action, ticket_id))
+    view.stop()
+    return view
+
+
 # ------------------- Ticket Form -------------------
 class TicketModal(ui.Modal, title="Submit a Ticket"):
     title_input = ui.TextInput(label="Ticket Title", placeholder="Short title", max_length=100)
@@ -321,14 +396,17 @@ class TicketModal(ui.Modal, title="Submit a Ticket"):
             return
 
         embed = build_ticket_embed(ticket)
-        view = TicketActions(ticket["id"])
+        view = build_ticket_view(ticket["id"])
         mod_msg = await mod_channel.send(embed=embed, view=view)
         ticket["mod_message_id"] = mod_msg.id
         ticket["mod_channel_id"] = mod_channel.id
 
-        tickets = load_open_tickets()
-        tickets.append(ticket)
-        save_open_tickets(tickets)
+        save_ticket(ticket)
+        publish_ticket_event("created", ticket, by=interaction.user.id)
+
+        ticket_cog = interaction.client.get_cog("Ticket")
+        if ticket_cog:
+            ticket_cog.sla.track(ticket)
 
         await interaction.response.send_message(f"✅ Ticket created! Your ticket ID is `{ticket['id']}`.",
                                                 ephemeral=True)
@@ -338,17 +416,166 @@ async def add_ticket_mods_to_thread(thread: discord.Thread, guild: discord.Guild
     ticket_mod_role = discord.utils.get(guild.roles, name="TicketMod")
     if not ticket_mod_role:
         return
-    for mod in ticket_mod_role.members:
+    for mod in await get_role_members(guild, ticket_mod_role):
         try:
             await thread.add_user(mod)
         except discord.Forbidden:
             pass  # Bot lacks permission
 
 
+def ticket_matches(ticket, older_than_days=None, category=None, min_priority=None, max_priority=None,
+                   status=None):
+    if category and ticket.get("category", "").lower() != category.lower():
+        return False
+    if min_priority is not None and ticket["priority"] < min_priority:
+        return False
+    if max_priority is not None and ticket["priority"] > max_priority:
+        return False
+    if status:
+        assigned = bool(ticket.get("assigned_to") or ticket.get("assigned_role"))
+        if assigned != (status == "assigned"):
+            return False
+    if older_than_days is not None:
+        try:
+            created_at = datetime.fromisoformat(ticket["created_at"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if datetime.now(tz=created_at.tzinfo) - created_at < timedelta(days=older_than_days):
+            return False
+    return True
+
+
+async def close_ticket_messages(guild: discord.Guild, tickets, action, on_progress=None):
+    """
+    Update the mod messages and archive the threads of already removed tickets through a small
+    worker pool. Returns (number of tickets that failed, tickets whose mod message wasn't updated).
+    The latter still show their buttons, so the caller puts them back.
+    """
+    status, title, color, thread_message = BULK_ACTIONS[action]
+    queue = asyncio.Queue()
+    for ticket in tickets:
+        queue.put_nowait(ticket)
+    failed = 0
+    unchanged = []
+    done = 0
+
+    async def worker():
+        nonlocal failed, done
+        while True:
+            try:
+                ticket = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            message_updated = False
+            try:
+                mod_channel = guild.get_channel(ticket.get("mod_channel_id"))
+                if mod_channel and ticket.get("mod_message_id"):
+                    # A partial message edits without fetching it first, one request instead of two
+                    await mod_channel.get_partial_message(ticket["mod_message_id"]).edit(
+                        embed=build_ticket_embed({**ticket, "status": status}, assign=title, color=color), view=None
+                    )
+                message_updated = True
+
+                if thread_id := ticket.get("thread_id"):
+                    thread = await thread_manager.get(guild, thread_id)
+                    await thread.send(thread_message)
+                    await thread.edit(archived=True, locked=True)
+                    thread_manager.untrack(thread_id)
+            except Exception as e:
+                failed += 1
+                print(f"❌ Bulk {action} failed for ticket {ticket['id']}: {e}")
+                if not message_updated:
+                    unchanged.append(ticket)
+
+            done += 1
+            if on_progress:
+                await on_progress(done)
+            await asyncio.sleep(BULK_REQUEST_INTERVAL)
+
+    await asyncio.gather(*(worker() for _ in range(min(BULK_CONCURRENCY, len(tickets)))))
+    return failed, unchanged
+
+
 # ------------------- Ticket Cog -------------------
 class Ticket(Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.sla = SLAScheduler(self.escalate_ticket,
+                                hours_per_priority=cfg.get("ticket_sla_hours", DEFAULT_SLA_HOURS_PER_PRIORITY))
+
+    async def cog_load(self):
+        tickets = load_open_tickets()
+        self.sla.rebuild(tickets)
+        self.sla.start()
+        thread_manager.rebuild(tickets)
+        thread_manager.start(self.bot)
+
+    async def cog_unload(self):
+        self.sla.stop()
+        thread_manager.stop()
+
+    @Cog.listener()
+    async def on_ready(self):
+        if not is_lean():
+            return
+        # Lean member cache: load just the TicketMods and the people working on open tickets
+        assignee_ids = {user_id for t in load_open_tickets() for user_id in t.get("assigned_to") or []}
+        for guild in self.bot.guilds:
+            ticket_mod_role = discord.utils.get(guild.roles, name="TicketMod")
+            if ticket_mod_role:
+                await get_role_members(guild, ticket_mod_role)
+            await cache_members(guild, sorted(assignee_ids))
+
+    @Cog.listener()
+    async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
+        if not thread_manager.is_ticket_thread(after.id):
+            return
+        thread_manager.cache(after)
+        if before.archived and not after.archived:
+            # Someone revived an archived ticket thread, its inactivity window starts over
+            thread_manager.track(after.id)
+
+    @Cog.listener()
+    async def on_thread_delete(self, thread: discord.Thread):
+        thread_manager.forget(thread.id)
+
+    async def escalate_ticket(self, ticket_id, level):
+        """Called by the SLA timer when a ticket passes a deadline. Returns the ticket if it's still open."""
+        await self.bot.wait_until_ready()
+
+        ticket = get_ticket(ticket_id)
+        if ticket and self.bot.shard_count and self.bot.get_channel(ticket.get("mod_channel_id")) is None:
+            return None  # the mod channel's server is on another process' shards, that process escalates
+
+        try:
+            async with ticket_transaction(ticket_id) as tx:
+                ticket = tx.ticket
+                if not ticket or ticket.get("sla_level", 0) >= level:
+                    return None  # closed in the meantime, or a duplicate heap entry
+
+                ticket["sla_level"] = level
+        except TicketConflict:
+            return None  # another process escalated it first
+
+        mod_channel = self.bot.get_channel(ticket.get("mod_channel_id"))
+        if mod_channel is None:
+            return ticket
+
+        assigned = bool(ticket.get("assigned_to") or ticket.get("assigned_role"))
+        try:
+            msg = await mod_channel.fetch_message(ticket["mod_message_id"])
+            await msg.edit(embed=build_ticket_embed(ticket, assign=assigned, color=SLA_COLORS.get(level)))
+        except Exception as e:
+            print(f"❌ Failed to update SLA colour for ticket {ticket_id}: {e}")
+
+        ticket_mod_role = discord.utils.get(mod_channel.guild.roles, name="TicketMod")
+        overdue = "has breached its SLA" if level == 1 else "is still unresolved well past its SLA"
+        await mod_channel.send(
+            f"{ticket_mod_role.mention if ticket_mod_role else ''} ⏰ Ticket `{ticket_id}` "
+            f"(priority {ticket['priority']}) {overdue}."
+        )
+        return ticket
 
     @app_commands.command(name="ticketchannel", description="Set the channel where ticket threads will be created.")
     @app_commands.describe(channel="The text channel for ticket threads")
@@ -370,10 +597,8 @@ class Ticket(Cog):
             return
 
         try:
-            if "tickets_channel_id" not in cfg:
-                cfg["tickets_channel_id"] = None
-            cfg["tickets_channel_id"] = channel.id
-            save_config_changes(cfg)
+            with update_config():
+                cfg["tickets_channel_id"] = channel.id
 
             await interaction.response.send_message(
                 f"📨 Ticket threads will now be created in {channel.mention}.", ephemeral=True
@@ -383,6 +608,26 @@ class Ticket(Cog):
                 f"⚠️ Failed to set ticket channel: `{str(e)}`", ephemeral=True
             )
 
+    @app_commands.command(name="ticketarchive",
+                          description="Set after how many hours of inactivity ticket threads are archived.")
+    @app_commands.describe(hours="Hours without messages before a ticket thread is archived (0 to disable)")
+    async def ticket_archive(self, interaction: Interaction, hours: app_commands.Range[int, 0, 720]):
+        if not await user_has_role(interaction, "TicketMod"):
+            await interaction.response.send_message(
+                "❌ You need the **TicketMod** role to use this command.", ephemeral=True
+            )
+            return
+
+        with update_config():
+            cfg["ticket_thread_archive_hours"] = hours
+        thread_manager.archive_after_hours = hours
+        thread_manager.rebuild(load_open_tickets())
+
+        await interaction.response.send_message(
+            f"📦 Ticket threads will be archived after **{hours}h** of inactivity." if hours
+            else "📦 Automatic archiving of ticket threads is disabled.", ephemeral=True
+        )
+
     @app_commands.command(name="ticket", description="Submit a ticket to the moderators.")
     async def ticket(self, interaction: Interaction):
         if not validate_ticket_creation():
@@ -391,6 +636,79 @@ class Ticket(Cog):
             return
         await interaction.response.send_modal(TicketModal(interaction))
 
+    @app_commands.command(name="ticketbulk", description="Reject, close or solve every open ticket matching a filter.")
+    @app_commands.describe(
+        action="What to do with the matching tickets",
+        older_than_days="Only tickets created at least this many days ago",
+        category="Only tickets in this category (e.g. Bug)",
+        min_priority="Only tickets with at least this priority",
+        max_priority="Only tickets with at most this priority",
+        status="Only unassigned or only assigned tickets"
+    )
+    @app_commands.choices(
+        action=[app_commands.Choice(name=name, value=name) for name in BULK_ACTIONS],
+        status=[app_commands.Choice(name="open", value="open"), app_commands.Choice(name="assigned", value="assigned")]
+    )
+    async def ticket_bulk(self, interaction: Interaction, action: str, older_than_days: int = None,
+                          category: str = None, min_priority: int = None, max_priority: int = None,
+                          status: str = None):
+        await interaction.response.defer(ephemeral=True)
+        if not await user_has_role(interaction, "TicketMod"):
+            await interaction.followup.send(
+                "❌ You need the **TicketMod** role to use this command.", ephemeral=True
+            )
+            return
+
+        if older_than_days is None and not category and min_priority is None and max_priority is None \
+                and not status:
+            await interaction.followup.send("❌ Please set at least one filter.", ephemeral=True)
+            return
+
+        matching = [t["id"] for t in load_open_tickets()
+                    if ticket_matches(t, older_than_days, category, min_priority, max_priority, status)]
+
+        # One write for the whole batch, the Discord side follows afterwards
+        tickets = remove_tickets(matching)
+        if not tickets:
+            await interaction.followup.send("ℹ️ No open tickets match these filters.", ephemeral=True)
+            return
+
+        total = len(tickets)
+        progress = await interaction.followup.send(f"⏳ Updating tickets: 0/{total}...",
+                                                   ephemeral=True, wait=True)
+        last_edit = time.monotonic()
+
+        async def on_progress(done):
+            nonlocal last_edit
+            if done < total and time.monotonic() - last_edit < 2:
+                return
+            last_edit = time.monotonic()
+            try:
+                await progress.edit(content=f"⏳ Updating tickets: {done}/{total}...")
+            except discord.HTTPException:
+                pass
+
+        failed, unchanged = await close_ticket_messages(interaction.guild, tickets, action, on_progress)
+
+        # Their mod message still has live buttons, so the ticket stays open rather than vanish under it
+        for ticket in unchanged:
+            save_ticket(ticket)
+        unchanged_ids = {ticket["id"] for ticket in unchanged}
+        status = BULK_ACTIONS[action][0]
+        for ticket in tickets:
+            if ticket["id"] not in unchanged_ids:
+                publish_ticket_event(status.lower(), {**ticket, "status": status}, by=interaction.user.id)
+
+        summary = f"✅ {status} {total - len(unchanged)} ticket(s)."
+        if unchanged:
+            summary += f" ⚠️ {len(unchanged)} ticket message(s) couldn't be updated, those tickets stay open."
+        if failed > len(unchanged):
+            summary += f" ⚠️ {failed - len(unchanged)} thread update(s) failed, see the logs."
+        skipped = len(matching) - total
+        if skipped:
+            summary += f" {skipped} ticket(s) were being edited by someone else and were skipped."
+        await progress.edit(content=summary)
+
     @app_commands.command(name="assign", description="Assign users or roles to a ticket and create a thread.")
     @app_commands.describe(ticket_id="Ticket ID", assignees="Mention users or roles (e.g. @User @Role)")
     async def assign(self, interaction: Interaction, ticket_id: str, assignees: str):
@@ -401,18 +719,28 @@ class Ticket(Cog):
             )
             return
 
-        tickets = load_open_tickets()
-        ticket = next((t for t in tickets if t["id"] == ticket_id), None)
+        try:
+            async with ticket_transaction(ticket_id) as tx:
+                await self._assign_ticket(interaction, tx, ticket_id, assignees)
+        except TicketConflict:
+            await interaction.followup.send(
+                "⚠️ This ticket was changed by someone else at the same time, please try again.", ephemeral=True
+            )
 
-        def assignees_parser():
-            ids = []
-            for word in assignees.split():
-                if word.startswith("<@") or word.startswith("<@&"):
-                    try:
-                        ids.append(int(word.strip("<@!&>")))
-                    except ValueError:
-                        continue
+    async def _assign_ticket(self, interaction: Interaction, tx, ticket_id: str, assignees: str):
+        ticket = tx.ticket
+
+        ids = []
+        for word in assignees.split():
+            if word.startswith("<@") or word.startswith("<@&"):
+                try:
+                    ids.append(int(word.strip("<@!&>")))
+                except ValueError:
+                    continue
+        # Mentioned users may not be in a lean member cache yet
+        await cache_members(interaction.guild, [i for i in ids if not interaction.guild.get_role(i)])
 
+        def assignees_parser():
             members = [interaction.guild.get_member(i) for i in ids if interaction.guild.get_member(i)]
             roles = [interaction.guild.get_role(i) for i in ids if interaction.guild.get_role(i)]
             return members, roles
@@ -424,7 +752,7 @@ class Ticket(Cog):
             return
 
         if ticket.get("thread_id"):
-            thread = await interaction.guild.fetch_channel(ticket["thread_id"])
+            thread = await thread_manager.get(interaction.guild, ticket["thread_id"])
             fetched_members = await thread.fetch_members()
             already_in_thread = [
                 interaction.guild.get_member(m.id)
@@ -444,7 +772,7 @@ class Ticket(Cog):
                         continue
 
             for role in roles:
-                for member in role.members:
+                for member in await get_role_members(interaction.guild, role):
                     if member not in already_in_thread and member not in added:
                         try:
                             await thread.add_user(member)
@@ -457,7 +785,8 @@ class Ticket(Cog):
                 ticket["assigned_to"] = list(set(ticket.get("assigned_to", []) + [m.id for m in members]))
                 ticket["assigned_role"] = list(set(ticket.get("assigned_role", []) + [r.id for r in roles]))
                 ticket["status"] = "Assigned/In Progress"
-                save_open_tickets(tickets)
+                tx.commit()
+                publish_ticket_event("assigned", ticket, by=interaction.user.id)
 
                 mod_channel_id = ticket.get("mod_channel_id")
                 if mod_channel_id:
@@ -467,7 +796,7 @@ class Ticket(Cog):
                             msg = await mod_channel.fetch_message(ticket["mod_message_id"])
                             new_embed = build_ticket_embed(ticket, assign=True,
                                                            color=discord.Color.from_rgb(52, 152, 219))
-                            await msg.edit(embed=new_embed, view=AssignedTicketActions(ticket["id"]))
+                            await msg.edit(embed=new_embed, view=build_ticket_view(ticket["id"], assigned=True))
                         except Exception as e:
                             await interaction.followup.send(
                                 f"⚠️ Failed to update the original ticket message: {e}", ephemeral=True
@@ -512,6 +841,8 @@ class Ticket(Cog):
             invitable=False  # only mods can invite
         )
 
+        thread_manager.cache(thread)
+        thread_manager.track(thread.id)
         await add_ticket_mods_to_thread(thread=thread, guild=interaction.guild)
 
         # Add members and roles to the thread
@@ -522,7 +853,7 @@ class Ticket(Cog):
                 pass
 
         for role in roles:
-            for member in role.members:
+            for member in await get_role_members(interaction.guild, role):
                 try:
                     await thread.add_user(member)
                 except discord.Forbidden:
@@ -530,7 +861,8 @@ class Ticket(Cog):
 
         ticket["thread_id"] = thread.id
         ticket["status"] = "Assigned/In Progress"
-        save_open_tickets(tickets)
+        tx.commit()
+        publish_ticket_event("assigned", ticket, by=interaction.user.id)
 
         # 2. Edit the original ticket message in the mod-tickets channel
         mod_channel_id = ticket.get("mod_channel_id")
@@ -547,7 +879,7 @@ class Ticket(Cog):
         try:
             msg = await mod_channel.fetch_message(ticket["mod_message_id"])
             new_embed = build_ticket_embed(ticket, assign=True, color=discord.Color.from_rgb(52, 152, 219))
-            await msg.edit(embed=new_embed, view=AssignedTicketActions(ticket["id"]))
+            await msg.edit(embed=new_embed, view=build_ticket_view(ticket["id"], assigned=True))
         except Exception as e:
             await interaction.followup.send(f"⚠️ Failed to update the original ticket message: {e}", ephemeral=True)
 
@@ -560,4 +892,6 @@ class Ticket(Cog):
 
 
 async def setup(bot):
-    await bot.add_cog(Ticket(bot)) 
+    bot.add_dynamic_items(TicketButton, LegacyTicketButton)
+    set_ready("views_restored")
+    await bot.add_cog(Ticket(bot))
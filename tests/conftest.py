@@ -0,0 +1,20 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def shared_db(tmp_path, monkeypatch):
+    """A fresh shared store in a temp dir, with new connections for every thread."""
+    from utils import shared_state
+
+    db_file = tmp_path / "shared_state.db"
+    monkeypatch.setattr(shared_state, "SHARED_DB_FILE", str(db_file))
+    monkeypatch.setattr(shared_state, "_local", threading.local())
+    monkeypatch.setattr(shared_state, "_schema_ready", False)
+    monkeypatch.chdir(tmp_path)
+    return db_file
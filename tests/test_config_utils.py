@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from utils import config_utils
+from utils.config_utils import load_config, update_config
+
+
+@pytest.fixture
+def config_file(shared_db, tmp_path, monkeypatch):
+    (tmp_path / "storage").mkdir()
+    monkeypatch.setattr(config_utils, "_cfg_cache", None)
+    monkeypatch.setattr(config_utils, "_cfg_mtime", None)
+    load_config()
+    return tmp_path / config_utils.CONFIG_FILE
+
+
+def save_from_another_process(path, **changes):
+    data = json.loads(path.read_text())
+    data.update(changes)
+    path.write_text(json.dumps(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # a later save, whatever the fs granularity
+
+
+def test_update_keeps_another_process_change(config_file):
+    cfg = load_config()
+    save_from_another_process(config_file, timezone="Europe/Sofia")
+    assert cfg["timezone"] == "UTC+0"  # this process hasn't looked yet
+
+    with update_config():
+        cfg["standup_time"] = [10, 30, "10:30"]
+
+    saved = json.loads(config_file.read_text())
+    assert saved["timezone"] == "Europe/Sofia"
+    assert saved["standup_time"] == [10, 30, "10:30"]
+    assert cfg["timezone"] == "Europe/Sofia"
+
+
+def test_unchanged_config_is_not_saved(config_file):
+    version = config_utils.get_config_version()
+    with update_config() as cfg:
+        cfg["toggled"] = cfg["toggled"]
+    assert config_utils.get_config_version() == version
+
+
+def test_failed_update_is_not_saved(config_file):
+    with pytest.raises(RuntimeError):
+        with update_config() as cfg:
+            cfg["timezone"] = "UTC+5"
+            raise RuntimeError("validation failed")
+    assert json.loads(config_file.read_text())["timezone"] == "UTC+0"
@@ -0,0 +1,145 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from utils import events
+from utils.events import EventPipeline, _signature
+from utils.shared_state import get_connection
+
+SINK = "http://sink.test/events"
+OTHER_SINK = "http://other.test/events"
+
+
+class RecordingPipeline(EventPipeline):
+    """Answers every batch with the next queued result instead of posting it."""
+
+    def __init__(self, sinks=(SINK,), results=()):
+        super().__init__(sinks)
+        self.results = list(results)
+        self.batches = []
+
+    async def _post(self, sink, bodies):
+        self.batches.append((sink, [json.loads(body)["data"]["n"] for body in bodies]))
+        return self.results.pop(0) if self.results else "ok"
+
+
+def spooled():
+    return [json.loads(body)["data"]["n"] for body, in get_connection().execute(
+        "SELECT body FROM event_spool ORDER BY seq")]
+
+
+def last_seq():
+    return get_connection().execute("SELECT MAX(seq) FROM event_spool").fetchone()[0]
+
+
+def test_publish_without_sinks_spools_nothing(shared_db):
+    EventPipeline([]).publish("ticket_opened", n=1)
+    assert spooled() == []
+
+
+def test_drain_sends_batches_in_order_and_advances_cursor(shared_db):
+    pipeline = RecordingPipeline()
+    for n in range(250):
+        pipeline.publish("ticket_opened", n=n)
+
+    asyncio.run(pipeline._drain(SINK))
+
+    assert [len(batch) for _, batch in pipeline.batches] == [100, 100, 50]
+    assert [n for _, batch in pipeline.batches for n in batch] == list(range(250))
+    assert pipeline._cursor(SINK) == last_seq()
+
+    asyncio.run(pipeline._drain(SINK))  # caught up, nothing is sent twice
+    assert len(pipeline.batches) == 3
+
+
+def test_failed_batch_keeps_cursor_and_backs_off(shared_db):
+    pipeline = RecordingPipeline(results=["retry"])
+    for n in range(3):
+        pipeline.publish("ticket_opened", n=n)
+
+    async def drain_twice():
+        await pipeline._drain(SINK)
+        await pipeline._drain(SINK)  # still backing off, not even tried
+
+    asyncio.run(drain_twice())
+    assert pipeline.batches == [(SINK, [0, 1, 2])]
+    assert pipeline._cursor(SINK) == 0
+    assert pipeline._failures[SINK] == 1
+
+    pipeline._retry_at.clear()
+    asyncio.run(pipeline._drain(SINK))
+    assert pipeline.batches[-1] == (SINK, [0, 1, 2])
+    assert pipeline._cursor(SINK) == last_seq()
+    assert SINK not in pipeline._failures
+
+
+def test_rejected_batch_is_skipped(shared_db):
+    pipeline = RecordingPipeline(results=["skip"])
+    pipeline.publish("ticket_opened", n=0)
+
+    asyncio.run(pipeline._drain(SINK))
+    assert pipeline._cursor(SINK) == last_seq()
+
+
+def test_trim_spool_drops_the_oldest_events(shared_db, monkeypatch):
+    monkeypatch.setattr(events, "EVENT_SPOOL_MAX", 10)
+    pipeline = RecordingPipeline()
+    for n in range(15):
+        pipeline.publish("ticket_opened", n=n)
+
+    pipeline._trim_spool()
+    assert spooled() == list(range(5, 15))
+
+    pipeline._trim_spool()  # at the cap, nothing more goes
+    assert spooled() == list(range(5, 15))
+
+
+def test_delete_delivered_waits_for_the_slowest_sink(shared_db):
+    pipeline = RecordingPipeline(sinks=(SINK, OTHER_SINK))
+    for n in range(5):
+        pipeline.publish("ticket_opened", n=n)
+    seqs = [seq for seq, in get_connection().execute("SELECT seq FROM event_spool ORDER BY seq")]
+
+    pipeline._advance_cursor(SINK, seqs[4])
+    pipeline._delete_delivered()
+    assert spooled() == list(range(5))  # the other sink hasn't received anything yet
+
+    pipeline._advance_cursor(OTHER_SINK, seqs[1])
+    pipeline._delete_delivered()
+    assert spooled() == [2, 3, 4]
+
+
+class FakeResponse:
+    status = 204
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, data, headers):
+        self.requests.append((url, data, headers))
+        return FakeResponse()
+
+
+@pytest.mark.parametrize("count, compressed", [(1, False), (50, True)])
+def test_post_signs_the_uncompressed_body(count, compressed):
+    pipeline = EventPipeline([SINK], secret="s3cret")
+    pipeline._session = session = FakeSession()
+    bodies = [json.dumps({"id": str(n), "type": "ticket_opened", "data": {"n": n}}) for n in range(count)]
+
+    assert asyncio.run(pipeline._post(SINK, bodies)) == "ok"
+
+    _, data, headers = session.requests[0]
+    body = gzip.decompress(data) if compressed else data
+    assert ("Content-Encoding" in headers) == compressed
+    assert headers["X-StandUP-Signature"] == _signature("s3cret", body)
+    assert [event["data"]["n"] for event in json.loads(body)["events"]] == list(range(count))
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import license
+from utils.license import license_watchdog, load_last_validation, save_last_validation
+
+KEY = "key-1"
+VALID = {"valid": True, "tier": "t1", "expires": "2099-01-01T00:00:00+00:00"}
+
+
+class FakeBot:
+    def __init__(self):
+        self.closed = False
+
+    async def wait_until_ready(self):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def run_watchdog(monkeypatch, answers):
+    """Run the watchdog against queued (error, result) answers until it stops the bot or runs out of them."""
+    bot = FakeBot()
+    answers = list(answers)
+
+    async def validate(license_key, tier):
+        return answers.pop(0)
+
+    async def sleep(seconds):
+        if not answers:
+            bot.closed = True
+
+    monkeypatch.setattr(license, "validate_license", validate)
+    monkeypatch.setattr(license.asyncio, "sleep", sleep)
+    stopped = asyncio.Event()
+    asyncio.run(license_watchdog(bot, KEY, "t1", stopped=stopped))
+    return stopped.is_set()
+
+
+def test_release_builds_ignore_the_url_override():
+    assert not license.DEBUG_BUILD
+    assert license.LICENSE_API_URL == license.DEFAULT_LICENSE_API_URL
+
+
+def test_last_validation_within_the_grace_window(shared_db):
+    checked_at = time.time() - 3600
+    save_last_validation(KEY, VALID, checked_at)
+    assert load_last_validation(KEY, "t1") == checked_at
+    assert load_last_validation("key-2", "t1") is None
+    assert load_last_validation(KEY, "t2") is None
+
+
+def test_last_validation_past_the_grace_window(shared_db):
+    save_last_validation(KEY, VALID, time.time() - license.LICENSE_GRACE_HOURS * 3600 - 1)
+    assert load_last_validation(KEY, "t1") is None
+
+
+def test_last_validation_of_an_expired_license(shared_db):
+    save_last_validation(KEY, dict(VALID, expires="2020-01-01T00:00:00+00:00"), time.time())
+    assert load_last_validation(KEY, "t1") is None
+
+
+def test_api_down_on_a_first_start_stops_the_bot(shared_db, monkeypatch):
+    assert run_watchdog(monkeypatch, [("License API unavailable (HTTP 503)", None)])
+
+
+def test_api_down_after_a_recent_validation_keeps_running(shared_db, monkeypatch):
+    save_last_validation(KEY, VALID, time.time() - 3600)
+    assert not run_watchdog(monkeypatch, [("License API unavailable (HTTP 503)", None)])
+
+
+def test_successful_validation_is_kept_for_the_next_start(shared_db, monkeypatch):
+    assert not run_watchdog(monkeypatch, [(None, VALID)])
+    assert load_last_validation(KEY, "t1") is not None
+
+
+@pytest.mark.parametrize("stored", [True, False])
+def test_rejection_stops_the_bot_and_forgets_the_validation(shared_db, monkeypatch, stored):
+    if stored:
+        save_last_validation(KEY, VALID, time.time())
+    assert run_watchdog(monkeypatch, [("License invalid: revoked", {"valid": False, "error": "revoked"})])
+    assert load_last_validation(KEY, "t1") is None
@@ -0,0 +1,100 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from utils.schedule import Schedule, parse_skip
+
+EVERY_DAY = 0b1111111
+WEEKDAYS_ONLY = 0b0011111
+
+
+def schedule(*skips, day_mask=EVERY_DAY):
+    return Schedule(9, 0, timezone.utc, day_mask, [parse_skip(entry) for entry in skips])
+
+
+def at_nine(year, month, day):
+    return datetime(year, month, day, 9, 0, tzinfo=timezone.utc)
+
+
+def test_yearly_feb_29_only_skips_leap_years():
+    sched = schedule("02-29")
+    assert sched.is_skipped(date(2028, 2, 29))
+    assert not sched.is_skipped(date(2028, 2, 28))
+    assert not sched.is_skipped(date(2028, 3, 1))
+    assert sched.year_bitmap(2027) == (1 << 365) - 1  # no Feb 29 to take out
+
+    assert sched.next_after(at_nine(2028, 2, 28)) == at_nine(2028, 3, 1)
+    assert sched.next_after(at_nine(2027, 2, 28)) == at_nine(2027, 3, 1)
+
+
+def test_one_off_feb_29():
+    sched = schedule("2028-02-29")
+    assert sched.is_skipped(date(2028, 2, 29))
+    assert sched.next_after(at_nine(2032, 2, 28)) == at_nine(2032, 2, 29)
+
+
+def test_range_across_the_new_year():
+    sched = schedule("2026-12-24..2027-01-02")
+    assert not sched.is_skipped(date(2026, 12, 23))
+    for offset in range(10):
+        assert sched.is_skipped(date(2026, 12, 24) + timedelta(days=offset))
+    assert not sched.is_skipped(date(2027, 1, 3))
+
+    assert sched.next_after(at_nine(2026, 12, 23)) == at_nine(2027, 1, 3)
+    assert sched.next_after(at_nine(2026, 12, 23) - timedelta(minutes=1)) == at_nine(2026, 12, 23)
+
+
+def test_range_across_a_leap_new_year():
+    sched = schedule("2027-12-31..2028-01-01", "2028-12-31..2029-01-01")
+    assert sched.year_bitmap(2028).bit_length() == 365  # day 366 (Dec 31st) is cleared
+    assert sched.next_after(at_nine(2027, 12, 30)) == at_nine(2028, 1, 2)
+    assert sched.next_after(at_nine(2028, 12, 30)) == at_nine(2029, 1, 2)
+
+
+def test_range_spanning_several_years_is_scanned_past():
+    sched = schedule("2026-06-01..2031-06-01")
+    assert sched.next_after(at_nine(2026, 5, 31)) == at_nine(2031, 6, 2)
+
+
+def test_everything_skipped_gives_up():
+    sched = schedule(*[f"{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 32)
+                       if (month, day) not in ((2, 30), (2, 31), (4, 31), (6, 31), (9, 31), (11, 31))])
+    assert sched.next_after(at_nine(2026, 1, 1)) is None
+
+
+def test_skips_on_days_off_are_not_reported():
+    sched = schedule("2026-12-24..2027-01-02", day_mask=WEEKDAYS_ONLY)
+    assert not sched.is_skipped(date(2026, 12, 26))  # a Saturday, no standup anyway
+    assert sched.is_skipped(date(2026, 12, 28))
+
+
+@pytest.mark.parametrize("entries", [(), ("02-29",), ("12-25", "2026-12-24..2027-01-02"), ("2027-12-31..2028-01-01",)])
+def test_bitmap_matches_a_day_by_day_walk(entries):
+    sched = schedule(*entries, day_mask=WEEKDAYS_ONLY)
+    parsed = [parse_skip(entry) for entry in entries]
+
+    def walked(day):
+        for start, end in parsed:
+            if start is None and (day.month, day.day) == end or start and start <= day <= end:
+                return False
+        return day.weekday() < 5
+
+    for year in (2026, 2027, 2028):
+        day = date(year, 1, 1)
+        while day.year == year:
+            assert sched.is_standup_day(at_nine(day.year, day.month, day.day)) == walked(day), day
+            day += timedelta(days=1)
+
+
+@pytest.mark.parametrize("entry", ["02-30", "2026-13-01", "2027-02-29", "2027-01-02..2026-12-24", "12-24..2027-01-02",
+                                   "christmas"])
+def test_invalid_skip_entries(entry):
+    with pytest.raises(ValueError):
+        parse_skip(entry)
+
+
+def test_skip_entry_forms():
+    assert parse_skip("12-25") == (None, (12, 25))
+    assert parse_skip("02-29") == (None, (2, 29))
+    assert parse_skip(" 2026-12-24 ") == (date(2026, 12, 24), date(2026, 12, 24))
+    assert parse_skip("2026-12-24..2027-01-02") == (date(2026, 12, 24), date(2027, 1, 2))
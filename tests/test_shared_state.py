@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import shared_state
+from utils.shared_state import LeaderLease, claim_once
+
+
+def test_claim_once_is_exclusive_across_connections(shared_db):
+    # Every worker thread has its own connection, like separate bot processes
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: claim_once("standup:UTC:2026-01-05T09:00:00+00:00"), range(32)))
+    assert results.count(True) == 1
+    assert not claim_once("standup:UTC:2026-01-05T09:00:00+00:00")
+
+
+def test_claim_once_keys_are_independent(shared_db):
+    assert claim_once("announcement:2026-01-05")
+    assert claim_once("announcement:2026-01-06")
+    assert not claim_once("announcement:2026-01-05")
+
+
+def test_old_claims_are_forgotten(shared_db, monkeypatch):
+    assert claim_once("prewarm:2026-01-05")
+    now = shared_state.time.time()
+    monkeypatch.setattr(shared_state.time, "time", lambda: now + shared_state.CLAIM_RETENTION + 1)
+    assert claim_once("prewarm:2026-01-05")
+
+
+def test_lease_is_held_until_it_expires(shared_db, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(shared_state.time, "time", lambda: now)
+    lease = LeaderLease("standup", ttl=90)
+
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:1")
+    assert lease.try_acquire()
+    assert lease.try_acquire()  # renewing
+
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:2")
+    assert not lease.try_acquire()
+
+    now += 91
+    assert lease.try_acquire()  # the first holder stopped renewing, taken over
+
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:1")
+    assert not lease.try_acquire()
+
+
+def test_released_lease_can_be_taken_right_away(shared_db, monkeypatch):
+    lease = LeaderLease("events", ttl=60)
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:1")
+    assert lease.try_acquire()
+    lease.release()
+
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:2")
+    assert lease.try_acquire()
+
+
+def test_release_only_drops_own_lease(shared_db, monkeypatch):
+    lease = LeaderLease("events", ttl=60)
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:1")
+    assert lease.try_acquire()
+
+    monkeypatch.setattr(shared_state, "PROCESS_ID", "host:2")
+    lease.release()
+    assert not lease.try_acquire()
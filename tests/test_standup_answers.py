@@ -0,0 +1,34 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+
+from utils import scheduler
+from utils.scheduler import save_standup_answer
+
+
+def test_concurrent_submits_are_all_kept(shared_db, tmp_path, monkeypatch):
+    answers_file = tmp_path / "standup_answers.json"
+    monkeypatch.setattr(scheduler, "ANSWERS_FILE", str(answers_file))
+
+    def submit(user_id):
+        save_standup_answer(user_id, {"q1": f"answer {user_id}"}, {"q1": "What did you do?"}, tz=timezone.utc)
+
+    # Every worker thread has its own store connection, like separate bot processes
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(submit, range(40)))
+
+    (day,) = json.loads(answers_file.read_text()).values()
+    assert sorted(map(int, day)) == list(range(40))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_only_the_last_14_days_are_kept(shared_db, tmp_path, monkeypatch):
+    answers_file = tmp_path / "standup_answers.json"
+    answers_file.write_text(json.dumps({f"2020-01-{day:02d}": {} for day in range(1, 15)}))
+    monkeypatch.setattr(scheduler, "ANSWERS_FILE", str(answers_file))
+
+    save_standup_answer(1, {}, {}, tz=timezone.utc)
+
+    days = sorted(json.loads(answers_file.read_text()))
+    assert len(days) == 14
+    assert "2020-01-01" not in days
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from utils import ticket_store
+
+
+class FrozenDatetime(datetime):
+    current = datetime(2026, 1, 5, 9, 30, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def store(shared_db, monkeypatch):
+    monkeypatch.setattr(ticket_store, "datetime", FrozenDatetime)
+    monkeypatch.setattr(ticket_store, "_tickets", None)
+    monkeypatch.setattr(ticket_store, "_last_id", None)
+    monkeypatch.setattr(ticket_store, "_data_version", None)
+    monkeypatch.setattr(ticket_store, "_migrated", False)
+    FrozenDatetime.current = datetime(2026, 1, 5, 9, 30, 0)
+    return shared_db
+
+
+def allocate():
+    ticket_store._ensure_loaded()
+    return ticket_store.allocate_ticket_id()
+
+
+def test_ids_within_one_second_get_a_sequence_suffix(store):
+    assert [allocate() for _ in range(3)] == ["2026-0105093000", "2026-0105093000-01", "2026-0105093000-02"]
+
+
+def test_next_second_starts_a_new_id(store):
+    allocate()
+    FrozenDatetime.current = datetime(2026, 1, 5, 9, 30, 1)
+    assert allocate() == "2026-0105093001"
+
+
+def test_clock_going_backwards_keeps_ids_increasing(store):
+    assert allocate() == "2026-0105093000"
+    FrozenDatetime.current = datetime(2026, 1, 5, 9, 29, 0)
+    second = allocate()
+    assert second == "2026-0105093000-01"
+    assert second > "2026-0105093000"
+
+
+def test_ids_continue_after_another_process(store):
+    assert allocate() == "2026-0105093000"
+    # Another process hands out the next id through its own connection
+    other = sqlite3.connect(str(store), isolation_level=None)
+    other.execute("UPDATE kv SET value = ? WHERE key = 'last_ticket_id'", (json.dumps("2026-0105093000-04"),))
+    other.close()
+    assert allocate() == "2026-0105093000-05"
+
+
+def test_last_id_survives_a_restart(store, monkeypatch):
+    allocate()
+    monkeypatch.setattr(ticket_store, "_tickets", None)
+    monkeypatch.setattr(ticket_store, "_last_id", None)
+    monkeypatch.setattr(ticket_store, "_data_version", None)
+    assert allocate() == "2026-0105093000-01"
@@ -0,0 +1,132 @@
+# interactions_fake.py
+"""
+Posts signed interaction payloads to the bot's HTTP interactions endpoint, the way Discord would.
+
+    python tools/interactions_fake.py keygen
+    INTERACTIONS_PUBLIC_KEY=<public key> INTERACTIONS_ONLY=1 python bot.py
+    python tools/interactions_fake.py send --key <private key> --type ping
+    python tools/interactions_fake.py send --key <private key> --type command --name help
+    python tools/interactions_fake.py send --key <private key> --type button --custom-id standup:answer:20260105
+
+`keygen` prints a key pair: the public key goes into INTERACTIONS_PUBLIC_KEY, the private one signs the
+requests. --tamper changes the body after signing and --stale signs with a 10 minute old timestamp, both
+have to be rejected with 401. The handlers answer through Discord's callback endpoint, which doesn't
+know the fake interaction tokens, so expect those calls to fail in the bot's log.
+"""
+import argparse
+import json
+import sys
+import time
+
+import aiohttp
+import asyncio
+
+try:
+    from nacl.signing import SigningKey
+except ImportError:
+    sys.exit("❌ PyNaCl is needed to sign requests: pip install PyNaCl")
+
+TYPES = {"ping": 1, "command": 2, "button": 3, "autocomplete": 4, "modal": 5}
+DISCORD_EPOCH = 1420070400000
+
+
+def snowflake():
+    return str((int(time.time() * 1000) - DISCORD_EPOCH) << 22)
+
+
+def build_payload(args):
+    kind = TYPES[args.type]
+    user = {"id": str(args.user), "username": "fake-user", "discriminator": "0", "global_name": "Fake User",
+            "avatar": None}
+    payload = {
+        "id": snowflake(),
+        "application_id": str(args.application),
+        "type": kind,
+        "token": "fake-interaction-token",
+        "version": 1,
+        "locale": "en-US",
+        "entitlements": [],
+        "authorizing_integration_owners": {"0": str(args.guild)},
+        "context": 0,
+        "app_permissions": "0",
+    }
+    if kind == 1:
+        return payload
+
+    payload.update({
+        "guild_id": str(args.guild),
+        "guild_locale": "en-US",
+        "channel_id": str(args.channel),
+        "channel": {"id": str(args.channel), "type": 0, "guild_id": str(args.guild), "name": "standup",
+                    "position": 0, "permission_overwrites": [], "nsfw": False, "parent_id": None, "flags": 0},
+        "member": {"user": user, "roles": [str(role) for role in args.role], "joined_at": "2024-01-01T00:00:00+00:00",
+                   "deaf": False, "mute": False, "flags": 0, "permissions": "0", "nick": None, "avatar": None},
+    })
+    if kind in (2, 4):
+        payload["data"] = {"id": snowflake(), "name": args.name, "type": 1,
+                           "options": json.loads(args.options) if args.options else []}
+    elif kind == 3:
+        payload["data"] = {"custom_id": args.custom_id, "component_type": 2}
+        payload["message"] = {"id": str(args.message or snowflake()), "channel_id": str(args.channel),
+                              "author": user, "content": "", "timestamp": "2024-01-01T00:00:00+00:00",
+                              "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+                              "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0,
+                              "components": []}
+    else:
+        payload["data"] = {"custom_id": args.custom_id, "components": json.loads(args.components)}
+    return payload
+
+
+async def send(args):
+    signing_key = SigningKey(bytes.fromhex(args.key))
+    body = json.dumps(build_payload(args) if not args.payload else json.load(open(args.payload))).encode()
+    timestamp = str(int(time.time()) - (600 if args.stale else 0))
+    signature = signing_key.sign(timestamp.encode() + body).signature.hex()
+    if args.tamper:
+        body = body.replace(b'"version": 1', b'"version": 2')
+
+    headers = {"Content-Type": "application/json", "X-Signature-Ed25519": signature,
+               "X-Signature-Timestamp": timestamp}
+    async with aiohttp.ClientSession() as session:
+        started = time.perf_counter()
+        async with session.post(args.url, data=body, headers=headers) as resp:
+            text = await resp.text()
+            print(f"⬅️ HTTP {resp.status} in {(time.perf_counter() - started) * 1000:.0f}ms {text}")
+            return resp.status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("keygen", help="print a new key pair")
+
+    sender = sub.add_parser("send", help="post one signed interaction")
+    sender.add_argument("--url", default="http://127.0.0.1:10000/interactions")
+    sender.add_argument("--key", required=True, help="private key from keygen (hex)")
+    sender.add_argument("--type", choices=TYPES, default="ping")
+    sender.add_argument("--name", default="help", help="command name for --type command/autocomplete")
+    sender.add_argument("--options", help="command options as a JSON list")
+    sender.add_argument("--custom-id", default="", help="custom_id for --type button/modal")
+    sender.add_argument("--components", default="[]", help="modal components as a JSON list")
+    sender.add_argument("--message", type=int, help="id of the message the button is on")
+    sender.add_argument("--payload", help="post this JSON file instead of a generated payload")
+    sender.add_argument("--application", type=int, default=1)
+    sender.add_argument("--guild", type=int, default=2)
+    sender.add_argument("--channel", type=int, default=3)
+    sender.add_argument("--user", type=int, default=4)
+    sender.add_argument("--role", type=int, action="append", default=[], help="role id of the user (repeatable)")
+    sender.add_argument("--tamper", action="store_true", help="change the body after signing")
+    sender.add_argument("--stale", action="store_true", help="sign with a 10 minute old timestamp")
+    args = parser.parse_args()
+
+    if args.command == "keygen":
+        key = SigningKey.generate()
+        print(f"private key: {bytes(key).hex()}")
+        print(f"public key:  {key.verify_key.encode().hex()}")
+        return
+    status = asyncio.run(send(args))
+    sys.exit(0 if status < 400 else 1)
+
+
+if __name__ == "__main__":
+    main()
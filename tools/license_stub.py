@@ -0,0 +1,52 @@
+# license_stub.py
+"""
+Local stand-in for the license API, for running the bot without reaching the real one.
+
+    python tools/license_stub.py --port 8787 --tier t1
+    LICENSE_API_URL=http://127.0.0.1:8787/validate LICENSE=anything python bot.py
+
+LICENSE_API_URL is only read by debug builds (DEBUG_BUILD in utils/license.py), release builds always
+ask the real API.
+
+--invalid answers every request with a rejection, --delay simulates a slow API and --down makes the
+endpoint return 503 so the offline grace period can be exercised.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+
+def build_app(args):
+    async def validate(request):
+        body = await request.json()
+        print(f"🔑 Validation request for {body.get('license_key')!r}")
+        if args.delay:
+            await asyncio.sleep(args.delay)
+        if args.down:
+            return web.json_response({"error": "unavailable"}, status=503)
+        if args.invalid:
+            return web.json_response({"valid": False, "error": "License revoked"})
+        expires = datetime.now(timezone.utc) + timedelta(days=args.days)
+        return web.json_response({"valid": True, "tier": args.tier, "expires": expires.isoformat()})
+
+    app = web.Application()
+    app.router.add_post("/validate", validate)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--tier", default="t1")
+    parser.add_argument("--days", type=int, default=30, help="days until the reported expiry")
+    parser.add_argument("--delay", type=float, default=0, help="seconds to wait before answering")
+    parser.add_argument("--invalid", action="store_true", help="reject every license")
+    parser.add_argument("--down", action="store_true", help="answer 503 to every request")
+    args = parser.parse_args()
+    web.run_app(build_app(args), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
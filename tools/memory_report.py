@@ -0,0 +1,123 @@
+# memory_report.py
+"""
+Compares the member cache of MEMORY_MODE=full and MEMORY_MODE=lean on a synthetic guild.
+
+    python tools/memory_report.py --members 100000 --standup 500 --mods 10
+
+The guild is built by discord.py itself from a GUILD_CREATE-like payload and, where the bot's setup
+chunks guilds at startup, the member chunks, so the numbers are the real Member objects the bot would
+download and hold, measured with tracemalloc. Lean mode additionally caches the standup audience and
+the TicketMods the way the bot does after its targeted chunk.
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+
+import discord
+from discord.state import ChunkRequest, ConnectionState
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GUILD_ID = 1 << 40
+STANDUP_ROLE_ID = GUILD_ID + 1
+MOD_ROLE_ID = GUILD_ID + 2
+BOT_ID = GUILD_ID + 3
+CHUNK_SIZE = 1000  # members per GUILD_MEMBERS_CHUNK event
+
+
+def build_payload(member_count, standup_count, mod_count):
+    roles = [
+        {"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0},
+        {"id": str(STANDUP_ROLE_ID), "name": "Standup", "permissions": "0", "position": 1},
+        {"id": str(MOD_ROLE_ID), "name": "TicketMod", "permissions": "0", "position": 2},
+    ]
+    members = []
+    for i in range(member_count):
+        user_id = GUILD_ID + 1000 + i
+        member_roles = []
+        if i < standup_count:
+            member_roles.append(str(STANDUP_ROLE_ID))
+        if standup_count <= i < standup_count + mod_count:
+            member_roles.append(str(MOD_ROLE_ID))
+        members.append({
+            "user": {"id": str(user_id), "username": f"user{i}", "discriminator": "0", "global_name": f"User {i}",
+                     "avatar": None},
+            "roles": member_roles,
+            "joined_at": "2024-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        })
+    return {
+        "id": str(GUILD_ID), "name": "Synthetic", "member_count": member_count, "roles": roles,
+        "members": members, "channels": [], "emojis": [], "stickers": [], "features": [],
+    }
+
+
+def build_state(mode):
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = False
+    flags = discord.MemberCacheFlags.none() if mode == "lean" else discord.MemberCacheFlags.from_intents(intents)
+    # Same as bot.py: lean mode doesn't request every member of every guild on startup
+    state = ConnectionState(dispatch=lambda *a, **k: None, handlers={}, hooks={}, http=None, intents=intents,
+                            member_cache_flags=flags, chunk_guilds_at_startup=mode != "lean")
+    state.user = None
+    return state
+
+
+def measure(mode, payload):
+    gc.collect()
+    tracemalloc.start()
+    state = build_state(mode)
+    # A large guild's GUILD_CREATE comes without its member list, the startup chunk brings the members
+    guild = discord.Guild(data=dict(payload, members=[]), state=state)
+    downloaded = 0
+    if state._guild_needs_chunking(guild):
+        request = ChunkRequest(guild.id, guild.shard_id, asyncio.get_event_loop(), lambda _: guild,
+                               cache=state.member_cache_flags.joined)
+        for i in range(0, len(payload["members"]), CHUNK_SIZE):
+            request.add_members([discord.Member(data=data, guild=guild, state=state)
+                                 for data in payload["members"][i:i + CHUNK_SIZE]])
+        downloaded = len(request.buffer)
+        request.done()
+        del request  # discord.py drops the finished request, only what it cached stays
+    if mode == "lean":
+        # What the targeted chunk leaves behind: just the standup audience and the TicketMods
+        for data in payload["members"]:
+            if data["roles"]:
+                guild._add_member(discord.Member(data=data, guild=guild, state=state))
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return downloaded, len(guild.members), current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--standup", type=int, default=500)
+    parser.add_argument("--mods", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    payload = build_payload(args.members, args.standup, args.mods)
+
+    print(f"📊 Synthetic guild: {args.members:,} members, {args.standup:,} in the standup role, "
+          f"{args.mods} TicketMods\n")
+    print(f"{'mode':<6} {'startup chunk':>14} {'cached members':>15} {'retained':>12} {'peak':>12}")
+    results = {}
+    for mode in ("full", "lean"):
+        downloaded, cached, current, peak = measure(mode, payload)
+        results[mode] = current
+        print(f"{mode:<6} {downloaded:>14,} {cached:>15,} {current / 2**20:>10.1f}MB {peak / 2**20:>10.1f}MB")
+
+    if results["full"]:
+        print(f"\n✅ Lean mode retains {100 * (1 - results['lean'] / results['full']):.1f}% less member cache memory")
+
+
+if __name__ == "__main__":
+    main()
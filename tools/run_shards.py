@@ -0,0 +1,53 @@
+# run_shards.py
+"""
+Runs the bot as several processes on one machine, each with its own slice of the shards.
+
+    python tools/run_shards.py --shards 4 --processes 2
+
+Process i gets shards i, i + processes, ... and listens on PORT + i. All of them share the SQLite store
+in storage/, which decides which process fires each standup. Ctrl+C / SIGTERM stops every process.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # project root
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="total number of shards")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per shard)")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 10000)), help="first process' port")
+    args = parser.parse_args()
+    processes = min(args.processes or args.shards, args.shards)
+
+    workers = []
+    for i in range(processes):
+        shard_ids = list(range(i, args.shards, processes))
+        env = dict(os.environ, SHARD_COUNT=str(args.shards), SHARD_IDS=",".join(map(str, shard_ids)),
+                   PORT=str(args.port + i))
+        workers.append(subprocess.Popen([sys.executable, "bot.py"], cwd=BASE_DIR, env=env))
+        print(f"🚀 Worker {i} (pid {workers[-1].pid}) runs shards {shard_ids}")
+
+    def stop(signum=None, frame=None):
+        for worker in workers:
+            if worker.poll() is None:
+                worker.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while any(worker.poll() is None for worker in workers):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop()
+    for worker in workers:
+        worker.wait()
+    print("🛑 All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# simulate_schedule.py
+"""
+Replays the standup scheduler in virtual time and reports every time it fires.
+
+    python tools/simulate_schedule.py --days 120 --members 40
+    python tools/simulate_schedule.py --scenario scenario.json --output fires.json
+
+The real per-minute tick from utils/scheduler.py runs once per virtual minute against a VirtualClock,
+in a scratch directory so the bot's own storage is never touched. Announcements, DM pre-warming and
+deliveries are recorded instead of sent. Every minute is also checked against an independent
+expectation (each member's local time, the standup days and the skip calendar): missed, unexpected
+and duplicate deliveries are listed and make the exit status 1.
+
+A scenario file sets the starting config, the members and changes along the way (all keys optional):
+
+    {
+      "start": "2026-01-05T00:00:00+00:00",
+      "days": 90,
+      "config": {"timezone": "Europe/Berlin", "standup_time": "09:30", "skip_dates": ["12-25"]},
+      "members": {"count": 30, "timezones": {"3": "America/New_York", "4": "Asia/Tokyo"}},
+      "events": [
+        {"at": "2026-02-01T12:00:00+00:00", "config": {"standup_time": "10:00"}},
+        {"at": "2026-03-01T00:00:00+00:00", "member": 5, "timezone": "Australia/Sydney"}
+      ]
+    }
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROLE_ID = 100
+CHANNEL_ID = 200
+WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+class SimulatedBot:
+    """Just enough of a bot for the tick: one process, a standup channel and no gateway."""
+
+    shard_ids = None
+
+    def get_channel(self, channel_id):
+        return SimulatedChannel() if channel_id == CHANNEL_ID else None
+
+
+class SimulatedChannel:
+    guild = None  # the audience then comes from the role snapshot, like on a process without the guild
+
+
+def parse_time(value):
+    if isinstance(value, str):
+        hour, minute = map(int, value.split(":"))
+        return [hour, minute, f"{hour:02d}:{minute:02d}"]
+    return value
+
+
+def parse_datetime(value):
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def is_skip_day(day, entries):
+    """The skip calendar worked out from the raw entries: `YYYY-MM-DD`, `YYYY-MM-DD..YYYY-MM-DD` or `MM-DD`."""
+    iso = day.isoformat()
+    for entry in entries:
+        entry = entry.strip()
+        if ".." in entry:
+            first, last = entry.split("..", 1)
+            if first <= iso <= last:
+                return True
+        elif iso == entry or iso[5:] == entry:
+            return True
+    return False
+
+
+async def simulate(args, scenario):
+    # Imported only now: the config and the shared store are opened relative to the scratch directory
+    from utils import clock
+    from utils import scheduler
+    from utils.config_utils import load_config, save_config_changes
+    from utils.member_timezones import get_member_timezone, set_member_timezone
+    from utils.role_members import role_tracker
+    from utils.schedule import get_timezone_from_string
+
+    start = parse_datetime(scenario.get("start", args.start)).replace(second=0, microsecond=0)
+    days = scenario.get("days", args.days)
+    virtual = clock.VirtualClock(start)
+    clock.set_clock(virtual)
+
+    cfg = load_config()
+    cfg.update({"toggled": True, "standup_channel_id": CHANNEL_ID, "standup_role_id": ROLE_ID})
+    cfg.update({key: parse_time(value) if key == "standup_time" else value
+                for key, value in scenario.get("config", {}).items()})
+    with contextlib.redirect_stdout(None):
+        save_config_changes(cfg)
+
+    members = scenario.get("members", {})
+    member_ids = list(range(1, members.get("count", args.members) + 1))
+    member_timezones = {}  # the oracle's own copy, kept apart from the store the scheduler reads
+    for user_id, tz_name in members.get("timezones", {}).items():
+        set_member_timezone(int(user_id), tz_name)
+        member_timezones[int(user_id)] = tz_name
+    role_tracker.snapshot_file = os.path.join("storage", "standup_role_members.bin")
+    role_tracker.role_id = ROLE_ID
+    role_tracker.member_ids = set(member_ids)
+    role_tracker.save_snapshot()
+
+    events = sorted(scenario.get("events", []), key=lambda event: parse_datetime(event["at"]))
+    fires = []
+    fired_now = []
+
+    async def record_announcement(bot):
+        fires.append({"at": virtual.now(timezone.utc).isoformat(), "kind": "announcement"})
+
+    async def record_channel_post(day):
+        fires.append({"at": virtual.now(timezone.utc).isoformat(), "kind": cfg.get("delivery_mode"),
+                      "day": day.isoformat()})
+        fired_now.append(cfg["timezone"])
+
+    async def record_fan_out(user_ids, embed):
+        if not user_ids:
+            return []
+        tz_name = get_member_timezone(user_ids[0]) or cfg["timezone"]
+        fires.append({"at": virtual.now(timezone.utc).isoformat(), "kind": "dm", "timezone": tz_name,
+                      "members": len(user_ids)})
+        fired_now.append(tz_name)
+        return []
+
+    class RecordingDMChannels:
+        async def prewarm(self, bot, user_ids, window):
+            fires.append({"at": virtual.now(timezone.utc).isoformat(), "kind": "prewarm",
+                          "members": len(user_ids), "window": round(window)})
+
+    scheduler.set_bot(SimulatedBot())
+    scheduler.send_standup_announcement = record_announcement
+    scheduler.post_channel_standup = record_channel_post
+    scheduler._fan_out = record_fan_out
+    scheduler.dm_channels = RecordingDMChannels()
+
+    def expected_timezones(now_utc):
+        """
+        Timezones whose members should get the standup this minute, worked out from the scenario's own
+        config and member map rather than the scheduler's buckets, schedules and skip calendar.
+        """
+        if not cfg.get("toggled") or not cfg.get("standup_time"):
+            return []
+        if cfg.get("delivery_mode", "dm") != "dm":
+            zones = {cfg["timezone"]}
+        else:
+            zones = {member_timezones.get(user_id, cfg["timezone"]) for user_id in member_ids}
+        hour, minute = cfg["standup_time"][:2]
+        days = {WEEKDAY_NAMES.index(day.lower()) for day in cfg["standup_days"]}
+        expected = []
+        for tz_name in zones:
+            local = now_utc.astimezone(get_timezone_from_string(tz_name))
+            if (local.hour, local.minute) == (hour, minute) and local.weekday() in days \
+                    and not is_skip_day(local.date(), cfg.get("skip_dates", [])):
+                expected.append(tz_name)
+        return expected
+
+    problems = []
+    ticks = 0
+    end = start.timestamp() + days * 86400
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        while virtual.now(timezone.utc).timestamp() < end:
+            now_utc = virtual.now(timezone.utc)
+            with contextlib.redirect_stdout(devnull):
+                while events and parse_datetime(events[0]["at"]) <= now_utc:
+                    event = events.pop(0)
+                    if "config" in event:
+                        cfg.update({key: parse_time(value) if key == "standup_time" else value
+                                    for key, value in event["config"].items()})
+                        save_config_changes(cfg)
+                    if "member" in event:
+                        set_member_timezone(event["member"], event.get("timezone"))
+                        if event.get("timezone"):
+                            member_timezones[event["member"]] = event["timezone"]
+                        else:
+                            member_timezones.pop(event["member"], None)
+                    fires.append({"at": now_utc.isoformat(), "kind": "event",
+                                  "change": {key: value for key, value in event.items() if key != "at"}})
+
+                fired_now.clear()
+                await scheduler.schedule_standup()
+
+            expected = expected_timezones(now_utc)
+            for tz_name in set(expected) - set(fired_now):
+                problems.append(f"{now_utc.isoformat()} missed the standup for {tz_name}")
+            for tz_name in set(fired_now) - set(expected):
+                problems.append(f"{now_utc.isoformat()} sent an unexpected standup for {tz_name}")
+            for tz_name in {tz_name for tz_name in fired_now if fired_now.count(tz_name) > 1}:
+                problems.append(f"{now_utc.isoformat()} sent the standup for {tz_name} more than once")
+
+            ticks += 1
+            await virtual.sleep(60)
+    elapsed = time.perf_counter() - started
+    clock.set_clock(None)
+    return fires, problems, ticks, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", help="JSON scenario file, see the module docstring")
+    parser.add_argument("--start", default=datetime.now(timezone.utc).strftime("%Y-%m-%dT00:00:00+00:00"),
+                        help="ISO start time (default: today 00:00 UTC)")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--output", help="write every fire to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    scenario = {}
+    if args.scenario:
+        with open(args.scenario, "r") as f:
+            scenario = json.load(f)
+    output = os.path.abspath(args.output) if args.output else None
+
+    workdir = tempfile.mkdtemp(prefix="standup-sim-")
+    os.makedirs(os.path.join(workdir, "storage"))
+    os.chdir(workdir)
+    os.environ["SHARED_DB_FILE"] = os.path.join(workdir, "storage", "shared_state.db")
+    sys.path.insert(0, ROOT)
+
+    fires, problems, ticks, elapsed = asyncio.run(simulate(args, scenario))
+
+    if not args.quiet:
+        for fire in fires:
+            details = ", ".join(f"{key}={value}" for key, value in fire.items() if key not in ("at", "kind"))
+            print(f"{fire['at']}  {fire['kind']:<12} {details}")
+    if output:
+        with open(output, "w") as f:
+            json.dump(fires, f, indent=2)
+
+    counts = {}
+    for fire in fires:
+        counts[fire["kind"]] = counts.get(fire["kind"], 0) + 1
+    print(f"\n⏱️ {ticks} ticks in {elapsed:.2f}s ({elapsed / max(ticks, 1) * 1e6:.0f}µs per tick), "
+          + ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items())))
+    for problem in problems:
+        print(f"❌ {problem}")
+    print("✅ Every standup fired when expected" if not problems else f"❌ {len(problems)} problems")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
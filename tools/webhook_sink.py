@@ -0,0 +1,67 @@
+# webhook_sink.py
+"""
+Local stand-in for an event webhook sink, prints every batch the bot delivers.
+
+    python tools/webhook_sink.py --port 8788 --secret s3cret
+    EVENT_WEBHOOK_URLS=http://127.0.0.1:8788/events EVENT_WEBHOOK_SECRET=s3cret python bot.py
+
+With --secret every batch's X-StandUP-Signature is checked and a bad one is answered with 401.
+--fail-rate answers that share of batches with --status (503 by default) so the retries and back-off
+can be watched, --delay simulates a slow sink. Events seen twice (a retry after a lost response) are
+reported as duplicates.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+
+from aiohttp import web
+
+
+def build_app(args):
+    seen = set()
+
+    async def receive(request):
+        body = await request.read()  # aiohttp already undid the gzip Content-Encoding
+        if args.delay:
+            await asyncio.sleep(args.delay)
+        if args.secret:
+            expected = "sha256=" + hmac.new(args.secret.encode(), body, hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, request.headers.get("X-StandUP-Signature", "")):
+                print("❌ Batch with a bad signature")
+                return web.Response(status=401)
+        if random.random() < args.fail_rate:
+            print(f"💥 Failing a batch with HTTP {args.status}")
+            return web.Response(status=args.status)
+
+        events = json.loads(body)["events"]
+        encoding = request.headers.get("Content-Encoding", "identity")
+        print(f"📥 Batch of {len(events)} events ({len(body)} bytes, {encoding})")
+        for event in events:
+            duplicate = " (duplicate)" if event["id"] in seen else ""
+            seen.add(event["id"])
+            if not args.quiet:
+                print(f"   {event['occurred_at']}  {event['type']}{duplicate}  {json.dumps(event['data'])}")
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/events", receive)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--secret", help="check the batches' HMAC signature with this secret")
+    parser.add_argument("--fail-rate", type=float, default=0, help="share of batches to fail (0-1)")
+    parser.add_argument("--status", type=int, default=503, help="status code for failed batches")
+    parser.add_argument("--delay", type=float, default=0, help="seconds to wait before answering")
+    parser.add_argument("--quiet", action="store_true", help="only print one line per batch")
+    args = parser.parse_args()
+    web.run_app(build_app(args), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# clock.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+
+class SystemClock:
+    """Wall-clock time and real sleeps, what the bot runs on."""
+
+    def now(self, tz=None):
+        return datetime.now(tz)
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+    async def wait(self, event: asyncio.Event, timeout):
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class VirtualClock:
+    """
+    Time that only moves when told to. Sleeping advances it instantly, so months of scheduler ticks
+    can be replayed in seconds (see tools/simulate_schedule.py).
+    """
+
+    def __init__(self, start: datetime):
+        self._now = start.astimezone(timezone.utc) if start.tzinfo else start.replace(tzinfo=timezone.utc)
+
+    def now(self, tz=None):
+        if tz is None:
+            return self._now.replace(tzinfo=None)  # naive like datetime.now(), in UTC
+        return self._now.astimezone(tz)
+
+    def advance(self, seconds):
+        self._now += timedelta(seconds=seconds)
+
+    def set(self, dt: datetime):
+        if dt.astimezone(timezone.utc) < self._now:
+            raise ValueError("A virtual clock can't go backwards.")
+        self._now = dt.astimezone(timezone.utc)
+
+    async def sleep(self, seconds):
+        self.advance(seconds)
+        await asyncio.sleep(0)  # still let other tasks run, like a real sleep would
+
+    async def wait(self, event: asyncio.Event, timeout):
+        # Nothing else moves virtual time, so an event that isn't set after the other tasks had their
+        # turn won't be before the timeout either
+        await asyncio.sleep(0)
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return False
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """Swap the clock the scheduler reads, a VirtualClock for simulations or None for the system clock."""
+    global _clock
+    _clock = clock or SystemClock()
+
+
+def now(tz=None):
+    """datetime.now(tz) on the active clock."""
+    return _clock.now(tz)
+
+
+async def sleep(seconds):
+    await _clock.sleep(seconds)
+
+
+async def wait(event, timeout):
+    """Wait up to `timeout` seconds for an asyncio.Event on the active clock. True if it was set."""
+    return await _clock.wait(event, timeout)
@@ -1,8 +1,14 @@
 # config_utils.py
 import json
+import os
+from contextlib import contextmanager
+
+from utils.shared_state import write_transaction
 
 CONFIG_FILE = "storage/standup_profile.json"
 _cfg_cache = None
+_cfg_version = 0  # bumped on every save so derived caches know when to rebuild
+_cfg_mtime = None  # of the file as this process last read or wrote it
 
 
 def validate_standup_config(cfg):
@@ -27,12 +33,20 @@ def validate_standup_config(cfg):
     return is_valid, missing
 
 
+def _config_mtime():
+    try:
+        return os.stat(CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
 def load_config():
-    global _cfg_cache
+    global _cfg_cache, _cfg_mtime
     if _cfg_cache is None:  # Load only once
         try:
             with open(CONFIG_FILE, "r") as f:
                 _cfg_cache = json.load(f)
+            _cfg_mtime = _config_mtime()
         except FileNotFoundError:
             # Initialize with default values if file doesn't exist
             _cfg_cache = {
@@ -55,9 +69,57 @@ def load_config():
     return _cfg_cache
 
 
+def get_config_version():
+    return _cfg_version
+
+
+def reload_config_if_changed():
+    """
+    Pick up a config saved by another bot process. The shared dict is updated in place, so every
+    module's `cfg` sees the new values. Returns True if anything was reloaded.
+    """
+    global _cfg_mtime, _cfg_version
+    mtime = _config_mtime()
+    if _cfg_cache is None or mtime is None or mtime == _cfg_mtime:
+        return False
+    try:
+        with open(CONFIG_FILE, "r") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        return False  # caught mid-write, the next check will see the finished file
+    _cfg_cache.clear()
+    _cfg_cache.update(data)
+    _cfg_mtime = mtime
+    _cfg_version += 1
+    return True
+
+
 def save_config_changes(cfg_data):
-    global _cfg_cache
+    global _cfg_cache, _cfg_version, _cfg_mtime
     _cfg_cache = cfg_data  # Update the internal cache with the data being saved
-    with open(CONFIG_FILE, "w") as f:
+    _cfg_version += 1
+    # Written next to the file and renamed over it, so other processes never read half a config
+    tmp_file = f"{CONFIG_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
         json.dump(cfg_data, f, indent=2)
+    os.replace(tmp_file, CONFIG_FILE)
+    _cfg_mtime = _config_mtime()
     print('     ◈ Config save successful')
+
+
+@contextmanager
+def update_config():
+    """
+    Change the config without losing another process's changes: holds the shared store's write lock,
+    re-reads the file if another process saved it since, then saves it if the block changed anything.
+
+        with update_config() as cfg:
+            cfg["timezone"] = "UTC+2"
+    """
+    with write_transaction():
+        cfg = load_config()
+        reload_config_if_changed()
+        before = json.dumps(cfg, sort_keys=True)
+        yield cfg
+        if json.dumps(cfg, sort_keys=True) != before:
+            save_config_changes(cfg)
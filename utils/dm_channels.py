@@ -0,0 +1,146 @@
+# dm_channels.py
+from datetime import timezone
+
+import discord
+
+from utils import clock
+from utils.shared_state import data_version, get_connection, write_transaction
+
+PREWARM_MIN_INTERVAL = 0.5  # never open DMs faster than 2/s, well below the DM route's rate limit
+PREWARM_WINDOW_SHARE = 0.8  # leave the last fifth of the window free before the fan-out starts
+REPROBE_AFTER_DAYS = (1, 2, 4, 7)  # wait before trying a closed DM again, by consecutive failures
+
+
+class DMChannelCache:
+    """
+    User id -> DM channel id, kept in the shared store. A DM channel between the bot and a user never
+    changes, so once it's known a standup DM is a single POST to a PartialMessageable instead of an
+    open-DM request followed by the post. discord.py only keeps the last 128 DM channels itself.
+    """
+
+    def __init__(self):
+        self._channels = None
+        self._data_version = None
+
+    def _load(self):
+        # Other processes open DM channels too, pick up their rows once they commit
+        version = data_version()
+        if self._channels is None or version != self._data_version:
+            rows = get_connection().execute("SELECT user_id, channel_id FROM dm_channels").fetchall()
+            self._channels = dict(rows)
+            self._data_version = version
+        return self._channels
+
+    def get(self, bot, user_id):
+        """A messageable DM channel for the user, or None if it hasn't been opened yet."""
+        channel_id = self._load().get(user_id)
+        if channel_id is None:
+            return None
+        return bot.get_partial_messageable(channel_id, type=discord.ChannelType.private)
+
+    def remember(self, pairs):
+        channels = self._load()
+        pairs = [(user_id, channel_id) for user_id, channel_id in pairs if channels.get(user_id) != channel_id]
+        if not pairs:
+            return
+        channels.update(pairs)
+        with write_transaction() as conn:
+            conn.executemany(
+                "INSERT INTO dm_channels (user_id, channel_id) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET channel_id = excluded.channel_id",
+                pairs,
+            )
+
+    async def prewarm(self, bot, user_ids, window):
+        """
+        Open DM channels for everyone in `user_ids` that doesn't have one cached yet, spread evenly over
+        most of `window` seconds. Whatever isn't done in time falls back to opening the DM at send time.
+        """
+        channels = self._load()
+        missing = [user_id for user_id in user_ids if user_id not in channels]
+        if not missing:
+            return
+        interval = max(PREWARM_MIN_INTERVAL, window * PREWARM_WINDOW_SHARE / len(missing))
+        deadline = clock.now(timezone.utc).timestamp() + window * PREWARM_WINDOW_SHARE
+        print(f"📨 Pre-warming {len(missing)} DM channels, one every {interval:.1f}s")
+
+        opened = []
+        for user_id in missing:
+            if clock.now(timezone.utc).timestamp() > deadline:
+                break
+            try:
+                channel = await bot.create_dm(discord.Object(id=user_id))
+                opened.append((user_id, channel.id))
+            except discord.HTTPException as e:
+                print(f"❌ Could not open a DM channel for {user_id}: {e}")
+            # Persist in small batches, a restart mid-window keeps what was already opened
+            if len(opened) >= 50:
+                self.remember(opened)
+                opened = []
+            await clock.sleep(interval)
+        self.remember(opened)
+        channels = self._load()
+        print(f"📨 DM channels ready for {sum(1 for user_id in user_ids if user_id in channels)}"
+              f"/{len(user_ids)} members")
+
+
+class ClosedDMCache:
+    """
+    Members whose DMs were closed the last time a standup was sent to them. They are skipped by the
+    fan-out (the request would only fail again) and re-probed after a back-off that grows with every
+    failure, so someone who opens their DMs again is back on DMs within a week at most.
+    """
+
+    def __init__(self):
+        self._closed = None  # user id -> (consecutive failures, retry at)
+        self._data_version = None
+
+    def _load(self):
+        version = data_version()
+        if self._closed is None or version != self._data_version:
+            rows = get_connection().execute("SELECT user_id, failures, retry_at FROM dm_closed").fetchall()
+            self._closed = {user_id: (failures, retry_at) for user_id, failures, retry_at in rows}
+            self._data_version = version
+        return self._closed
+
+    def split(self, user_ids):
+        """(members to DM, members known to have closed DMs that aren't due for a re-probe yet)."""
+        closed = self._load()
+        now = clock.now(timezone.utc).timestamp()
+        send, skip = [], []
+        for user_id in user_ids:
+            entry = closed.get(user_id)
+            (skip if entry and entry[1] > now else send).append(user_id)
+        return send, skip
+
+    def update(self, attempted, failed):
+        """Record a fan-out: `failed` get (another) back-off, the rest of `attempted` are reachable again."""
+        closed = self._load()
+        failed = set(failed)
+        reopened = [user_id for user_id in attempted if user_id in closed and user_id not in failed]
+        if not failed and not reopened:
+            return
+
+        now = clock.now(timezone.utc).timestamp()
+        rows = []
+        for user_id in failed:
+            failures = closed.get(user_id, (0, 0))[0] + 1
+            days = REPROBE_AFTER_DAYS[min(failures, len(REPROBE_AFTER_DAYS)) - 1]
+            rows.append((user_id, failures, now + days * 86400 - 3600))  # an hour early, so the probe lands on that day's standup
+        with write_transaction() as conn:
+            conn.executemany(
+                "INSERT INTO dm_closed (user_id, failures, retry_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET failures = excluded.failures, retry_at = excluded.retry_at",
+                rows,
+            )
+            conn.executemany("DELETE FROM dm_closed WHERE user_id = ?", [(user_id,) for user_id in reopened])
+        for user_id, failures, retry_at in rows:
+            closed[user_id] = (failures, retry_at)
+        for user_id in reopened:
+            closed.pop(user_id, None)
+        if reopened:
+            print(f"📨 DMs open again for {len(reopened)} members")
+
+
+dm_channels = DMChannelCache()
+closed_dms = ClosedDMCache()
@@ -0,0 +1,46 @@
+# drafts.py
+import time
+from collections import OrderedDict
+
+
+class DraftCache:
+    """
+    Small in-memory LRU for half-finished multi-step submissions.
+    Entries expire `ttl` seconds after their last update and the oldest ones are
+    dropped once `maxsize` is reached, so abandoned drafts can't pile up.
+    """
+
+    def __init__(self, maxsize: int = 500, ttl: float = 1800):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (updated_at, dict)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            key, (updated_at, _) = next(iter(self._entries.items()))
+            if updated_at >= cutoff:
+                break
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        self._expire()
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def put(self, key, draft: dict):
+        """Store (or refresh) the draft for `key`, evicting the least recently updated ones when full."""
+        self._expire()
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), draft)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        self._expire()
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def __len__(self):
+        self._expire()
+        return len(self._entries)
@@ -0,0 +1,38 @@
+# embed_cache.py
+import discord
+
+from utils.config_utils import get_config_version
+
+# key -> (config version, serialized embed payload, shared Embed instance, extra value from the builder)
+_templates = {}
+
+
+def _build(key, builder):
+    version = get_config_version()
+    cached = _templates.get(key)
+    if cached is None or cached[0] != version:
+        built = builder()
+        embed, extra = built if isinstance(built, tuple) else (built, None)
+        payload = embed.to_dict()
+        cached = (version, payload, discord.Embed.from_dict(payload), extra)
+        _templates[key] = cached
+    return cached
+
+
+def get_embed_template(key, builder):
+    """
+    Return (payload, extra) for `key`, calling `builder` only when the config version changed since it
+    was last built. `builder` returns a discord.Embed, or (embed, extra) to keep something it worked out
+    next to the template. The payload is shared, deep-copy it before building an Embed to modify.
+    """
+    cached = _build(key, builder)
+    return cached[1], cached[3]
+
+
+def get_cached_embed(key, builder):
+    """
+    Return a shared Embed for `key` that is rebuilt once per config version.
+    The instance is reused for every send, so callers that need to modify it must `.copy()` it first.
+    """
+    return _build(key, builder)[2]
+
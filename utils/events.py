@@ -0,0 +1,184 @@
+# events.py
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timezone
+
+import aiohttp
+
+from utils.shared_state import LeaderLease, get_connection, write_transaction
+
+EVENT_WEBHOOK_URLS = [url.strip() for url in os.getenv("EVENT_WEBHOOK_URLS", "").split(",") if url.strip()]
+EVENT_WEBHOOK_SECRET = os.getenv("EVENT_WEBHOOK_SECRET")  # signs every batch with HMAC-SHA256 when set
+EVENT_SPOOL_MAX = int(os.getenv("EVENT_SPOOL_MAX", "100000"))  # oldest events are dropped beyond this
+BATCH_SIZE = 100  # events per POST
+FLUSH_INTERVAL = 2  # seconds to let events accumulate into one batch
+GZIP_MIN_BYTES = 1024  # smaller bodies aren't worth compressing
+MAX_BACKOFF = 300  # seconds between retries of a failing sink, at most
+REQUEST_TIMEOUT = 10
+
+
+def _signature(secret, body):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class EventPipeline:
+    """
+    Ticket and standup events for outside integrations, posted to the EVENT_WEBHOOK_URLS in batches.
+
+    publish() only appends the event to a spool table in the shared store, so handlers never wait on
+    a webhook and nothing is lost across restarts. One process (the "events" lease holder) delivers
+    the spool: each sink has its own cursor, gets up to BATCH_SIZE events per gzipped POST in order,
+    and is retried with exponential back-off while it fails, without holding up the other sinks.
+    The spool is capped at EVENT_SPOOL_MAX events, past that the oldest are dropped with a warning
+    instead of slowing the bot down.
+    """
+
+    def __init__(self, sinks=(), secret=None):
+        self.sinks = list(sinks)
+        self.secret = secret
+        self.leader = LeaderLease("events", ttl=60)
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._session = None
+        self._failures = {}  # sink -> consecutive failed deliveries
+        self._retry_at = {}  # sink -> loop time of the next attempt
+
+    def publish(self, event_type, **data):
+        if not self.sinks:
+            return
+        event = {
+            "id": uuid.uuid4().hex,  # lets sinks drop the duplicates a retry after a lost response can cause
+            "type": event_type,
+            "occurred_at": datetime.now(timezone.utc).isoformat(),
+            "data": data,
+        }
+        try:
+            with write_transaction() as conn:
+                conn.execute("INSERT INTO event_spool (body) VALUES (?)", (json.dumps(event, default=str),))
+        except Exception as e:
+            print(f"❌ Could not spool the {event_type} event: {e}")
+            return
+        self._wakeup.set()
+
+    # --------------- delivery ---------------
+    def start(self):
+        if self.sinks and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._deliver_forever(), name="event-delivery")
+            print(f"📤 Delivering events to {len(self.sinks)} webhook sink(s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _deliver_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=FLUSH_INTERVAL * 5)
+            except asyncio.TimeoutError:
+                pass  # also poll, other processes publish into the same spool
+            self._wakeup.clear()
+            await asyncio.sleep(FLUSH_INTERVAL)  # let a burst of events collect into one batch
+
+            # Writes here may wait on other processes, they run in a worker thread to keep the loop free
+            if not await asyncio.to_thread(self.leader.try_acquire):
+                continue
+            try:
+                await asyncio.to_thread(self._trim_spool)
+                for sink in self.sinks:
+                    await self._drain(sink)
+                await asyncio.to_thread(self._delete_delivered)
+            except Exception as e:
+                print(f"❌ Event delivery failed: {e}")
+
+    def _cursor(self, sink):
+        row = get_connection().execute("SELECT last_seq FROM event_cursors WHERE sink = ?", (sink,)).fetchone()
+        return row[0] if row else 0
+
+    async def _drain(self, sink):
+        """Send everything spooled for `sink` (batch by batch), until it's caught up or a send fails."""
+        loop = asyncio.get_running_loop()
+        if self._retry_at.get(sink, 0) > loop.time():
+            return
+        while True:
+            rows = get_connection().execute(
+                "SELECT seq, body FROM event_spool WHERE seq > ? ORDER BY seq LIMIT ?",
+                (self._cursor(sink), BATCH_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            result = await self._post(sink, [body for _, body in rows])
+            if result == "retry":
+                failures = self._failures.get(sink, 0) + 1
+                self._failures[sink] = failures
+                delay = min(MAX_BACKOFF, 2 ** failures) * random.uniform(0.8, 1.2)
+                self._retry_at[sink] = loop.time() + delay
+                print(f"⚠️ Event sink {sink} failed {failures}x, retrying in {delay:.0f}s")
+                return
+            self._failures.pop(sink, None)
+            await asyncio.to_thread(self._advance_cursor, sink, rows[-1][0])
+
+    async def _post(self, sink, bodies):
+        """"ok", "retry" for failures worth retrying, or "skip" for a batch the sink will never accept."""
+        body = ('{"events": [' + ",".join(bodies) + "]}").encode()
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            headers["X-StandUP-Signature"] = _signature(self.secret, body)  # over the uncompressed body
+        if len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+        try:
+            async with self._session.post(sink, data=body, headers=headers) as resp:
+                if resp.status < 300:
+                    return "ok"
+                if resp.status in (408, 429) or resp.status >= 500:
+                    return "retry"
+                print(f"❌ Event sink {sink} rejected a batch of {len(bodies)} events (HTTP {resp.status}), skipping it")
+                return "skip"
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return "retry"
+
+    def _advance_cursor(self, sink, last_seq):
+        with write_transaction() as conn:
+            conn.execute(
+                "INSERT INTO event_cursors (sink, last_seq) VALUES (?, ?) "
+                "ON CONFLICT(sink) DO UPDATE SET last_seq = excluded.last_seq",
+                (sink, last_seq),
+            )
+
+    def _trim_spool(self):
+        conn = get_connection()
+        count = conn.execute("SELECT COUNT(*) FROM event_spool").fetchone()[0]
+        if count <= EVENT_SPOOL_MAX:
+            return
+        with write_transaction() as conn:
+            conn.execute("DELETE FROM event_spool WHERE seq IN (SELECT seq FROM event_spool ORDER BY seq LIMIT ?)",
+                         (count - EVENT_SPOOL_MAX,))
+        print(f"⚠️ Event spool full, dropped the {count - EVENT_SPOOL_MAX} oldest events")
+
+    def _delete_delivered(self):
+        # Everything every sink has received can go, a sink added later starts with what is still spooled
+        delivered = min(self._cursor(sink) for sink in self.sinks)
+        if delivered:
+            with write_transaction() as conn:
+                conn.execute("DELETE FROM event_spool WHERE seq <= ?", (delivered,))
+
+
+event_pipeline = EventPipeline(EVENT_WEBHOOK_URLS, EVENT_WEBHOOK_SECRET)
+
+
+def publish(event_type, **data):
+    """Queue an event for the webhook sinks, a no-op when none are configured."""
+    event_pipeline.publish(event_type, **data)
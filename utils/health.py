@@ -0,0 +1,131 @@
+# health.py
+import asyncio
+import math
+import time
+import weakref
+
+from aiohttp import web
+
+_task_started = weakref.WeakKeyDictionary()  # asyncio.Task -> monotonic creation time
+_ready_flags = {}  # name -> bool, set by the parts of the bot as they come up
+_ready_checks = {}  # name -> callable returning bool, evaluated on every /readyz
+
+
+def install_task_tracking(loop: asyncio.AbstractEventLoop):
+    """Record when each task is created, so /debug/tasks can show how long it has been running."""
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+        _task_started[task] = time.monotonic()
+        return task
+
+    loop.set_task_factory(factory)
+
+
+def expect_ready(*names):
+    """Declare readiness flags that must be set before /readyz passes."""
+    for name in names:
+        _ready_flags.setdefault(name, False)
+
+
+def set_ready(name, value=True):
+    _ready_flags[name] = value
+
+
+def add_ready_check(name, check):
+    _ready_checks[name] = check
+
+
+def readiness():
+    state = dict(_ready_flags)
+    for name, check in _ready_checks.items():
+        try:
+            state[name] = bool(check())
+        except Exception:
+            state[name] = False
+    return state
+
+
+class HealthServer:
+    """
+    Small HTTP server on the bot's own event loop for the hosting platform:
+
+        /healthz      gateway connected and heartbeating (503 otherwise)
+        /readyz       every readiness flag and check passes (503 otherwise)
+        /debug/tasks  running asyncio tasks, oldest first
+
+    Without a gateway connection (interaction-only workers) /healthz only requires being logged in.
+    """
+
+    def __init__(self, bot, host="0.0.0.0", port=10000, gateway=True):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.gateway = gateway
+        self._routes = []  # extra (method, path, handler), e.g. the HTTP interactions endpoint
+        self._runner = None
+
+    def add_route(self, method, path, handler):
+        """Serve another route on the same port, has to be called before start()."""
+        self._routes.append((method, path, handler))
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/", self.healthz)
+        app.router.add_get("/healthz", self.healthz)
+        app.router.add_get("/readyz", self.readyz)
+        app.router.add_get("/debug/tasks", self.debug_tasks)
+        for method, path, handler in self._routes:
+            app.router.add_route(method, path, handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"🩺 Health server listening on port {self.port}")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _latencies(self):
+        # Sharded bots report one heartbeat latency per shard
+        latencies = getattr(self.bot, "latencies", None)
+        if latencies is not None:
+            return {str(shard_id): latency for shard_id, latency in latencies}
+        return {"0": self.bot.latency}
+
+    async def healthz(self, request):
+        if not self.gateway:
+            logged_in = not self.bot.is_closed() and self.bot.user is not None
+            return web.json_response({"status": "ok" if logged_in else "unavailable"}, status=200 if logged_in else 503)
+
+        latencies = self._latencies()
+        connected = (not self.bot.is_closed() and self.bot.is_ready()
+                     and all(math.isfinite(latency) for latency in latencies.values()))
+        body = {
+            "status": "ok" if connected else "unavailable",
+            "latency_ms": {shard: round(latency * 1000, 1) if math.isfinite(latency) else None
+                           for shard, latency in latencies.items()},
+        }
+        return web.json_response(body, status=200 if connected else 503)
+
+    async def readyz(self, request):
+        state = readiness()
+        ready = all(state.values())
+        return web.json_response({"status": "ready" if ready else "not ready", "checks": state},
+                                 status=200 if ready else 503)
+
+    async def debug_tasks(self, request):
+        now = time.monotonic()
+        tasks = []
+        for task in asyncio.all_tasks():
+            started = _task_started.get(task)
+            coro = task.get_coro()
+            tasks.append({
+                "name": task.get_name(),
+                "coro": getattr(coro, "__qualname__", repr(coro)),
+                "age_s": round(now - started, 1) if started is not None else None,
+            })
+        tasks.sort(key=lambda t: -(t["age_s"] or 0))
+        return web.json_response({"count": len(tasks), "tasks": tasks})
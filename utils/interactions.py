@@ -0,0 +1,217 @@
+# interactions.py
+import asyncio
+import json
+import os
+import time
+
+import aiohttp
+import discord
+from aiohttp import web
+
+try:
+    from nacl.exceptions import BadSignatureError
+    from nacl.signing import VerifyKey
+except ImportError:  # PyNaCl is only needed when interactions are received over HTTP
+    VerifyKey = None
+
+INTERACTIONS_PUBLIC_KEY = os.getenv("INTERACTIONS_PUBLIC_KEY")  # the application's public key, enables the endpoint
+INTERACTIONS_PEERS = [url.strip() for url in os.getenv("INTERACTIONS_PEERS", "").split(",") if url.strip()]
+MAX_SIGNATURE_AGE = 300  # seconds, requests signed longer ago than this are treated as replays
+RESPONSE_WAIT = 2.5  # Discord gives an interaction 3 seconds to be answered
+GUILD_REFRESH_INTERVAL = 900  # seconds between guild cache refreshes on interaction-only workers
+FORWARDED_HEADER = "X-StandUP-Forwarded"
+
+PING, APPLICATION_COMMAND, COMPONENT, AUTOCOMPLETE, MODAL_SUBMIT = 1, 2, 3, 4, 5
+# discord.py versions whose private view store and guild parsing _internals() has been checked against
+TESTED_DISCORD_VERSIONS = ((2, 3), (2, 4), (2, 5))
+EXPIRED_RESPONSE = {"type": 4, "data": {"content": "⏰ This has expired, please run the command again.", "flags": 64}}
+
+
+_internals_supported = None  # worked out on first use
+
+
+def _internals(bot):
+    """
+    discord.py's connection state and view store, or None when they can't be relied on.
+
+    Routing clicks to the process that owns a view and caching guilds over REST need private parts
+    of discord.py that may change in any release. They are only used on TESTED_DISCORD_VERSIONS and
+    only when every attribute is there. Otherwise every interaction is dispatched locally and
+    workers go without the REST guild cache.
+    """
+    global _internals_supported
+    state = getattr(bot, "_connection", None)
+    store = getattr(state, "_view_store", None)
+    if _internals_supported is None:
+        _internals_supported = discord.version_info[:2] in TESTED_DISCORD_VERSIONS \
+            and all(hasattr(store, name) for name in ("_modals", "_dynamic_items", "_views")) \
+            and hasattr(state, "_add_guild_from_data")
+        if not _internals_supported:
+            print(f"⚠️ discord.py {discord.__version__} isn't supported for view routing and the REST guild "
+                  "cache, every interaction is handled locally")
+    return (state, store) if _internals_supported else None
+
+
+class InteractionEndpoint:
+    """
+    Receives interactions on the application's Interactions Endpoint URL and runs them through the same
+    handlers as gateway interactions: slash commands via the command tree, buttons and modals via
+    discord.py's view store. Handlers answer through the interaction callback endpoint as usual, the
+    HTTP request itself is answered with 202 once they have.
+
+    Views and modals that aren't persistent only exist in the memory of the process that sent them. A
+    process that gets a click or modal submit it doesn't know passes the signed request on to its
+    INTERACTIONS_PEERS, so behind a load balancer the process that owns it still answers.
+    """
+
+    def __init__(self, bot, public_key, peers=()):
+        if VerifyKey is None:
+            raise RuntimeError("PyNaCl is needed to receive interactions over HTTP: pip install PyNaCl")
+        self.bot = bot
+        self.verify_key = VerifyKey(bytes.fromhex(public_key))
+        self.peers = list(peers)
+        self.accepting = False  # set once the cogs are loaded, until then Discord gets a 503
+        self._session = None
+
+    def verify(self, signature, timestamp, body):
+        try:
+            if abs(time.time() - int(timestamp)) > MAX_SIGNATURE_AGE:
+                return False
+            self.verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+        except (BadSignatureError, ValueError):
+            return False
+        return True
+
+    async def handle(self, request):
+        body = await request.read()
+        signature = request.headers.get("X-Signature-Ed25519", "")
+        timestamp = request.headers.get("X-Signature-Timestamp", "")
+        if not self.verify(signature, timestamp, body):
+            return web.Response(status=401, text="invalid request signature")
+
+        try:
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                raise ValueError("not an object")
+        except ValueError:
+            return web.Response(status=400, text="invalid interaction payload")
+        if data.get("type") == PING:
+            return web.json_response({"type": 1})
+        if not self.accepting:
+            return web.json_response({"error": "starting"}, status=503)
+
+        forwarded = bool(request.headers.get(FORWARDED_HEADER))
+        try:
+            handled_here = self._handled_here(data)
+        except (KeyError, TypeError, ValueError):
+            return web.Response(status=400, text="invalid interaction payload")
+        if not handled_here:
+            if forwarded:
+                return web.Response(status=404)  # a peer asked, it isn't ours either
+            return await self._forward(request.headers, body)
+        # A forwarding peer is already holding Discord's request, answer it right away so it isn't kept waiting
+        return await self._dispatch(data, wait=not forwarded)
+
+    def _handled_here(self, data):
+        """Whether this process has a handler for the interaction, commands are handled everywhere."""
+        if data["type"] not in (COMPONENT, MODAL_SUBMIT):
+            return True
+        custom_id = data["data"]["custom_id"]
+        if not isinstance(custom_id, str):
+            raise TypeError("custom_id must be a string")
+        internals = _internals(self.bot)
+        if internals is None:
+            return True  # can't tell, let this process try
+        # discord.py has no public lookup, these are the tables its own dispatch routes by
+        _, store = internals
+        if data["type"] == MODAL_SUBMIT:
+            return custom_id in store._modals
+        if any(pattern.fullmatch(custom_id) for pattern in store._dynamic_items):
+            return True
+
+        key = (data["data"]["component_type"], custom_id)
+        message = data.get("message") or {}
+        entity_ids = [None]
+        if "id" in message:
+            entity_ids.append(int(message["id"]))
+        if message.get("interaction_metadata"):
+            entity_ids.append(int(message["interaction_metadata"]["id"]))
+        return any(key in store._views.get(entity_id, {}) for entity_id in entity_ids)
+
+    async def _dispatch(self, data, wait=True):
+        try:
+            interaction_id = int(data["id"])
+        except (KeyError, TypeError, ValueError):
+            return web.Response(status=400, text="invalid interaction payload")
+        # wait_for registers its listener right away, before the state dispatches the "interaction" event
+        waiter = asyncio.ensure_future(
+            self.bot.wait_for("interaction", check=lambda i: i.id == interaction_id, timeout=RESPONSE_WAIT))
+        try:
+            self.bot._connection.parse_interaction_create(data)
+        except Exception as e:
+            waiter.cancel()
+            print(f"❌ Could not parse interaction {interaction_id}: {e}")
+            return web.Response(status=400, text="invalid interaction payload")
+        try:
+            interaction = await waiter
+        except asyncio.TimeoutError:
+            return web.Response(status=202)
+        if not wait:
+            return web.Response(status=202)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + RESPONSE_WAIT
+        while not interaction.response.is_done() and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        return web.Response(status=202)
+
+    async def _forward(self, headers, body):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=RESPONSE_WAIT))
+        forward_headers = {
+            "Content-Type": "application/json",
+            "X-Signature-Ed25519": headers.get("X-Signature-Ed25519", ""),
+            "X-Signature-Timestamp": headers.get("X-Signature-Timestamp", ""),
+            FORWARDED_HEADER: "1",
+        }
+        for peer in self.peers:
+            try:
+                async with self._session.post(peer, data=body, headers=forward_headers) as resp:
+                    if resp.status != 404:
+                        return web.Response(status=resp.status, body=await resp.read(),
+                                            content_type=resp.content_type)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"❌ Interaction peer {peer} unreachable: {e}")
+        # Nobody has it (e.g. the process that sent the view restarted), tell the user instead of failing silently
+        return web.json_response(EXPIRED_RESPONSE)
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+async def cache_guilds_over_rest(bot):
+    """
+    Interaction-only workers never connect to the gateway, so the guilds, roles and channels the command
+    handlers look up are fetched over REST instead.
+    """
+    internals = _internals(bot)
+    if internals is None:
+        return
+    state, _ = internals
+    async for partial in bot.fetch_guilds(limit=None):
+        data = await bot.http.get_guild(partial.id, with_counts=False)
+        data["channels"] = await bot.http.get_all_guild_channels(partial.id)
+        state._add_guild_from_data(data)
+    print(f"🏠 Cached {len(bot.guilds)} guilds over REST")
+
+
+async def refresh_guilds_periodically(bot, interval=GUILD_REFRESH_INTERVAL):
+    """Keep a worker's REST guild cache from going stale, there are no gateway events to update it."""
+    while not bot.is_closed():
+        await asyncio.sleep(interval)
+        try:
+            await cache_guilds_over_rest(bot)
+        except Exception as e:
+            print(f"❌ Guild cache refresh failed: {e}")
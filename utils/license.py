@@ -0,0 +1,138 @@
+# license.py
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import aiohttp
+
+from utils.shared_state import get_value, set_value
+
+DEBUG_BUILD = False  # DEBUG, release builds never read LICENSE_API_URL
+DEFAULT_LICENSE_API_URL = "https://license-api-production-b888.up.railway.app/validate"
+# Pointing the bot at another API (tools/license_stub.py) is only possible in debug builds and tests
+LICENSE_API_URL = os.getenv("LICENSE_API_URL", DEFAULT_LICENSE_API_URL) if DEBUG_BUILD else DEFAULT_LICENSE_API_URL
+LICENSE_GRACE_HOURS = float(os.getenv("LICENSE_GRACE_HOURS", "72"))  # how long the bot rides out an API outage
+REVALIDATE_INTERVAL = 6 * 3600  # seconds between background checks while running
+OFFLINE_RETRY_INTERVAL = 900  # seconds between checks while the API is unreachable
+REQUEST_TIMEOUT = 10
+LAST_VALIDATION_KEY = "license:last_validation"
+
+
+def _parse_expiry(value):
+    try:
+        expires = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return expires if expires.tzinfo else expires.replace(tzinfo=timezone.utc)
+
+
+def check_result(result, tier):
+    """Error message for an API answer that doesn't allow this bot to run, or None if it does."""
+    if not isinstance(result, dict):
+        return f"License API returned an unexpected answer: {str(result)[:100]}"
+    if not result.get("valid"):
+        return f"License invalid: {result.get('error')}"
+    if result.get("tier") != tier:
+        return f"License tier mismatch. Expected {tier}, got {result.get('tier')}"
+    expires = _parse_expiry(result.get("expires"))
+    if expires and expires < datetime.now(timezone.utc):
+        return f"License expired on {result.get('expires')}"
+    return None
+
+
+def _key_hash(license_key):
+    return hashlib.sha256(license_key.encode()).hexdigest()
+
+
+def load_last_validation(license_key, tier):
+    """
+    Wall-clock time of the last successful validation of this license, or None when there is none
+    within the grace window (or the stored answer no longer allows this bot to run, e.g. it expired).
+    """
+    stored = get_value(LAST_VALIDATION_KEY)
+    if not isinstance(stored, dict) or stored.get("license") != _key_hash(license_key):
+        return None
+    checked_at = stored.get("checked_at")
+    if not isinstance(checked_at, (int, float)) or not 0 <= time.time() - checked_at <= LICENSE_GRACE_HOURS * 3600:
+        return None
+    if check_result({"valid": True, "tier": stored.get("tier"), "expires": stored.get("expires")}, tier):
+        return None
+    return checked_at
+
+
+def save_last_validation(license_key, result, checked_at):
+    """Remember a successful API answer (tier, expiry and when it was checked) for the next start."""
+    set_value(LAST_VALIDATION_KEY, {"license": _key_hash(license_key), "tier": result.get("tier"),
+                                    "expires": result.get("expires"), "checked_at": checked_at})
+
+
+def forget_last_validation():
+    set_value(LAST_VALIDATION_KEY, None)
+
+
+async def validate_license(license_key, tier):
+    """
+    Ask the license API. Returns (error, result): error is None when the license is fine, and result is
+    None when the API couldn't be reached at all (which the grace window covers).
+    """
+    try:
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.post(LICENSE_API_URL, json={"license_key": license_key}) as resp:
+                if resp.status >= 500:
+                    return f"License API unavailable (HTTP {resp.status})", None
+                result = await resp.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+        return f"Failed to validate license: {e}", None
+
+    return check_result(result, tier), result
+
+
+async def license_watchdog(bot, license_key, tier, wait_ready=True, stopped=None):
+    """
+    Validates the license in the background: first once the bot is connected, then every few hours.
+    A definite rejection stops the bot right away. An unreachable API only does once the last successful
+    validation is older than LICENSE_GRACE_HOURS. That last validation is kept in the shared store, so a
+    restart during an outage keeps running on it, while a first start without one needs the API.
+    Processes without a gateway connection pass wait_ready=False, and `stopped` is an asyncio.Event
+    that is set once the bot has been closed.
+    """
+    async def stop():
+        await bot.close()
+        if stopped:
+            stopped.set()
+
+    last_valid = await asyncio.to_thread(load_last_validation, license_key, tier)
+    if last_valid is not None:
+        hours = (time.time() - last_valid) / 3600
+        print(f"🔑 Starting on the license check from {hours:.1f}h ago, re-validating once connected")
+    if wait_ready:
+        await bot.wait_until_ready()
+
+    while not bot.is_closed():
+        error, result = await validate_license(license_key, tier)
+        if error and result is not None:
+            print(f"❌ {error}")
+            await asyncio.to_thread(forget_last_validation)
+            await stop()
+            return
+        if error:
+            if last_valid is None:
+                print(f"❌ {error}, and there is no successful validation to fall back on.")
+                await stop()
+                return
+            if time.time() - last_valid > LICENSE_GRACE_HOURS * 3600:
+                print(f"❌ {error}, and the {LICENSE_GRACE_HOURS:g}h offline grace period is over.")
+                await stop()
+                return
+            print(f"⚠️ {error}, still within the {LICENSE_GRACE_HOURS:g}h offline grace period.")
+            await asyncio.sleep(OFFLINE_RETRY_INTERVAL)  # retry sooner while offline
+            continue
+
+        last_valid = time.time()
+        await asyncio.to_thread(save_last_validation, license_key, result, last_valid)
+        print(f"✅ License valid for {tier}. Expires: {result.get('expires')}")
+        await asyncio.sleep(REVALIDATE_INTERVAL)
@@ -0,0 +1,85 @@
+# member_cache.py
+import asyncio
+import os
+import time
+
+import discord
+
+# "full" keeps discord.py's default member cache (every member of every guild),
+# "lean" caches only the members the bot actually works with: the standup audience, TicketMods and ticket assignees
+MEMORY_MODE = os.getenv("MEMORY_MODE", "full").strip().lower()
+QUERY_BATCH = 100  # Discord's limit of user ids per member query
+ROLE_CACHE_TTL = 600  # seconds a role's member ids from a chunk are trusted in lean mode
+
+_role_ids = {}  # (guild id, role id) -> (monotonic time, set of member ids)
+
+
+def is_lean():
+    return MEMORY_MODE == "lean"
+
+
+def member_cache_flags(intents: discord.Intents) -> discord.MemberCacheFlags:
+    """
+    Cache policy for the selected memory mode. Lean mode caches nothing implicitly. Members fetched with
+    `cache_members` are still kept and updated by their gateway events. The flags don't stop discord.py
+    from chunking every guild at startup (that follows the members intent), the bot turns it off with
+    chunk_guilds_at_startup=not is_lean().
+    """
+    if is_lean():
+        return discord.MemberCacheFlags.none()
+    return discord.MemberCacheFlags.from_intents(intents)
+
+
+async def cache_members(guild: discord.Guild, user_ids):
+    """Make sure these members are in the cache, querying the missing ones in batches. Returns the members found."""
+    members = []
+    missing = []
+    for user_id in user_ids:
+        member = guild.get_member(user_id)
+        if member is not None:
+            members.append(member)
+        else:
+            missing.append(user_id)
+
+    for i in range(0, len(missing), QUERY_BATCH):
+        try:
+            members.extend(await guild.query_members(user_ids=missing[i:i + QUERY_BATCH], cache=True))
+        except (asyncio.TimeoutError, discord.ClientException) as e:
+            print(f"❌ Failed to load {len(missing[i:i + QUERY_BATCH])} members: {e}")
+
+    return members
+
+
+async def chunk_role_member_ids(guild: discord.Guild, role_ids):
+    """
+    Member ids of each role from one uncached chunk request: the member list is streamed, filtered and
+    dropped instead of staying in the cache. Concurrent calls for the same guild share one request.
+    """
+    members = await guild.chunk(cache=False)
+    wanted = set(role_ids)
+    by_role = {role_id: set() for role_id in wanted}
+    for member in members:
+        for role_id in wanted:
+            if member.get_role(role_id):
+                by_role[role_id].add(member.id)
+
+    now = time.monotonic()
+    for role_id, ids in by_role.items():
+        _role_ids[(guild.id, role_id)] = (now, ids)
+    return by_role
+
+
+async def get_role_members(guild: discord.Guild, role: discord.Role):
+    """
+    Members of a role. Full mode reads the cache directly, lean mode chunks the role once every
+    ROLE_CACHE_TTL seconds and caches only its members.
+    """
+    if not is_lean():
+        return role.members
+
+    cached = _role_ids.get((guild.id, role.id))
+    if cached and time.monotonic() - cached[0] < ROLE_CACHE_TTL:
+        ids = cached[1]
+    else:
+        ids = (await chunk_role_member_ids(guild, [role.id]))[role.id]
+    return await cache_members(guild, sorted(ids))
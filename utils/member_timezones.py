@@ -0,0 +1,59 @@
+# member_timezones.py
+from collections import defaultdict
+
+from utils.shared_state import data_version, get_connection, write_transaction
+
+# user id -> timezone string (same formats as /timezone), reloaded when another process committed
+_timezones = None
+_data_version = None
+
+
+def _ensure_loaded():
+    global _timezones, _data_version
+    version = data_version()
+    if _timezones is not None and version == _data_version:
+        return
+    rows = get_connection().execute("SELECT user_id, tz FROM member_timezones").fetchall()
+    _timezones = dict(rows)
+    _data_version = version
+
+
+def get_member_timezone(user_id):
+    _ensure_loaded()
+    return _timezones.get(user_id)
+
+
+def set_member_timezone(user_id, tz_name):
+    """Store a member's own timezone, or clear it (back to the team timezone) with None."""
+    _ensure_loaded()
+    with write_transaction() as conn:
+        if tz_name is None:
+            conn.execute("DELETE FROM member_timezones WHERE user_id = ?", (user_id,))
+            _timezones.pop(user_id, None)
+        else:
+            conn.execute(
+                "INSERT INTO member_timezones (user_id, tz) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET tz = excluded.tz",
+                (user_id, tz_name),
+            )
+            _timezones[user_id] = tz_name
+
+
+def timezone_buckets(default_tz, user_ids=None):
+    """
+    Every timezone a standup has to go out in for `user_ids`: the ones they picked, and the team's for
+    those who didn't. Without user ids, the team's plus every timezone any member picked.
+    """
+    _ensure_loaded()
+    if user_ids is None:
+        return {default_tz, *_timezones.values()}
+    return {_timezones.get(user_id, default_tz) for user_id in user_ids}
+
+
+def split_into_buckets(user_ids, default_tz):
+    """Group user ids by the timezone their standup is delivered in."""
+    _ensure_loaded()
+    buckets = defaultdict(list)
+    for user_id in user_ids:
+        buckets[_timezones.get(user_id, default_tz)].append(user_id)
+    return buckets
@@ -0,0 +1,112 @@
+# role_members.py
+import asyncio
+import os
+from array import array
+
+import discord
+
+from utils.member_cache import cache_members, chunk_role_member_ids, is_lean
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # project root
+SNAPSHOT_FILE = os.path.join(BASE_DIR, "storage", "standup_role_members.bin")
+LEAN_RESYNC_SECONDS = 3 * 3600
+
+
+class RoleMembershipTracker:
+    """
+    Exact member set of the standup role, independent of how complete discord.py's member cache is.
+
+    One background chunk request seeds it on startup, gateway member events keep it current after
+    that, and a compact snapshot (role id followed by the sorted member ids as int64) lets a restart
+    use the last known audience before the chunk has finished.
+    """
+
+    def __init__(self, snapshot_file=SNAPSHOT_FILE):
+        self.snapshot_file = snapshot_file
+        self.role_id = None
+        self.member_ids = set()
+        self.synced = False
+        self._sync_task = None
+
+    # --------------- snapshot ---------------
+    def load_snapshot(self, role_id):
+        self.role_id = role_id
+        self.member_ids = set()
+        try:
+            data = array("q")
+            with open(self.snapshot_file, "rb") as f:
+                data.frombytes(f.read())
+        except FileNotFoundError:
+            return
+        # A snapshot of a different role is useless, wait for the chunk instead
+        if data and data[0] == role_id:
+            self.member_ids = set(data[1:])
+
+    def save_snapshot(self):
+        if self.role_id is None:
+            return
+        data = array("q", [self.role_id])
+        data.extend(sorted(self.member_ids))
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            data.tofile(f)
+        os.replace(tmp_file, self.snapshot_file)
+
+    # --------------- syncing ---------------
+    def start_sync(self, guild: discord.Guild, role_id):
+        """Seed the set from one chunk request in the background."""
+        if self.role_id != role_id:
+            self.load_snapshot(role_id)
+        if self._sync_task and not self._sync_task.done():
+            self._sync_task.cancel()
+        self._sync_task = asyncio.create_task(self._sync(guild, role_id))
+
+    async def _sync(self, guild: discord.Guild, role_id):
+        while True:
+            try:
+                if is_lean():
+                    # Members outside the cache get no update events, so role grants to them are only
+                    # seen by the next uncached chunk, which is repeated every LEAN_RESYNC_SECONDS
+                    self.member_ids = (await chunk_role_member_ids(guild, [role_id]))[role_id]
+                else:
+                    if not guild.chunked:
+                        await guild.chunk()
+                    role = guild.get_role(role_id)
+                    if role is None:
+                        return
+                    self.member_ids = {member.id for member in role.members}
+                self.synced = True
+                self.save_snapshot()
+                print(f"👥 Standup role membership synced: {len(self.member_ids)} members")
+            except Exception as e:
+                print(f"❌ Failed to sync standup role members: {e}")
+
+            if not is_lean():
+                return
+            await asyncio.sleep(LEAN_RESYNC_SECONDS)
+
+    def on_member_update(self, before: discord.Member, after: discord.Member):
+        if self.role_id is None:
+            return
+        had_role = any(r.id == self.role_id for r in before.roles)
+        has_role = any(r.id == self.role_id for r in after.roles)
+        if had_role == has_role:
+            return
+        if has_role:
+            self.member_ids.add(after.id)
+        else:
+            self.member_ids.discard(after.id)
+        self.save_snapshot()
+
+    def on_member_remove(self, user_id):
+        if user_id in self.member_ids:
+            self.member_ids.discard(user_id)
+            self.save_snapshot()
+
+    # --------------- audience ---------------
+    async def resolve_members(self, guild: discord.Guild):
+        """Members of the standup role, using the cache where possible and batched queries for the rest."""
+        return await cache_members(guild, sorted(self.member_ids))
+
+
+role_tracker = RoleMembershipTracker()
@@ -0,0 +1,277 @@
+# schedule.py
+import re
+from calendar import isleap
+from datetime import timezone, timedelta, datetime, time, date
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from utils import clock
+from utils.config_utils import get_config_version
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+UTC_OFFSET_RE = re.compile(r"^UTC([+-])(\d{1,2})(?::([03]0))?$")
+SKIP_RE = re.compile(r"^(?:(\d{4})-)?(\d{2})-(\d{2})(?:\.\.(\d{4})-(\d{2})-(\d{2}))?$")
+SCAN_YEARS = 4  # years next_after looks past today (or the last skip range) before giving up
+
+_schedule_cache = None  # (config version, id(cfg), Schedule)
+_bucket_cache = (None, {})  # (Schedule the buckets derive from, tz name -> Schedule)
+
+
+@lru_cache(maxsize=32)
+def load_zone(name: str):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError("Invalid timezone format.")
+
+
+def get_timezone_from_string(utc_str):
+    """Accepts fixed offsets like `UTC+2` / `UTC-5:30` or IANA zone names like `Europe/Sofia`."""
+    match = UTC_OFFSET_RE.match(utc_str)
+    if not match:
+        return load_zone(utc_str)
+
+    sign, hours_str, minutes_str = match.groups()
+    hours = int(hours_str)
+    minutes = int(minutes_str) if minutes_str else 0
+
+    offset_minutes = hours * 60 + minutes
+    if sign == "-":
+        offset_minutes = -offset_minutes
+
+    return timezone(timedelta(minutes=offset_minutes))
+
+
+def parse_skip(entry: str):
+    """
+    Parse one skip-calendar entry into (start, end) dates, or (None, (month, day)) for a yearly one:
+    `2026-12-24` skips one day, `2026-12-24..2027-01-02` a range and `12-25` that date every year.
+    """
+    match = SKIP_RE.match(entry.strip())
+    if not match:
+        raise ValueError(f"Invalid skip date `{entry}`.")
+    year, month, day, end_year, end_month, end_day = match.groups()
+    if year is None and end_year:
+        raise ValueError("Ranges need full dates, like `2026-12-24..2027-01-02`.")
+    try:
+        if year is None:
+            date(2000, int(month), int(day))  # a leap year, so 02-29 is accepted
+            return None, (int(month), int(day))
+        start = date(int(year), int(month), int(day))
+        end = date(int(end_year), int(end_month), int(end_day)) if end_year else start
+    except ValueError:
+        raise ValueError(f"Invalid skip date `{entry}`.")
+    if end < start:
+        raise ValueError(f"The range `{entry}` ends before it starts.")
+    return start, end
+
+
+def find_next_transition(tz, start: datetime, horizon_days: int = 400):
+    """First UTC instant after `start` where `tz` changes its UTC offset (a DST switch), or None."""
+    if isinstance(tz, timezone):
+        return None
+
+    offset = start.astimezone(tz).utcoffset()
+    lo = start
+    for _ in range(horizon_days):
+        hi = lo + timedelta(days=1)
+        if hi.astimezone(tz).utcoffset() != offset:
+            # Bisect down to the second inside the day that changed
+            while hi - lo > timedelta(seconds=1):
+                mid = lo + (hi - lo) / 2
+                if mid.astimezone(tz).utcoffset() == offset:
+                    lo = mid
+                else:
+                    hi = mid
+            # Transitions fall on whole seconds, so flooring `hi` still lands on or after the switch
+            return hi.replace(microsecond=0)
+        lo = hi
+    return None
+
+
+class Schedule:
+    """
+    A standup schedule compiled once from the config.
+    Holds the weekday bitmask (bit 0 = Monday), the parsed timezone and the skip calendar. Each year
+    is compiled lazily into an occurrence bitmap (bit n = day n of the year has a standup): the weekday
+    pattern repeated over the year with the skipped days cleared. The next standup is then the lowest
+    set bit from today on, so next-occurrence queries don't loop over dates.
+
+    For IANA zones the current UTC offset is cached together with the next DST transition,
+    and the last computed fire time is memoized, so the per-minute scheduler tick doesn't
+    go back to the zone database until a transition or a fire time has actually passed.
+    """
+
+    __slots__ = ("hour", "minute", "tz", "day_mask", "skips", "_last_skip_year", "_years", "_offset", "_offset_from",
+                 "_offset_until", "_memo")
+
+    def __init__(self, hour: int, minute: int, tz, day_mask: int, skips=()):
+        self.hour = hour
+        self.minute = minute
+        self.tz = tz
+        self.day_mask = day_mask
+        self.skips = tuple(skips)  # parsed entries, see parse_skip
+        self._last_skip_year = max((end.year for start, end in self.skips if start), default=0)
+        self._years = {}  # year -> occurrence bitmap
+
+        self._offset = tz if isinstance(tz, timezone) else None
+        self._offset_from = None
+        self._offset_until = None
+        self._memo = None  # (computed at, next fire) both in UTC
+
+    @classmethod
+    def from_config(cls, cfg):
+        if not (cfg["standup_time"] and cfg["standup_days"] and cfg["timezone"]):
+            return None
+
+        hour, minute = map(int, cfg["standup_time"][2].split(":"))
+        day_mask = 0
+        for day in cfg["standup_days"]:
+            if day.lower() in WEEKDAYS:
+                day_mask |= 1 << WEEKDAYS.index(day.lower())
+
+        skips = []
+        for entry in cfg.get("skip_dates", []):
+            try:
+                skips.append(parse_skip(entry))
+            except ValueError:
+                print(f"⚠️ Ignoring invalid skip date {entry!r}")
+
+        return cls(hour, minute, get_timezone_from_string(cfg["timezone"]), day_mask, skips)
+
+    def with_timezone(self, tz):
+        """The same standup time, days and skips, in another timezone."""
+        return Schedule(self.hour, self.minute, tz, self.day_mask, self.skips)
+
+    def year_bitmap(self, year: int) -> int:
+        """Occurrence bitmap for `year`, bit n set when day n (0 = January 1st) has a standup."""
+        bits = self._years.get(year)
+        if bits is not None:
+            return bits
+
+        days = 366 if isleap(year) else 365
+        first_weekday = date(year, 1, 1).weekday()
+        # The 7-bit weekday pattern starting on January 1st, then copied into every week of the year
+        week = 0
+        for i in range(7):
+            if self.day_mask >> ((first_weekday + i) % 7) & 1:
+                week |= 1 << i
+        bits = week * (((1 << (7 * 53)) - 1) // ((1 << 7) - 1)) & ((1 << days) - 1)
+
+        for start, end in self.skips:
+            if start is None:
+                month, day = end
+                if month == 2 and day == 29 and days == 365:
+                    continue
+                bits &= ~(1 << (date(year, month, day).timetuple().tm_yday - 1))
+                continue
+            if end.year < year or start.year > year:
+                continue
+            first = (start - date(year, 1, 1)).days if start.year == year else 0
+            last = (end - date(year, 1, 1)).days if end.year == year else days - 1
+            bits &= ~(((1 << (last - first + 1)) - 1) << first)
+
+        self._years[year] = bits
+        return bits
+
+    def _offset_at(self, dt: datetime):
+        """Fixed-offset tzinfo valid at `dt`, recomputed only when `dt` leaves the cached DST period."""
+        if isinstance(self.tz, timezone):
+            return self.tz
+
+        if self._offset is None or dt < self._offset_from or (self._offset_until and dt >= self._offset_until):
+            utc_dt = dt.astimezone(timezone.utc)
+            self._offset = timezone(utc_dt.astimezone(self.tz).utcoffset())
+            self._offset_from = utc_dt
+            self._offset_until = find_next_transition(self.tz, utc_dt)
+        return self._offset
+
+    def to_local(self, dt: datetime):
+        return dt.astimezone(self._offset_at(dt))
+
+    def now(self):
+        return self.to_local(clock.now(timezone.utc))
+
+    def is_standup_day(self, dt: datetime) -> bool:
+        local = self.to_local(dt)
+        return bool(self.year_bitmap(local.year) >> (local.timetuple().tm_yday - 1) & 1)
+
+    def is_skipped(self, day: date) -> bool:
+        """True when `day` is a standup weekday that the skip calendar takes out."""
+        return bool(self.day_mask >> day.weekday() & 1) and not self.year_bitmap(day.year) >> (
+            day.timetuple().tm_yday - 1) & 1
+
+    def next_after(self, dt: datetime):
+        """Next standup strictly after `dt`, as an aware datetime in the schedule's timezone."""
+        if not self.day_mask:
+            return None
+
+        if self._memo and self._memo[0] <= dt < self._memo[1]:
+            return self._memo[1].astimezone(self.tz)
+
+        local = self.to_local(dt)
+        slot = local.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        index = local.timetuple().tm_yday - 1 + (slot <= local)
+        for year in range(local.year, max(local.year, self._last_skip_year) + SCAN_YEARS):
+            bits = self.year_bitmap(year) >> index
+            if bits:
+                # Lowest set bit = first standup day at or after `index`
+                day = date(year, 1, 1) + timedelta(days=index + (bits & -bits).bit_length() - 1)
+                break
+            index = 0
+        else:
+            return None  # everything skipped as far as we look
+        # Rebuild from the wall-clock date so the zone applies the offset in effect on that day
+        next_dt = datetime.combine(day, time(self.hour, self.minute), tzinfo=self.tz)
+
+        self._memo = (dt.astimezone(timezone.utc), next_dt.astimezone(timezone.utc))
+        return next_dt
+
+    def next_n(self, dt: datetime, n: int):
+        """The next `n` standups after `dt`, for previews and multi-slot scheduling."""
+        occurrences = []
+        current = dt
+        for _ in range(n):
+            current = self.next_after(current)
+            if current is None:
+                break
+            occurrences.append(current)
+        return occurrences
+
+    def time_until_next(self, dt: datetime = None):
+        dt = dt or self.now()
+        next_dt = self.next_after(dt)
+        if next_dt is None:
+            return None
+        # Subtract in UTC, same-tzinfo subtraction would ignore a DST change in between
+        return next_dt.astimezone(timezone.utc) - dt.astimezone(timezone.utc)
+
+
+def get_schedule(cfg):
+    """Compiled schedule for `cfg`, rebuilt only after the config has been saved."""
+    global _schedule_cache
+    version = get_config_version()
+    if _schedule_cache is None or _schedule_cache[0] != version or _schedule_cache[1] != id(cfg):
+        _schedule_cache = (version, id(cfg), Schedule.from_config(cfg))
+    return _schedule_cache[2]
+
+
+def get_bucket_schedule(cfg, tz_name):
+    """The config's schedule in the timezone `tz_name`, for members who set their own timezone."""
+    global _bucket_cache
+    schedule = get_schedule(cfg)
+    if schedule is None:
+        return None
+    if _bucket_cache[0] is not schedule:
+        _bucket_cache = (schedule, {})
+    buckets = _bucket_cache[1]
+    if tz_name not in buckets:
+        buckets[tz_name] = schedule.with_timezone(get_timezone_from_string(tz_name))
+    return buckets[tz_name]
+
+
+def get_time_until_next_standup(cfg):
+    schedule = get_schedule(cfg)
+    if schedule is None:
+        return None
+    return schedule.time_until_next()
@@ -1,6 +1,7 @@
 import asyncio
+import heapq
 import os
-from datetime import datetime
+from datetime import timedelta, timezone
 
 import discord
 from discord import Embed
@@ -8,10 +9,19 @@ from discord.ext import tasks, commands
 from discord.ui import View, Button, Modal, TextInput
 
 from cogs.notifying import build_schedule_embed
+from utils import clock
 from utils.config_utils import *
-from utils.utils import get_timezone_from_string, get_time_until_next_standup
-
-align_running = False
+from utils.dm_channels import closed_dms, dm_channels
+from utils.drafts import DraftCache
+from utils.embed_cache import get_cached_embed
+from utils.events import publish
+from utils.health import add_ready_check
+from utils.member_cache import get_role_members
+from utils.member_timezones import get_member_timezone, split_into_buckets, timezone_buckets
+from utils.role_members import role_tracker
+from utils.schedule import get_bucket_schedule, get_schedule
+from utils.shared_state import LeaderLease, claim_once, get_value, set_value, write_transaction
+from utils.utils import get_timezone_from_string, handles_dm_events
 
 cfg = load_config()
 bot = None
@@ -20,39 +30,51 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # projec
 STORAGE_DIR = os.path.join(BASE_DIR, "storage")
 ANSWERS_FILE = os.path.join(STORAGE_DIR, "standup_answers.json")
 
+QUESTIONS_PER_PAGE = 5  # Discord's limit of inputs per modal
+MAX_EMBED_QUESTIONS = 25  # Discord's limit of fields per embed
+
+# (user id, answer view) -> answers collected from the pages submitted so far
+answer_drafts = DraftCache(maxsize=500, ttl=1800)
+
+
+def page_count(questions):
+    return max(1, -(-len(questions) // QUESTIONS_PER_PAGE))
+
 
 def save_standup_answer(user_id: int, answers: dict, questions_snapshot: dict, tz):
-    # Load existing answers
+    """
+    Add one member's answers to the answers file. Other bot processes save answers too, so the whole
+    read-modify-write holds the shared store's write lock and the file is replaced in one rename.
+    Blocks while another process holds the lock, call it from a worker thread.
+    """
     user_id = str(user_id)
+    today = clock.now(tz).strftime("%Y-%m-%d")
 
-    if os.path.exists(ANSWERS_FILE):
-        # If file is empty or corruptdefault to empty dict
+    with write_transaction():
+        # If file is missing, empty or corrupt default to empty dict
         try:
             with open(ANSWERS_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
             data = {}
-    else:
-        data = {}
 
-    today = datetime.now(tz=tz).strftime("%Y-%m-%d")
+        if today not in data:
+            data[today] = {}
 
-    if today not in data:
-        data[today] = {}
+        # Store both answers and the questions snapshot
+        data[today][user_id] = {
+            "answers": answers,
+            "questions_snapshot": questions_snapshot,
+        }
 
-    # Store both answers and the questions snapshot
-    data[today][user_id] = {
-        "answers": answers,
-        "questions_snapshot": questions_snapshot,
-    }
+        if len(data) > 14:
+            oldest_day = sorted(data.keys())[0]  # Ensures order
+            data.pop(oldest_day)
 
-    if len(data) > 14:
-        oldest_day = sorted(data.keys())[0]  # Ensures order
-        data.pop(oldest_day)
-
-    # Save back
-    with open(ANSWERS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        tmp_file = f"{ANSWERS_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, ANSWERS_FILE)
 
 
 def set_bot(bot_instance):
@@ -75,15 +97,29 @@ async def send_standup_announcement(bot: commands.Bot):
 
 
 class StandupAnswerModal(Modal, title="Standup Answers"):
-    def __init__(self, questions, view=None):
-        super().__init__()
+    """
+    One page of the standup answers. Discord caps modals at 5 inputs, so longer question lists
+    are answered over several pages; answers are kept in `answer_drafts` until the last page
+    and then written to the answer store in one go.
+    """
+
+    def __init__(self, questions, view=None, page=0, preview=False):
+        super().__init__(title=f"Standup Answers ({page + 1}/{page_count(questions)})"
+                         if len(questions) > QUESTIONS_PER_PAGE else "Standup Answers")
         self.view = view
-        # Build questions as (id, label) pairs from passed questions list (limit 3)
-        self.questions = [(f"q{i}", q) for i, q in enumerate(questions[:3])]
+        self.all_questions = questions
+        self.page = page
+        self.preview = preview
+        # Build questions as (id, label) pairs for this page, ids stay global across pages
+        start = page * QUESTIONS_PER_PAGE
+        self.questions = [(f"q{i}", q) for i, q in enumerate(questions[start:start + QUESTIONS_PER_PAGE], start)]
 
         for qid, qlabel in self.questions:
             self.add_item(TextInput(label=qlabel, custom_id=qid, style=discord.TextStyle.paragraph, required=False))
 
+    def draft_key(self, interaction: discord.Interaction):
+        return interaction.user.id, ("preview" if self.preview else id(self.view))
+
     async def on_submit(self, interaction: discord.Interaction):
         answers = {}
         questions_snapshot = {}
@@ -95,8 +131,40 @@ class StandupAnswerModal(Modal, title="Standup Answers"):
             label = next(label for (id_, label) in self.questions if id_ == qid)
             questions_snapshot[qid] = label
 
-        save_standup_answer(interaction.user.id, answers, questions_snapshot,
-                            tz=get_timezone_from_string(cfg["timezone"]))
+        key = self.draft_key(interaction)
+        if self.page == 0:
+            answer_drafts.pop(key)  # starting over drops whatever an earlier attempt left behind
+            draft = {"answers": {}, "questions_snapshot": {}}
+        else:
+            draft = answer_drafts.get(key)
+            if draft is None:
+                await interaction.response.send_message(
+                    "⌛ Your earlier answers expired, please start the standup again.", ephemeral=True)
+                return
+
+        draft["answers"].update(answers)
+        draft["questions_snapshot"].update(questions_snapshot)
+
+        next_page = self.page + 1
+        if next_page < page_count(self.all_questions):
+            answer_drafts.put(key, draft)
+            await interaction.response.send_message(
+                f"📝 Page {next_page}/{page_count(self.all_questions)} saved.",
+                view=StandupContinueView(self.all_questions, self.view, next_page, self.preview),
+                ephemeral=True
+            )
+            return
+
+        answer_drafts.pop(key)
+
+        if self.preview:
+            await interaction.response.send_message("✅ Thanks for your standup! | preview", ephemeral=True)
+            return
+
+        # Filed under the member's own date, which is the day their standup went out
+        tz_name = get_member_timezone(interaction.user.id) or cfg["timezone"]
+        await asyncio.to_thread(save_standup_answer, interaction.user.id, draft["answers"],
+                                draft["questions_snapshot"], tz=get_timezone_from_string(tz_name))
 
         if self.view:
             for item in self.view.children:
@@ -110,6 +178,24 @@ class StandupAnswerModal(Modal, title="Standup Answers"):
         await interaction.response.send_message("✅ Thanks for your standup!", ephemeral=True)
 
 
+class StandupContinueView(View):
+    """Ephemeral "continue" prompt between answer pages, a modal can't open another modal directly."""
+
+    def __init__(self, questions, answer_view, page, preview=False):
+        super().__init__(timeout=900)
+        self.questions = questions
+        self.answer_view = answer_view
+        self.page = page
+        self.preview = preview
+        self.continue_button.label = f"➡ Continue ({page + 1}/{page_count(questions)})"
+
+    @discord.ui.button(label="➡ Continue", style=discord.ButtonStyle.primary)
+    async def continue_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(
+            StandupAnswerModal(self.questions, view=self.answer_view, page=self.page, preview=self.preview)
+        )
+
+
 class StandupAnswerView(View):
     def __init__(self):
         super().__init__(timeout=3600)  # 1 hour in seconds
@@ -143,7 +229,147 @@ class StandupAnswerView(View):
             pass
 
 
-def build_standup_embed():
+class StandupChannelAnswerButton(discord.ui.DynamicItem[Button], template=r"standup:answer:(?P<day>\d{8})"):
+    """
+    "Answer" button on the single standup message of the channel and thread delivery modes. The
+    custom_id carries the standup's date, so clicks are routed without keeping any view in memory,
+    and a click on an older standup than the latest posted one is turned away.
+    """
+
+    def __init__(self, day: str, disabled=False):
+        super().__init__(Button(label="📝 Answer Standup", style=discord.ButtonStyle.primary,
+                                custom_id=f"standup:answer:{day}", disabled=disabled))
+        self.day = day
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["day"])
+
+    async def callback(self, interaction: discord.Interaction):
+        latest = get_value("standup_post") or {}
+        if latest.get("day") != self.day:
+            await interaction.response.send_message("⏰ This standup has closed.", ephemeral=True)
+            return
+        roles = getattr(interaction.user, "roles", [])
+        if not any(r.id == cfg["standup_role_id"] for r in roles):
+            await interaction.response.send_message("❌ This standup is for the standup role only.", ephemeral=True)
+            return
+        await interaction.response.send_modal(StandupAnswerModal(questions=cfg["standup_questions"]))
+
+
+class StandupFallbackAnswerButton(discord.ui.DynamicItem[Button], template=r"standup:fallback:(?P<day>\d{8})"):
+    """
+    "Answer" button on the channel message that stands in for the DM of members with closed DMs.
+    Only the members that message was posted for can answer through it.
+    """
+
+    def __init__(self, day: str, disabled=False):
+        super().__init__(Button(label="📝 Answer Standup", style=discord.ButtonStyle.primary,
+                                custom_id=f"standup:fallback:{day}", disabled=disabled))
+        self.day = day
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["day"])
+
+    async def callback(self, interaction: discord.Interaction):
+        fallback = (get_value("standup_fallback") or {}).get("days", {}).get(self.day)
+        if fallback is None:
+            await interaction.response.send_message("⏰ This standup has closed.", ephemeral=True)
+            return
+        if interaction.user.id not in fallback["user_ids"]:
+            await interaction.response.send_message(
+                "📬 This button is for members who can't receive DMs, your standup was sent to you by DM.",
+                ephemeral=True)
+            return
+        await interaction.response.send_modal(StandupAnswerModal(questions=cfg["standup_questions"]))
+
+
+def _persistent_view(item):
+    # Stopped before sending so discord.py doesn't keep it, the dynamic item routes the clicks
+    view = View(timeout=None)
+    view.add_item(item)
+    view.stop()
+    return view
+
+
+def build_channel_answer_view(day: str, disabled=False):
+    return _persistent_view(StandupChannelAnswerButton(day, disabled=disabled))
+
+
+def build_fallback_answer_view(day: str, disabled=False):
+    return _persistent_view(StandupFallbackAnswerButton(day, disabled=disabled))
+
+
+async def post_channel_standup(day):
+    """
+    Channel and thread delivery: one message mentioning the role instead of a DM per member. The
+    previous standup's button is disabled with a single edit, whatever the team size.
+    """
+    day_key = day.strftime("%Y%m%d")
+    channel_id = cfg["standup_channel_id"]
+    if cfg.get("delivery_mode") == "thread":
+        channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+        target = await channel.create_thread(name=f"📃 {cfg['standup_title'] or 'Standup'} – {day:%Y-%m-%d}",
+                                             type=discord.ChannelType.public_thread, auto_archive_duration=1440)
+    else:
+        target = bot.get_partial_messageable(channel_id)
+
+    message = await target.send(content=f"<@&{cfg['standup_role_id']}>", embed=build_standup_embed(),
+                                 view=build_channel_answer_view(day_key))
+
+    previous = get_value("standup_post")
+    set_value("standup_post", {"day": day_key, "channel_id": target.id, "message_id": message.id})
+    if previous and previous.get("day") != day_key:
+        try:
+            old = bot.get_partial_messageable(previous["channel_id"]).get_partial_message(previous["message_id"])
+            await old.edit(view=build_channel_answer_view(previous["day"], disabled=True))
+        except discord.HTTPException:
+            pass  # deleted, or its thread was archived
+
+
+FALLBACK_MENTIONS_PER_MESSAGE = 80  # ~22 characters per mention keeps a message under Discord's 2000
+FALLBACK_OPEN_DAYS = 2  # local dates whose buttons stay open, members' timezones can be a day apart
+
+
+async def post_dm_fallback(day, user_ids):
+    """
+    The standup for members whose DMs are closed, as messages in the standup channel mentioning them
+    with an answer button, instead of them silently missing it. `day` is the members' local date, later
+    buckets of the same date add to the same list. Buttons of dates more than FALLBACK_OPEN_DAYS back
+    are disabled.
+    """
+    day_key = day.strftime("%Y%m%d")
+    days = (get_value("standup_fallback") or {}).get("days", {})
+    state = days.setdefault(day_key, {"user_ids": [], "messages": []})
+
+    target = bot.get_partial_messageable(cfg["standup_channel_id"])
+    for start in range(0, len(user_ids), FALLBACK_MENTIONS_PER_MESSAGE):
+        mentions = " ".join(f"<@{user_id}>" for user_id in user_ids[start:start + FALLBACK_MENTIONS_PER_MESSAGE])
+        try:
+            message = await target.send(
+                content=f"📭 Couldn't reach you by DM, here's today's standup: {mentions}",
+                embed=build_standup_embed() if start == 0 else None,
+                view=build_fallback_answer_view(day_key))
+        except discord.HTTPException as e:
+            print(f"❌ Failed to post the standup for members with closed DMs: {e}")
+            break
+        state["messages"].append([target.id, message.id])
+    state["user_ids"] += user_ids
+    closed = {key: days.pop(key) for key in sorted(days)[:-FALLBACK_OPEN_DAYS]}
+    set_value("standup_fallback", {"days": days})
+    print(f"📭 Standup posted in the channel for {len(user_ids)} members with closed DMs")
+
+    for old_day, old_state in closed.items():
+        for channel_id, message_id in old_state["messages"]:
+            try:
+                old = bot.get_partial_messageable(channel_id).get_partial_message(message_id)
+                await old.edit(view=build_fallback_answer_view(old_day, disabled=True))
+            except discord.HTTPException:
+                pass
+
+
+def _build_standup_embed():
     embed = discord.Embed(
         title=(f"📃 {cfg['standup_title']}" if cfg['standup_title'] else "**-no title set-**"),
         description=(cfg['standup_desc'] if cfg['standup_desc'] else "**-no description set-**"),
@@ -153,83 +379,257 @@ def build_standup_embed():
     if len(cfg["standup_questions"]) <= 0:
         embed.add_field(name=f"**No questions added!**", value="", inline=False)
     else:
-        for i, q in enumerate(cfg['standup_questions'][:3], 1):
+        for i, q in enumerate(cfg['standup_questions'][:MAX_EMBED_QUESTIONS], 1):
             embed.add_field(name=f"Q{i}", value=q, inline=False)
 
     return embed
 
 
-last_announcement_date = None
+def build_standup_embed():
+    """Shared standup embed, rebuilt only when the config is saved. Don't mutate it."""
+    return get_cached_embed("standup", _build_standup_embed)
+
+
+# With several bot processes, the one holding this lease runs the standup fan-out
+standup_leader = LeaderLease("standup", ttl=150)
+_prewarm_task = None
+
+FANOUT_MEMBERS_PER_WORKER = 25  # one concurrent sender per this many members in a bucket
+MAX_FANOUT_WORKERS = 8
+STALE_DELIVERY = timedelta(minutes=5)  # a slot missed by more than this (bot was down) is skipped
+
+# Delivery timer queue: one (due utc, timezone) entry per bucket of members sharing a timezone
+_delivery_heap = []
+_delivery_key = None  # (config version, timezones) the heap was built for
+
+
+def _standup_recipient_ids(guild):
+    if guild is None or not (role_tracker.synced or role_tracker.member_ids):
+        # The standup server may be on another process' shards, use the snapshot that process keeps
+        role_tracker.load_snapshot(cfg["standup_role_id"])
+    return sorted(role_tracker.member_ids)
+
+
+def _next_bucket_fire(tz_name, after):
+    """The bucket's next standup after `after` in UTC, None for a zone that no longer loads or has none."""
+    try:
+        schedule = get_bucket_schedule(cfg, tz_name)
+    except ValueError:
+        return None
+    next_dt = schedule.next_after(after) if schedule else None
+    return next_dt.astimezone(timezone.utc) if next_dt else None
+
+
+def _sync_delivery_queue(now_utc, zones):
+    """Rebuild the bucket heap after the schedule changed or the audience's timezones did."""
+    global _delivery_heap, _delivery_key
+    key = (get_config_version(), frozenset(zones))
+    if key == _delivery_key:
+        return
+
+    # Just before the current minute, so a slot that is due right now is still queued
+    start = now_utc.replace(second=0, microsecond=0) - timedelta(seconds=1)
+    heap = []
+    for tz_name in zones:
+        next_dt = _next_bucket_fire(tz_name, start)
+        if next_dt:
+            heap.append((next_dt, tz_name))
+    heapq.heapify(heap)
+    _delivery_heap = heap
+    _delivery_key = key
+
+
+def _pop_due_buckets(now_utc):
+    due = []
+    while _delivery_heap and _delivery_heap[0][0] <= now_utc:
+        fire_at, tz_name = heapq.heappop(_delivery_heap)
+        if now_utc - fire_at <= STALE_DELIVERY:
+            due.append((fire_at, tz_name))
+        next_dt = _next_bucket_fire(tz_name, fire_at)
+        if next_dt:
+            heapq.heappush(_delivery_heap, (next_dt, tz_name))
+    return due
+
+
+async def _send_standup_dm(user_id, embed):
+    """Send one standup DM. False if the member's DMs are closed."""
+    try:
+        view = StandupAnswerView()
+        # A pre-warmed channel makes this a single POST, otherwise the DM is opened first
+        dm = dm_channels.get(bot, user_id)
+        if dm is None:
+            dm = await bot.create_dm(discord.Object(id=user_id))
+            dm_channels.remember([(user_id, dm.id)])
+        message = await dm.send(embed=embed, view=view)
+        view.message = message
+    except discord.Forbidden:
+        print(f"📭 - DMs closed for {user_id}")
+        return False
+    except discord.HTTPException as e:
+        print(f"❌ - Failed to DM {user_id}: {e}")
+    return True
+
+
+async def _fan_out(user_ids, embed):
+    """
+    Send to one bucket with a worker pool sized to it, so small buckets don't hold idle senders.
+    Returns the members whose DMs turned out to be closed.
+    """
+    queue = asyncio.Queue()
+    for user_id in user_ids:
+        queue.put_nowait(user_id)
+    closed = []
+
+    async def worker():
+        while not queue.empty():
+            user_id = queue.get_nowait()
+            if not await _send_standup_dm(user_id, embed):
+                closed.append(user_id)
+
+    workers = min(MAX_FANOUT_WORKERS, 1 + len(user_ids) // FANOUT_MEMBERS_PER_WORKER)
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return closed
 
 
 @tasks.loop(minutes=1.0)
 async def schedule_standup():
-    global last_announcement_date
-
+    global _prewarm_task
+    reload_config_if_changed()
     if not cfg.get("toggled"):
         return
 
-    tz = get_timezone_from_string(cfg["timezone"])
-    standup_hour = cfg["standup_time"][0]
-    standup_minute = cfg["standup_time"][1]
-    now = datetime.now(tz)
+    schedule = get_schedule(cfg)
+    now = schedule.now() if schedule else clock.now()
     print(f" ➤ Check executed {now.hour}:{now.minute}")
 
-    time_until = get_time_until_next_standup(cfg)
+    time_until = schedule.time_until_next(now) if schedule else None
 
     if time_until is None:
         print("Standup config incomplete.")
         return
 
     minutes_until = time_until.total_seconds() / 60
-
-    # Send announcement 20 minutes before
-    if 19 <= minutes_until <= 20:
-        if last_announcement_date != now.date():
+    channel = bot.get_channel(cfg["standup_channel_id"])
+    guild = channel.guild if channel else None
+    # Renewed every tick, so leadership only moves when the leading process stops checking
+    # Claims and the lease wait on other processes' writes, in a worker thread so the loop never stalls
+    is_leader = handles_dm_events(bot) and await asyncio.to_thread(standup_leader.try_acquire)
+
+    # Send announcement 20 minutes before, from whichever process sees the channel first
+    if 19 <= minutes_until <= 20 and channel:
+        if await asyncio.to_thread(claim_once, f"announcement:{now.date()}"):
             await send_standup_announcement(bot)
-            last_announcement_date = now.date()
-
-    # Send standup DMs at standup time
-    if now.hour == standup_hour and now.minute == standup_minute:
-        today = now.strftime("%A").lower()
-        if today in cfg["standup_days"]:
-            channel = bot.get_channel(cfg["standup_channel_id"])
-            guild = channel.guild
-            role = guild.get_role(cfg["standup_role_id"])
-
-            for member in role.members:
-                try:
-                    view = StandupAnswerView()
-                    message = await member.send(embed=build_standup_embed(), view=view)
-                    view.message = message
-                except discord.Forbidden:
-                    print(f"❌ - Could not DM {member.name}")
-
-            last_announcement_date = None
-
-
-async def align_and_start_standup():
-    global align_running
-    if align_running:
-        print("⚠️ Align already running. Skipping...")
+
+    # The fan-out process uses the same window to open the DM channels it is going to need
+    dm_delivery = cfg.get("delivery_mode", "dm") == "dm"
+    if 19 <= minutes_until <= 20 and is_leader and dm_delivery \
+            and await asyncio.to_thread(claim_once, f"prewarm:{now.date()}"):
+        _prewarm_task = asyncio.create_task(
+            dm_channels.prewarm(bot, _standup_recipient_ids(guild), window=time_until.total_seconds()))
+
+    # Send the standup when a timezone bucket reaches the standup time. Answer buttons in DMs are
+    # delivered to the process that handles DM events, so only that one competes for the lease.
+    if not is_leader:
+        return
+    now_utc = now.astimezone(timezone.utc)
+    recipient_ids = _standup_recipient_ids(guild)
+    if dm_delivery:
+        # Only the zones of members who get the standup, nothing tracked yet means every zone in use
+        zones = timezone_buckets(cfg["timezone"], recipient_ids or None)
+    else:
+        zones = {cfg["timezone"]}  # one message for the whole team, at the team's standup time
+    _sync_delivery_queue(now_utc, zones)
+    due = [(fire_at, tz_name) for fire_at, tz_name in _pop_due_buckets(now_utc)
+           if await asyncio.to_thread(claim_once, f"standup:{tz_name}:{fire_at.isoformat()}")]
+    if not due:
         return
 
-    if not cfg.get("toggled", False):
-        print("⛔ Standup is toggled off. Not aligning.")
+    if not dm_delivery:
+        for fire_at, _ in due:
+            print("📬 Standup posted to the channel")
+            await post_channel_standup(schedule.to_local(fire_at).date())
         return
 
-    align_running = True
-    try:
-        if schedule_standup.is_running():
-            schedule_standup.cancel()
-
-        tz = get_timezone_from_string(cfg["timezone"])
-        now = datetime.now(tz)
-        seconds = now.second
-        delay = 60 - seconds if seconds > 0 else 0
-
-        print(f"⌛ Aligning to next minute in {delay} seconds...")
-        await asyncio.sleep(delay)
-        await schedule_standup.start()
-    finally:
-        align_running = False
+    if not recipient_ids and guild:
+        # Nothing tracked yet, fall back to whatever the member cache knows about the role
+        role = guild.get_role(cfg["standup_role_id"])
+        recipient_ids = [member.id for member in await get_role_members(guild, role)] if role else []
+
+    buckets = split_into_buckets(recipient_ids, cfg["timezone"])
+    embed = build_standup_embed()
+    fallback = {}  # local date of the bucket -> members to reach in the channel instead
+    for fire_at, tz_name in due:
+        # Members known to have closed DMs skip the fan-out until their next re-probe
+        send, skipped = closed_dms.split(buckets.get(tz_name, []))
+        print(f"📬 Standup for {tz_name}: {len(send)} members, {len(skipped)} with closed DMs")
+        failed = await _fan_out(send, embed)
+        closed_dms.update(send, failed)
+        if skipped or failed:
+            day = fire_at.astimezone(get_timezone_from_string(tz_name)).date()
+            fallback.setdefault(day, []).extend(skipped + failed)
+    for day, user_ids in sorted(fallback.items()):
+        await post_dm_fallback(day, user_ids)
+
+
+# --------------- scheduler control ---------------
+# One background supervisor owns the standup loop's timing: it aligns the loop to the minute, restarts
+# it after a crash, and idles while standups are toggled off. arm/rearm/disarm only signal it and
+# return immediately, so calling them from commands and on_ready never blocks, and repeated or
+# concurrent calls can't start a second loop.
+_supervisor = None
+_wakeup = asyncio.Event()
+
+
+def arm():
+    """Make sure the supervisor runs. The loop starts at the next minute whenever standups are toggled on."""
+    global _supervisor
+    if _supervisor is None or _supervisor.done():
+        _supervisor = asyncio.create_task(_supervise(), name="standup-supervisor")
+    _wakeup.set()
+
+
+def rearm():
+    """Re-align the loop after a schedule change."""
+    if schedule_standup.is_running():
+        schedule_standup.cancel()
+    arm()
+
+
+def disarm():
+    """Stop the loop. The supervisor stays idle until standups are toggled on again."""
+    if schedule_standup.is_running():
+        schedule_standup.cancel()
+        print("🛑 Standup schedule cancelled.")
+    _wakeup.set()
+
+
+def is_armed():
+    return _supervisor is not None and not _supervisor.done()
+
+
+async def _wait_for_wakeup(timeout):
+    """Sleep up to `timeout` seconds. True if arm/rearm/disarm woke us up early."""
+    return await clock.wait(_wakeup, timeout)
+
+
+async def _supervise():
+    while True:
+        _wakeup.clear()
+        reload_config_if_changed()
+        if not cfg.get("toggled"):
+            await _wait_for_wakeup(60)  # another bot process may toggle standups on
+            continue
+
+        now = clock.now()
+        delay = 60 - now.second - now.microsecond / 1_000_000
+        print(f"⌛ Aligning to next minute in {delay:.0f} seconds...")
+        if await _wait_for_wakeup(delay):
+            continue  # re-armed or disarmed while aligning, start over
+
+        task = schedule_standup.start()
+        await asyncio.wait([task])
+        if not task.cancelled() and task.exception():
+            print(f"❌ Standup loop crashed, restarting: {task.exception()}")
+
+
+add_ready_check("scheduler_armed", lambda: not cfg.get("toggled") or is_armed())
@@ -0,0 +1,136 @@
+# shared_state.py
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+SHARED_DB_FILE = os.getenv("SHARED_DB_FILE", "storage/shared_state.db")
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+CLAIM_RETENTION = 7 * 24 * 3600  # seconds a once-only claim is remembered
+# Seconds a write waits for another process' write to finish. The event loop's connection only waits
+# briefly, a longer stall would hold up the gateway heartbeat, so waits that may take long (claims and
+# leases under contention) are made from a worker thread with asyncio.to_thread instead.
+LOOP_BUSY_TIMEOUT = 1
+THREAD_BUSY_TIMEOUT = 10
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def get_connection():
+    """
+    This thread's connection to the shared SQLite store. WAL mode lets every bot process on the
+    machine read while one of them writes, writers queue up on the busy timeout instead of failing.
+    Each thread gets its own, so a transaction in a worker thread never mixes with the event loop's.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        on_loop_thread = threading.current_thread() is threading.main_thread()
+        conn = _connect(LOOP_BUSY_TIMEOUT if on_loop_thread else THREAD_BUSY_TIMEOUT)
+        _local.conn = conn
+    return conn
+
+
+def _connect(timeout):
+    global _schema_ready
+    os.makedirs(os.path.dirname(SHARED_DB_FILE) or ".", exist_ok=True)
+    conn = sqlite3.connect(SHARED_DB_FILE, timeout=timeout, isolation_level=None)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _schema_lock:
+        if not _schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS claims (key TEXT PRIMARY KEY, holder TEXT, claimed_at REAL);
+                CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT, expires REAL);
+                CREATE TABLE IF NOT EXISTS tickets (
+                    id TEXT PRIMARY KEY, seq INTEGER, mod_message_id INTEGER, version INTEGER, data TEXT
+                );
+                CREATE TABLE IF NOT EXISTS dm_channels (user_id INTEGER PRIMARY KEY, channel_id INTEGER);
+                CREATE TABLE IF NOT EXISTS member_timezones (user_id INTEGER PRIMARY KEY, tz TEXT);
+                CREATE TABLE IF NOT EXISTS dm_closed (user_id INTEGER PRIMARY KEY, failures INTEGER, retry_at REAL);
+                CREATE TABLE IF NOT EXISTS event_spool (seq INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT);
+                CREATE TABLE IF NOT EXISTS event_cursors (sink TEXT PRIMARY KEY, last_seq INTEGER);
+            """)
+            _schema_ready = True
+    return conn
+
+
+@contextmanager
+def write_transaction():
+    """Exclusive write section across all processes (BEGIN IMMEDIATE), committed on success."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def data_version():
+    """Changes whenever another connection commits, a cheap way to tell if cached rows went stale."""
+    return get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+
+# --------------- key / value ---------------
+def get_value(key, default=None):
+    row = get_connection().execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def set_value(key, value, conn=None):
+    (conn or get_connection()).execute(
+        "INSERT INTO kv (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, json.dumps(value)),
+    )
+
+
+# --------------- once-only claims ---------------
+def claim_once(key):
+    """
+    True for exactly one process that asks for `key`, every later call (from any process) gets False.
+    Used so a scheduled action fires once even if several processes reach it in the same minute.
+    Waits for other writers, call it through asyncio.to_thread from async code.
+    """
+    now = time.time()
+    with write_transaction() as conn:
+        conn.execute("DELETE FROM claims WHERE claimed_at < ?", (now - CLAIM_RETENTION,))
+        cur = conn.execute("INSERT OR IGNORE INTO claims (key, holder, claimed_at) VALUES (?, ?, ?)",
+                           (key, PROCESS_ID, now))
+        return cur.rowcount == 1
+
+
+# --------------- leader election ---------------
+class LeaderLease:
+    """
+    Time-limited leadership for one named role. The holder renews it on every check, other processes
+    take over once it has expired, so a crashed leader is replaced after at most `ttl` seconds.
+    try_acquire() waits for other writers, call it through asyncio.to_thread from async code.
+    """
+
+    def __init__(self, name, ttl=90):
+        self.name = name
+        self.ttl = ttl
+
+    def try_acquire(self):
+        now = time.time()
+        with write_transaction() as conn:
+            row = conn.execute("SELECT holder, expires FROM leases WHERE name = ?", (self.name,)).fetchone()
+            if row and row[0] != PROCESS_ID and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT INTO leases (name, holder, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires = excluded.expires",
+                (self.name, PROCESS_ID, now + self.ttl),
+            )
+            return True
+
+    def release(self):
+        with write_transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (self.name, PROCESS_ID))
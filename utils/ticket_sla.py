@@ -0,0 +1,98 @@
+# ticket_sla.py
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+
+# Multiples of the ticket's SLA window at which it escalates (level 1 = breached, level 2 = badly overdue)
+ESCALATION_STEPS = [1.0, 2.0]
+DEFAULT_SLA_HOURS_PER_PRIORITY = 4  # priority 1 is the most urgent: 4h, priority 10 gets 40h
+
+
+def sla_window(ticket, hours_per_priority=DEFAULT_SLA_HOURS_PER_PRIORITY):
+    return timedelta(hours=hours_per_priority * int(ticket.get("priority") or 10))
+
+
+def next_escalation(ticket, hours_per_priority=DEFAULT_SLA_HOURS_PER_PRIORITY):
+    """(due time in UTC, level) of the ticket's next escalation, or None if it has none left."""
+    level = ticket.get("sla_level", 0)
+    if level >= len(ESCALATION_STEPS):
+        return None
+
+    try:
+        created_at = datetime.fromisoformat(ticket["created_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+
+    due = created_at + sla_window(ticket, hours_per_priority) * ESCALATION_STEPS[level]
+    return due.astimezone(timezone.utc), level + 1
+
+
+class SLAScheduler:
+    """
+    Keeps every open ticket's next SLA deadline in a min-heap and sleeps until the earliest one.
+    Closed tickets aren't removed from the heap, `on_escalate` just reports False for them and the
+    entry is dropped when it comes up, so nothing ever scans all open tickets on a timer.
+    """
+
+    def __init__(self, on_escalate, hours_per_priority=DEFAULT_SLA_HOURS_PER_PRIORITY):
+        self.on_escalate = on_escalate  # async (ticket_id, level) -> updated ticket dict, or None when it's gone
+        self.hours_per_priority = hours_per_priority
+        self._heap = []  # (due utc, ticket id, level)
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def rebuild(self, tickets):
+        """Rebuild the heap from the ticket store in one O(n) heapify, used on startup."""
+        self._heap = []
+        for ticket in tickets:
+            entry = next_escalation(ticket, self.hours_per_priority)
+            if entry:
+                self._heap.append((entry[0], ticket["id"], entry[1]))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def track(self, ticket):
+        entry = next_escalation(ticket, self.hours_per_priority)
+        if not entry:
+            return
+        heapq.heappush(self._heap, (entry[0], ticket["id"], entry[1]))
+        # Only the timer's current target matters, wake it up if this deadline comes first
+        if self._heap[0][1] == ticket["id"]:
+            self._wakeup.set()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            due, ticket_id, level = self._heap[0]
+            delay = (due - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            try:
+                ticket = await self.on_escalate(ticket_id, level)
+            except Exception as e:
+                print(f"❌ SLA escalation failed for ticket {ticket_id}: {e}")
+                continue
+
+            if ticket:
+                self.track(ticket)
@@ -0,0 +1,262 @@
+# ticket_store.py
+import asyncio
+import copy
+import json
+import os
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.shared_state import data_version, get_connection, get_value, set_value, write_transaction
+
+OPEN_TICKETS_FILE = 'open_tickets.json'  # pre-SQLite ticket file, imported once into the shared store
+
+# Mirrors the tickets table: id -> ticket (creation order), reloaded only when another process committed
+_tickets = None
+_by_message = {}  # mod message id -> ticket id, for buttons on messages that predate id-carrying custom_ids
+_last_id = None
+_data_version = None
+_migrated = False
+_locks = weakref.WeakValueDictionary()  # ticket id -> asyncio.Lock, dropped once nobody holds it
+
+
+class TicketConflict(Exception):
+    """The fields being written were changed by someone else since they were read."""
+
+
+def _put(conn, ticket):
+    conn.execute(
+        "INSERT INTO tickets (id, seq, mod_message_id, version, data) "
+        "VALUES (?, (SELECT IFNULL(MAX(seq), 0) + 1 FROM tickets), ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET mod_message_id = excluded.mod_message_id, "
+        "version = excluded.version, data = excluded.data",
+        (ticket["id"], ticket.get("mod_message_id"), ticket.get("version", 0), json.dumps(ticket)),
+    )
+
+
+def _migrate_ticket_file():
+    global _migrated
+    if _migrated:
+        return
+    with write_transaction() as conn:
+        if not get_value("tickets_migrated") and os.path.exists(OPEN_TICKETS_FILE):
+            with open(OPEN_TICKETS_FILE, 'r') as f:
+                data = json.load(f)
+            for ticket in data.get("tickets", []):
+                _put(conn, ticket)
+            # Older files don't track the last id, fall back to the highest one still open
+            last_id = data.get("last_id") or max((t["id"] for t in data.get("tickets", [])), default=None)
+            set_value("last_ticket_id", last_id, conn)
+            print(f"🗄️ Imported {len(data.get('tickets', []))} tickets from {OPEN_TICKETS_FILE}")
+        set_value("tickets_migrated", True, conn)
+    _migrated = True
+
+
+def _ensure_loaded():
+    global _tickets, _last_id, _data_version
+    _migrate_ticket_file()
+    version = data_version()
+    if _tickets is not None and version == _data_version:
+        return
+
+    rows = get_connection().execute("SELECT data FROM tickets ORDER BY seq").fetchall()
+    _tickets = {t["id"]: t for t in (json.loads(row[0]) for row in rows)}
+    _index_messages()
+    _last_id = get_value("last_ticket_id")
+    _data_version = version
+
+
+def _index_messages():
+    global _by_message
+    _by_message = {t["mod_message_id"]: ticket_id for ticket_id, t in _tickets.items() if t.get("mod_message_id")}
+
+
+@contextmanager
+def _writing():
+    """
+    Write section shared by all bot processes: the mirror is refreshed under the database write lock,
+    so checks and changes made inside it can't interleave with another process's.
+    """
+    global _tickets
+    _migrate_ticket_file()
+    try:
+        with write_transaction() as conn:
+            _ensure_loaded()
+            yield conn
+    except BaseException:
+        _tickets = None  # the mirror may hold changes that were rolled back
+        raise
+    _index_messages()
+
+
+def load_open_tickets():
+    _ensure_loaded()
+    return copy.deepcopy(list(_tickets.values()))
+
+
+def save_open_tickets(tickets):
+    global _tickets
+    with _writing() as conn:
+        conn.execute("DELETE FROM tickets")
+        _tickets = {}
+        for t in tickets:
+            _tickets[t["id"]] = copy.deepcopy(t)
+            _put(conn, t)
+
+
+def count_open_tickets():
+    _ensure_loaded()
+    return len(_tickets)
+
+
+def get_ticket(ticket_id):
+    """O(1) lookup by id. Returns a copy, persist changes with `save_ticket`."""
+    _ensure_loaded()
+    ticket = _tickets.get(ticket_id)
+    return copy.deepcopy(ticket) if ticket else None
+
+
+def get_ticket_by_message(message_id):
+    _ensure_loaded()
+    ticket_id = _by_message.get(message_id)
+    return get_ticket(ticket_id) if ticket_id else None
+
+
+def save_ticket(ticket):
+    """Insert or replace a single ticket."""
+    with _writing() as conn:
+        _tickets[ticket["id"]] = copy.deepcopy(ticket)
+        _put(conn, ticket)
+
+
+def apply_ticket_changes(ticket_id, changes: dict, base: dict = None):
+    """
+    Write only `changes` onto the stored ticket and bump its version. With `base` (the copy the changes
+    were made from) this is an optimistic check: if the stored ticket moved on and touched any of the
+    same fields, TicketConflict is raised instead of silently overwriting them. The check and the write
+    happen under the store's write lock, so this also holds between bot processes.
+    Returns the stored ticket, or None if it no longer exists.
+    """
+    with _writing() as conn:
+        current = _tickets.get(ticket_id)
+        if current is None:
+            return None
+
+        if base is not None and current.get("version", 0) != base.get("version", 0):
+            clashing = [key for key in changes if current.get(key) != base.get(key)]
+            if clashing:
+                raise TicketConflict(f"Ticket {ticket_id} was changed concurrently ({', '.join(clashing)})")
+
+        current.update(copy.deepcopy(changes))
+        current["version"] = current.get("version", 0) + 1
+        _put(conn, current)
+        return copy.deepcopy(current)
+
+
+def remove_ticket(ticket_id):
+    with _writing() as conn:
+        if _tickets.pop(ticket_id, None) is not None:
+            conn.execute("DELETE FROM tickets WHERE id = ?", (ticket_id,))
+
+
+def remove_tickets(ticket_ids):
+    """
+    Remove several tickets in a single write. Tickets another handler is working on right now
+    (their lock is held) are skipped. Returns the removed tickets.
+    """
+    removed = []
+    with _writing() as conn:
+        for ticket_id in ticket_ids:
+            lock = _locks.get(ticket_id)
+            if lock is not None and lock.locked():
+                continue
+            ticket = _tickets.pop(ticket_id, None)
+            if ticket is not None:
+                removed.append(ticket)
+        conn.executemany("DELETE FROM tickets WHERE id = ?", [(t["id"],) for t in removed])
+    return removed
+
+
+def allocate_ticket_id(tz=None):
+    """
+    Time-ordered ticket id (`YYYY-MMDDHHMMSS`). When the second was already used, or the clock went
+    backwards, the last id is reused with a `-NN` sequence suffix, so ids stay unique and sortable.
+    The last handed out id is kept in the shared store, so this holds across restarts and processes.
+    """
+    global _last_id
+    with _writing() as conn:
+        now = datetime.now(tz=tz)
+        ticket_id = f"{now.year}-{now.strftime('%m%d%H%M%S')}"
+
+        if _last_id and ticket_id <= _last_id:
+            year, stamp, *seq = _last_id.split("-")
+            ticket_id = f"{year}-{stamp}-{int(seq[0]) + 1 if seq else 1:02d}"
+
+        _last_id = ticket_id
+        set_value("last_ticket_id", ticket_id, conn)
+    return ticket_id
+
+
+def ticket_lock(ticket_id):
+    lock = _locks.get(ticket_id)
+    if lock is None:
+        lock = _locks[ticket_id] = asyncio.Lock()
+    return lock
+
+
+class TicketTransaction:
+    """
+    Unit of work for one ticket:
+
+        async with ticket_transaction(ticket_id) as tx:
+            tx.ticket["status"] = "Solved"   # tx.ticket is None if the ticket doesn't exist
+            ...
+            tx.remove()                      # or tx.commit() / tx.discard()
+
+    Actions on the same ticket are serialized by a per-ticket lock, actions on different tickets
+    run in parallel. On exit (or on `commit()`) only the fields that changed are written back
+    onto the freshest stored copy, so a handler can never revert another ticket's update.
+    Leaving the block through an exception discards the changes.
+    """
+
+    def __init__(self, ticket_id):
+        self.ticket_id = ticket_id
+        self.ticket = None
+        self._base = None
+        self._removed = False
+        self._lock = ticket_lock(ticket_id)
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        self._base = get_ticket(self.ticket_id)
+        self.ticket = copy.deepcopy(self._base)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            self._lock.release()
+
+    def commit(self):
+        if self._removed or self.ticket is None or self._base is None:
+            return
+        changes = {key: value for key, value in self.ticket.items() if self._base.get(key) != value}
+        if not changes:
+            return
+        stored = apply_ticket_changes(self.ticket_id, changes, base=self._base)
+        if stored is not None:
+            self._base = stored
+            self.ticket["version"] = stored["version"]
+
+    def discard(self):
+        self.ticket = copy.deepcopy(self._base)
+
+    def remove(self):
+        self._removed = True
+        remove_ticket(self.ticket_id)
+
+
+def ticket_transaction(ticket_id):
+    return TicketTransaction(ticket_id)
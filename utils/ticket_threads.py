@@ -0,0 +1,141 @@
+# ticket_threads.py
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+DEFAULT_ARCHIVE_AFTER_HOURS = 48
+
+
+class TicketThreadManager:
+    """
+    Keeps handles to ticket threads and archives the ones that go quiet.
+
+    Thread objects come from gateway thread events (or the first lookup after a restart) and are
+    reused for every later action instead of a REST fetch each time. Inactivity is checked from one
+    heap of (due time, thread id) entries: when an entry comes up, the thread's last message decides
+    whether it's archived now or pushed back to its real due time.
+    """
+
+    def __init__(self, archive_after_hours=DEFAULT_ARCHIVE_AFTER_HOURS):
+        self.archive_after_hours = archive_after_hours
+        self._threads = {}  # thread id -> discord.Thread
+        self._tracked = set()  # thread ids of open tickets
+        self._heap = []  # (due utc, thread id)
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._bot = None
+
+    @property
+    def archive_after(self):
+        return timedelta(hours=self.archive_after_hours)
+
+    # --------------- handles ---------------
+    def cache(self, thread: discord.Thread):
+        self._threads[thread.id] = thread
+
+    def forget(self, thread_id):
+        self._threads.pop(thread_id, None)
+        self._tracked.discard(thread_id)
+
+    def is_ticket_thread(self, thread_id):
+        return thread_id in self._tracked
+
+    async def get(self, guild: discord.Guild, thread_id):
+        """Cached thread handle, re-hydrated from the guild cache or a single fetch when missing."""
+        thread = self._threads.get(thread_id) or guild.get_thread(thread_id)
+        if thread is None:
+            thread = await guild.fetch_channel(thread_id)
+        self._threads[thread_id] = thread
+        return thread
+
+    # --------------- inactivity timer ---------------
+    def track(self, thread_id, last_activity: datetime = None):
+        """Watch a ticket thread for inactivity, counting from `last_activity` (defaults to now)."""
+        self._tracked.add(thread_id)
+        if not self.archive_after_hours:
+            return
+        due = (last_activity or datetime.now(timezone.utc)) + self.archive_after
+        heapq.heappush(self._heap, (due, thread_id))
+        if self._heap[0][1] == thread_id:
+            self._wakeup.set()
+
+    def untrack(self, thread_id):
+        # The heap entry is dropped lazily when it comes up
+        self._tracked.discard(thread_id)
+        self._threads.pop(thread_id, None)
+
+    def rebuild(self, tickets):
+        self._heap = []
+        now = datetime.now(timezone.utc)
+        for ticket in tickets:
+            thread_id = ticket.get("thread_id")
+            if not thread_id:
+                continue
+            self._tracked.add(thread_id)
+            if self.archive_after_hours:
+                # Activity before the restart is unknown until the thread is loaded, start a full window from now
+                self._heap.append((now + self.archive_after, thread_id))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def start(self, bot):
+        self._bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def last_activity(self, thread: discord.Thread):
+        if thread.last_message_id:
+            return discord.utils.snowflake_time(thread.last_message_id)
+        return thread.created_at or datetime.now(timezone.utc)
+
+    async def _run(self):
+        await self._bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            due, thread_id = self._heap[0]
+            delay = (due - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if thread_id not in self._tracked:
+                continue
+            try:
+                await self._check(thread_id)
+            except Exception as e:
+                print(f"❌ Failed to auto-archive ticket thread {thread_id}: {e}")
+
+    async def _check(self, thread_id):
+        thread = self._threads.get(thread_id) or self._bot.get_channel(thread_id)
+        if thread is None:
+            thread = await self._bot.fetch_channel(thread_id)
+            if self._bot.get_guild(thread.guild.id) is None:
+                return  # the thread's server is on another process' shards, that process archives it
+            self._threads[thread_id] = thread
+
+        if thread.archived:
+            return  # tracked again from the thread update event once someone revives it
+
+        last_activity = self.last_activity(thread)
+        if datetime.now(timezone.utc) - last_activity < self.archive_after:
+            heapq.heappush(self._heap, (last_activity + self.archive_after, thread_id))
+            return
+
+        await thread.send(f"📦 No activity for {self.archive_after_hours}h, archiving this ticket thread. "
+                          f"Post a message to reopen it.")
+        await thread.edit(archived=True)